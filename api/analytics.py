@@ -0,0 +1,159 @@
+"""
+Векторная аналитика цен по билетам из результатов поиска.
+
+Билеты одного или многих поисков складываются в колоночную таблицу
+TicketFrame (массивы NumPy: маршрут, дата вылета, цена, перевозчик,
+пересадки), и все агрегаты считаются операциями над массивами, а не
+циклами по вложенным словарям ответа.
+"""
+
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from api.models import Ticket, parse_results
+
+
+class TicketFrame:
+    """
+    Колоночная таблица билетов.
+
+    Билеты без цены или без направлений в таблицу не попадают.
+    """
+
+    def __init__(
+        self,
+        routes: np.ndarray,
+        dates: np.ndarray,
+        prices: np.ndarray,
+        carriers: np.ndarray,
+        transfers: np.ndarray,
+    ) -> None:
+        """
+        :param routes: маршруты вида "KUF-AER" (строковый массив).
+        :param dates: даты вылета (datetime64[D]).
+        :param prices: цены (float64).
+        :param carriers: перевозчик первого рейса (строковый массив).
+        :param transfers: общее число пересадок (int16).
+        """
+        self.routes = routes
+        self.dates = dates
+        self.prices = prices
+        self.carriers = carriers
+        self.transfers = transfers
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @classmethod
+    def from_tickets(cls, tickets: Iterable[Ticket]) -> "TicketFrame":
+        """
+        Строит таблицу из разобранных билетов (models.Ticket).
+
+        :param tickets: билеты с полями price и segments.
+        :return: TicketFrame.
+        """
+        routes, dates, prices, carriers, transfers = [], [], [], [], []
+        for ticket in tickets:
+            if ticket.price is None or not ticket.segments:
+                continue
+            first = ticket.segments[0]
+            routes.append(f"{first.origin}-{first.destination}")
+            dates.append(first.departure[:10])
+            prices.append(ticket.price.value)
+            carriers.append(ticket.carrier or "")
+            transfers.append(ticket.transfers)
+        return cls(
+            np.array(routes, dtype=str),
+            np.array(dates, dtype="datetime64[D]"),
+            np.array(prices, dtype=np.float64),
+            np.array(carriers, dtype=str),
+            np.array(transfers, dtype=np.int16),
+        )
+
+    @classmethod
+    def from_results(cls, *results: Optional[Union[list, bytes, str]]) -> "TicketFrame":
+        """
+        Строит таблицу из ответов search_result одного или многих поисков.
+
+        :param results: данные search_result (None пропускаются).
+        :return: TicketFrame.
+        """
+        tickets: list[Ticket] = []
+        for data in results:
+            if data is not None:
+                tickets.extend(parse_results(data))
+        return cls.from_tickets(tickets)
+
+    def cheapest(self) -> dict[tuple[str, str], float]:
+        """
+        Минимальная цена по каждой паре (маршрут, дата вылета).
+
+        :return: {(маршрут, "YYYY-MM-DD"): цена}.
+        """
+        if not len(self):
+            return {}
+        keys = np.char.add(np.char.add(self.routes, "|"), self.dates.astype(str))
+        unique, inverse = np.unique(keys, return_inverse=True)
+        minimums = np.full(len(unique), np.inf)
+        np.minimum.at(minimums, inverse, self.prices)
+        return {
+            tuple(key.split("|", 1)): float(price)
+            for key, price in zip(unique.tolist(), minimums)
+        }
+
+    def price_percentiles(
+        self, percentiles: Sequence[float] = (10, 25, 50, 75, 90)
+    ) -> dict[float, float]:
+        """
+        Перцентили цены по всей таблице.
+
+        :param percentiles: уровни перцентилей (0..100).
+        :return: {уровень: цена}; пустой словарь для пустой таблицы.
+        """
+        if not len(self):
+            return {}
+        values = np.percentile(self.prices, percentiles)
+        return {level: float(value) for level, value in zip(percentiles, values)}
+
+    def carrier_stats(self) -> dict[str, dict[str, float]]:
+        """
+        Количество билетов, минимальная и медианная цена по перевозчикам.
+
+        :return: {перевозчик: {"count", "min", "median"}}.
+        """
+        if not len(self):
+            return {}
+        order = np.argsort(self.carriers, kind="stable")
+        carriers = self.carriers[order]
+        prices = self.prices[order]
+        unique, starts = np.unique(carriers, return_index=True)
+        stats = {}
+        for carrier, group in zip(unique.tolist(), np.split(prices, starts[1:])):
+            stats[carrier] = {
+                "count": int(group.size),
+                "min": float(group.min()),
+                "median": float(np.median(group)),
+            }
+        return stats
+
+    def price_histogram(
+        self,
+        bins: Union[int, Sequence[float]] = 10,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Гистограмма цен за диапазон дат вылета (границы включительно).
+
+        :param bins: число интервалов или их границы (как в numpy.histogram).
+        :param date_from: начало диапазона (YYYY-MM-DD) или None.
+        :param date_to: конец диапазона (YYYY-MM-DD) или None.
+        :return: (количества, границы интервалов).
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if date_from is not None:
+            mask &= self.dates >= np.datetime64(date_from, "D")
+        if date_to is not None:
+            mask &= self.dates <= np.datetime64(date_to, "D")
+        return np.histogram(self.prices[mask], bins=bins)
@@ -0,0 +1,309 @@
+"""
+Асинхронный клиент API Aviasales: те же бизнес-методы поиска, что и в AviasalesAPI.
+
+Позволяет запускать сотни поисков одновременно на одном event loop:
+ожидание результатов выполняется через asyncio.sleep и не занимает поток.
+Payload'ы формируются теми же функциями, что и в синхронном клиенте.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Optional
+
+from api.async_http_client import AsyncAviasalesHttpClient, AsyncResponse
+from api.aviasales_api import (
+    DEFAULT_BASE_URL,
+    build_results_payload,
+    build_search_payload,
+)
+from api.cookie_manager import get_shared_cookie_provider
+from api.http_client import CookieProvider, PoolConfig
+from api.polling import (
+    PollingStrategy,
+    default_polling,
+    parse_retry_after,
+    route_key,
+)
+
+
+class AsyncAviasalesAPI:
+    """
+    Асинхронный API-клиент для поиска авиабилетов через Aviasales.
+
+    Поверхность совпадает с AviasalesAPI (search_start, search_one_way,
+    search_result), но методы — корутины. Для параллельных поисков
+    search_id следует передавать в search_result явно; X-Request-Id
+    хранится отдельно для каждого поиска.
+    """
+
+    def __init__(
+        self,
+        cookie_provider: Optional[CookieProvider] = None,
+        max_concurrency: int = 100,
+        pool_config: Optional[PoolConfig] = None,
+        polling: Optional[PollingStrategy] = None,
+        base_url: Optional[str] = None,
+    ) -> None:
+        """
+        Инициализация: создаётся асинхронный HTTP-клиент.
+
+        :param cookie_provider: поставщик cookies; по умолчанию общий
+            кэш cookies процесса.
+        :param max_concurrency: максимум одновременно выполняемых запросов.
+        :param pool_config: настройки пула соединений.
+        :param polling: стратегия опроса результатов; по умолчанию
+            BackoffPolling с общей на процесс историей маршрутов.
+        :param base_url: адрес API; по умолчанию AVIASALES_API_BASE_URL
+            из окружения или DEFAULT_BASE_URL.
+        """
+        self._http_client = AsyncAviasalesHttpClient(
+            cookie_provider or get_shared_cookie_provider(),
+            max_concurrency,
+            pool_config,
+        )
+        self.base_url = base_url or os.environ.get(
+            "AVIASALES_API_BASE_URL", DEFAULT_BASE_URL
+        )
+        self.search_id: Optional[str] = None
+        # search_id -> последний X-Request-Id ответа по этому поиску.
+        self._request_ids: dict[str, str] = {}
+        self.polling = polling or default_polling()
+        self._routes: dict[str, str] = {}
+
+    async def __aenter__(self) -> "AsyncAviasalesAPI":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Закрывает пул соединений HTTP-клиента.
+        """
+        await self._http_client.close()
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        search_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncResponse:
+        """
+        Выполняет запрос к API: собирает URL, подставляет X-Request-Id
+        из предыдущего ответа по тому же поиску и сохраняет новый.
+
+        :param method: HTTP-метод (например, 'post').
+        :param endpoint: путь относительно base_url.
+        :param search_id: поиск, к которому относится запрос; без него
+            X-Request-Id не подставляется и не сохраняется.
+        :param kwargs: аргументы для запроса (json, headers и т.д.).
+        :return: прочитанный ответ AsyncResponse.
+        """
+        url = f"{self.base_url}{endpoint}"
+
+        request_id = self._request_ids.get(search_id) if search_id else None
+        if request_id:
+            if "headers" not in kwargs:
+                kwargs["headers"] = {}
+            kwargs["headers"]["X-Request-Id"] = request_id
+
+        response = await self._http_client.request(method, url, **kwargs)
+
+        if search_id and "X-Request-Id" in response.headers:
+            self._request_ids[search_id] = response.headers["X-Request-Id"]
+
+        return response
+
+    async def _start(self, payload: dict[str, Any], route: str) -> Optional[str]:
+        """
+        Отправляет payload в /search/v2/start и возвращает search_id.
+
+        :param payload: payload, сформированный build_search_payload.
+        :param route: ключ маршрута для истории опроса.
+        :return: search_id при успехе, None при ошибке ответа.
+        """
+        response = await self._make_request("post", "/search/v2/start", json=payload)
+
+        if response.status_code == 200:
+            data = response.json()
+            search_id = data.get("search_id")
+            if search_id:
+                self.search_id = search_id
+                self._routes[search_id] = route
+                if "X-Request-Id" in response.headers:
+                    self._request_ids[search_id] = response.headers["X-Request-Id"]
+            return search_id
+        return None
+
+    async def search_start(
+        self,
+        origin: str,
+        destination: str,
+        date_from: str,
+        date_to: str,
+        adults: int = 1,
+        children: int = 0,
+        infants: int = 0,
+    ) -> Optional[str]:
+        """
+        Запускает поиск билетов туда-обратно на указанные даты.
+
+        :param origin: код аэропорта вылета (например, KUF).
+        :param destination: код аэропорта прилёта (например, AER).
+        :param date_from: дата вылета туда (YYYY-MM-DD).
+        :param date_to: дата вылета обратно (YYYY-MM-DD).
+        :param adults: количество взрослых.
+        :param children: количество детей.
+        :param infants: количество младенцев.
+        :return: search_id при успехе, None при ошибке ответа.
+        """
+        directions = [
+            {"origin": origin, "destination": destination, "date": date_from},
+            {"origin": destination, "destination": origin, "date": date_to},
+        ]
+        payload = build_search_payload(directions, adults, children, infants)
+        return await self._start(payload, route_key(origin, destination))
+
+    async def search_one_way(
+        self,
+        origin: str,
+        destination: str,
+        date: str,
+        adults: int = 1,
+        children: int = 0,
+        infants: int = 0,
+    ) -> Optional[str]:
+        """
+        Запускает поиск билетов в один конец на указанную дату.
+
+        :param origin: код аэропорта вылета.
+        :param destination: код аэропорта прилёта.
+        :param date: дата вылета (YYYY-MM-DD).
+        :param adults: количество взрослых.
+        :param children: количество детей.
+        :param infants: количество младенцев.
+        :return: search_id при успехе, None при ошибке ответа.
+        """
+        directions = [
+            {"origin": origin, "destination": destination, "date": date},
+        ]
+        payload = build_search_payload(directions, adults, children, infants)
+        return await self._start(payload, route_key(origin, destination))
+
+    async def search_result(
+        self,
+        search_id: Optional[str] = None,
+        polling: Optional[PollingStrategy] = None,
+    ) -> Optional[list]:
+        """
+        Запрашивает результаты поиска по search_id, повторяя запрос при 204/304.
+
+        Повторяет поведение AviasalesAPI.search_result (та же стратегия опроса),
+        но паузы выполняются через asyncio.sleep и не блокируют другие поиски
+        на том же event loop.
+
+        :param search_id: идентификатор поиска; если не передан, используется
+            сохранённый при последнем search_start/search_one_way.
+        :param polling: стратегия опроса для этого вызова; по умолчанию
+            self.polling.
+        :return: список данных с билетами при успехе, None при ошибке или
+            исчерпании расписания опроса.
+        """
+        search_id = search_id or self.search_id
+        if not search_id:
+            return None
+
+        polling = polling or self.polling
+        route = self._routes.get(search_id)
+        schedule = polling.schedule([route] if route else [])
+        payload = build_results_payload(search_id, int(time.time()))
+
+        delay = schedule.first_delay()
+        while delay is not None:
+            await asyncio.sleep(delay)
+            response = await self._make_request(
+                "post", "/search/v3.2/results", search_id, json=payload
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                if data and len(data) > 0 and "tickets" in data[0]:
+                    polling.record_first_result(route, schedule.elapsed())
+                    return data
+
+            elif response.status_code not in (204, 304):
+                return None
+
+            delay = schedule.next_delay(parse_retry_after(response.headers))
+
+        return None
+
+    async def search_result_stream(
+        self,
+        search_id: Optional[str] = None,
+        limit: int = 100,
+        polling: Optional[PollingStrategy] = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Асинхронно отдаёт новые пачки билетов, пока поиск не завершится.
+
+        Поведение совпадает с AviasalesAPI.search_result_stream: сдвиг
+        last_update_timestamp после каждой пачки, завершение по is_over.
+
+        :param search_id: идентификатор поиска; если не передан, используется
+            сохранённый при последнем search_start/search_one_way.
+        :param limit: максимум билетов в одном ответе.
+        :param polling: стратегия опроса для этого вызова; по умолчанию
+            self.polling.
+        :return: асинхронный итератор списков билетов.
+        """
+        search_id = search_id or self.search_id
+        if not search_id:
+            return
+
+        polling = polling or self.polling
+        route = self._routes.get(search_id)
+        payload = build_results_payload(search_id, int(time.time()), limit)
+        first_batch = True
+
+        schedule = polling.schedule([route] if route else [])
+        delay = schedule.first_delay()
+        while delay is not None:
+            await asyncio.sleep(delay)
+            response = await self._make_request(
+                "post", "/search/v3.2/results", search_id, json=payload
+            )
+
+            if response.status_code == 200:
+                chunks = response.json() or []
+                tickets = [
+                    ticket for chunk in chunks for ticket in chunk.get("tickets", [])
+                ]
+                timestamps = [
+                    chunk["last_update_timestamp"]
+                    for chunk in chunks
+                    if "last_update_timestamp" in chunk
+                ]
+                if timestamps:
+                    payload["last_update_timestamp"] = max(timestamps)
+
+                if tickets:
+                    if first_batch:
+                        polling.record_first_result(route, schedule.elapsed())
+                        first_batch = False
+                    yield tickets
+
+                if any(chunk.get("is_over") for chunk in chunks):
+                    return
+
+                if tickets:
+                    schedule = polling.schedule([route] if route else [])
+                    delay = schedule.next_delay(parse_retry_after(response.headers))
+                    continue
+
+            elif response.status_code not in (204, 304):
+                return
+
+            delay = schedule.next_delay(parse_retry_after(response.headers))
@@ -0,0 +1,214 @@
+"""
+Асинхронный HTTP-клиент с подстановкой cookies для запросов к API Aviasales.
+
+Асинхронный аналог AviasalesHttpClient на aiohttp: те же заголовки и тот же
+протокол поставщика cookies (CookieProvider), но запросы выполняются
+на event loop с ограничением одновременных запросов, а не блокируют поток.
+"""
+
+import asyncio
+import time
+from typing import Any, Mapping, Optional
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from api.http_client import (
+    RETRY_METHODS,
+    RETRY_STATUSES,
+    AviasalesHttpClient,
+    CookieProvider,
+    PoolConfig,
+)
+from api.models import loads
+
+
+class AsyncResponse:
+    """
+    Прочитанный ответ aiohttp с интерфейсом, совместимым с requests.Response.
+
+    Тело ответа читается целиком внутри клиента, поэтому объект можно
+    использовать после закрытия соединения (status_code, headers, text, json()).
+    """
+
+    def __init__(
+        self, status_code: int, headers: Mapping[str, str], content: bytes
+    ) -> None:
+        """
+        :param status_code: HTTP-код ответа.
+        :param headers: заголовки ответа; поиск по имени без учёта регистра,
+            как у requests.Response.
+        :param content: тело ответа в байтах.
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        """Тело ответа в виде строки (UTF-8)."""
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        """Декодирует тело ответа как JSON (orjson, если установлен)."""
+        return loads(self.content)
+
+
+class AsyncAviasalesHttpClient:
+    """
+    Асинхронный HTTP-клиент для Aviasales API с автоматической подстановкой cookies.
+
+    Одна aiohttp.ClientSession с пулом соединений на клиента; число
+    одновременных запросов ограничено семафором max_concurrency, число
+    соединений с одним хостом — pool_config.pool_maxsize. Повторы следуют
+    политике синхронного клиента: ошибки соединения повторяются для любых
+    методов, ответы 502/503/504 — только для идемпотентных.
+    """
+
+    def __init__(
+        self,
+        cookie_provider: CookieProvider,
+        max_concurrency: int = 100,
+        pool_config: Optional[PoolConfig] = None,
+        cookie_ttl: float = 30.0,
+    ) -> None:
+        """
+        Инициализация клиента.
+
+        :param cookie_provider: объект с методом get_cookies() -> dict[str, str],
+            например экземпляр CookieManager.
+        :param max_concurrency: максимум одновременно выполняемых запросов.
+        :param pool_config: настройки пула соединений (размер пула на хост,
+            keep-alive, повторы); pool_connections не используется.
+        :param cookie_ttl: сколько секунд использовать полученные cookies,
+            прежде чем снова спросить поставщика.
+        """
+        self._cookie_provider = cookie_provider
+        self._max_concurrency = max_concurrency
+        self._pool_config = pool_config or PoolConfig()
+        self._cookie_ttl = cookie_ttl
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cookies_lock: Optional[asyncio.Lock] = None
+        self._cookies: Optional[dict[str, str]] = None
+        self._cookies_expire = 0.0
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncAviasalesHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Закрывает сессию aiohttp и все соединения пула."""
+        session = self._session
+        self._session = None
+        if session is not None:
+            await session.close()
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> AsyncResponse:
+        """
+        Выполняет HTTP-запрос с подстановкой cookies и обязательных заголовков.
+
+        Cookies берутся из кэша клиента; у поставщика они запрашиваются
+        в отдельном потоке, только когда кэш устарел, чтобы возможное
+        обновление через Selenium не блокировало event loop. При ошибках
+        соединения и ответах 502/503/504 на идемпотентные методы запрос
+        повторяется до pool_config.max_retries раз.
+
+        :param method: HTTP-метод (GET, POST и т.д.).
+        :param url: полный URL запроса.
+        :param kwargs: аргументы для ClientSession.request (headers, json и т.д.).
+        :return: прочитанный ответ AsyncResponse.
+        """
+        cookies = await self._get_cookies()
+
+        headers = {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "user-agent": AviasalesHttpClient.DEFAULT_USER_AGENT,
+            "origin": AviasalesHttpClient.DEFAULT_ORIGIN,
+            "referer": AviasalesHttpClient.DEFAULT_REFERER,
+            "Cookie": self._format_cookie_header(cookies),
+        }
+
+        if "headers" in kwargs:
+            headers.update(kwargs["headers"])
+        kwargs["headers"] = headers
+
+        session = self._get_session()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        retry_status = method.upper() in RETRY_METHODS
+        attempt = 0
+        async with self._semaphore:
+            while True:
+                can_retry = attempt < self._pool_config.max_retries
+                try:
+                    async with session.request(method, url, **kwargs) as response:
+                        content = await response.read()
+                        if not (
+                            retry_status and can_retry
+                            and response.status in RETRY_STATUSES
+                        ):
+                            response_headers = CIMultiDictProxy(
+                                CIMultiDict(response.headers)
+                            )
+                            return AsyncResponse(
+                                response.status, response_headers, content
+                            )
+                except aiohttp.ClientConnectionError:
+                    if not can_retry:
+                        raise
+                await asyncio.sleep(self._pool_config.backoff_factor * (2**attempt))
+                attempt += 1
+
+    async def _get_cookies(self) -> dict[str, str]:
+        """
+        Cookies для запроса, не блокируя event loop.
+
+        Пока кэш клиента свеж, cookies отдаются без лока и без перехода
+        в поток. Лок берётся только на обновление, чтобы при истёкшем кэше
+        поставщик был вызван один раз, а не для каждого из сотен
+        одновременных запросов.
+
+        :return: словарь имя_куки -> значение.
+        """
+        if self._cookies is not None and time.monotonic() < self._cookies_expire:
+            return self._cookies
+        if self._cookies_lock is None:
+            self._cookies_lock = asyncio.Lock()
+        async with self._cookies_lock:
+            # Пока ждали лок, кэш мог обновить другой запрос.
+            if self._cookies is None or time.monotonic() >= self._cookies_expire:
+                self._cookies = await asyncio.to_thread(
+                    self._cookie_provider.get_cookies
+                )
+                self._cookies_expire = time.monotonic() + self._cookie_ttl
+            return self._cookies
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Возвращает сессию aiohttp, создавая её при первом запросе.
+
+        :return: aiohttp.ClientSession с пулом соединений по pool_config.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._max_concurrency,
+                limit_per_host=self._pool_config.pool_maxsize,
+                force_close=not self._pool_config.keep_alive,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def _format_cookie_header(self, cookies: dict[str, str]) -> str:
+        """
+        Преобразует словарь cookies в строку для HTTP-заголовка Cookie.
+
+        :param cookies: словарь имя_куки -> значение.
+        :return: строка вида "name1=value1; name2=value2".
+        """
+        parts = [f"{name}={value}" for name, value in cookies.items()]
+        return "; ".join(parts)
@@ -3,59 +3,342 @@
 
 Использует менеджер cookies для получения валидных cookies и HTTP-клиент
 для выполнения запросов с подстановкой заголовков. Не содержит логики
-кэширования или формирования Cookie — только endpoint'ы и payload'ы.
+формирования Cookie — только endpoint'ы и payload'ы; кэширование результатов
+поиска делегируется необязательному SearchResultCache.
 """
 
+import logging
+import os
 import time
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional
+
+import requests
+
+from api.cassette import Cassette, cassette_from_env
+from api.cookie_manager import get_shared_cookie_provider
+from api.http_client import AviasalesHttpClient, CookieProvider, PoolConfig
+from api.instrumentation import (
+    Instrumentation,
+    RequestTiming,
+    default_instrumentation,
+)
+from api.models import Ticket, loads, parse_results
+from api.polling import (
+    FixedPolling,
+    PollSchedule,
+    PollingStrategy,
+    default_polling,
+    parse_retry_after,
+    route_key,
+)
+from api.result_cache import SearchResultCache
+
+# Префикс псевдо-search_id, выдаваемого при попадании в кэш результатов.
+CACHED_SEARCH_PREFIX = "cached:"
+
+# Адрес API по умолчанию; переопределяется аргументом base_url или
+# переменной окружения AVIASALES_API_BASE_URL (например, для FakeTicketsApi).
+DEFAULT_BASE_URL = "https://tickets-api.aviasales.ru"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+    """
+    Параметры одного поиска для пакетного запуска через search_many.
+
+    Если date_to не задана — поиск в один конец, иначе туда-обратно.
+
+    :param origin: код аэропорта вылета.
+    :param destination: код аэропорта прилёта.
+    :param date_from: дата вылета туда (YYYY-MM-DD).
+    :param date_to: дата вылета обратно (YYYY-MM-DD) или None.
+    :param adults: количество взрослых.
+    :param children: количество детей.
+    :param infants: количество младенцев.
+    """
+
+    origin: str
+    destination: str
+    date_from: str
+    date_to: Optional[str] = None
+    adults: int = 1
+    children: int = 0
+    infants: int = 0
+
+    def directions(self) -> list[dict[str, str]]:
+        """
+        Список направлений для payload поиска.
+
+        :return: одно направление для поиска в один конец, два — для туда-обратно.
+        """
+        directions = [
+            {
+                "origin": self.origin,
+                "destination": self.destination,
+                "date": self.date_from,
+            },
+        ]
+        if self.date_to is not None:
+            directions.append(
+                {
+                    "origin": self.destination,
+                    "destination": self.origin,
+                    "date": self.date_to,
+                }
+            )
+        return directions
+
+    def payload(self) -> dict[str, Any]:
+        """
+        Payload для /search/v2/start по параметрам поиска.
+        """
+        return build_search_payload(
+            self.directions(), self.adults, self.children, self.infants
+        )
+
+
+def build_search_payload(
+    directions: list[dict[str, str]],
+    adults: int = 1,
+    children: int = 0,
+    infants: int = 0,
+) -> dict[str, Any]:
+    """
+    Формирует payload для /search/v2/start.
+
+    Общий для синхронного и асинхронного клиентов: отличается только список
+    направлений (одно для поиска в один конец, два для туда-обратно).
+
+    :param directions: список словарей origin/destination/date.
+    :param adults: количество взрослых.
+    :param children: количество детей.
+    :param infants: количество младенцев.
+    :return: словарь для передачи в json запроса.
+    """
+    return {
+        "search_params": {
+            "directions": directions,
+            "passengers": {
+                "adults": adults,
+                "children": children,
+                "infants": infants,
+            },
+            "trip_class": "Y",
+        },
+        "marker": "direct",
+        "market_code": "ru",
+        "currency_code": "rub",
+    }
+
+
+def build_results_payload(
+    search_id: str, last_update_timestamp: int, limit: int = 1
+) -> dict[str, Any]:
+    """
+    Формирует payload для /search/v3.2/results.
 
-from api.cookie_manager import CookieManager
-from api.http_client import AviasalesHttpClient
+    :param search_id: идентификатор поиска.
+    :param last_update_timestamp: метка времени последнего обновления (unix).
+    :param limit: максимум билетов в ответе.
+    :return: словарь для передачи в json запроса.
+    """
+    return {
+        "limit": limit,
+        "price_per_person": False,
+        "search_by_airport": False,
+        "search_id": search_id,
+        "last_update_timestamp": last_update_timestamp,
+    }
 
 
 class AviasalesAPI:
     """
     API-клиент для поиска авиабилетов через Aviasales.
 
-    Управляет search_id и X-Request-Id между запросами; все HTTP-вызовы
-    выполняются через AviasalesHttpClient с cookies от CookieManager.
+    Управляет search_id и X-Request-Id между запросами (X-Request-Id —
+    отдельно для каждого поиска, поэтому параллельные поиски search_many
+    не подставляют чужой); все HTTP-вызовы выполняются через
+    AviasalesHttpClient с cookies от CookieManager.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        pool_config: Optional[PoolConfig] = None,
+        polling: Optional[PollingStrategy] = None,
+        cookie_provider: Optional[CookieProvider] = None,
+        base_url: Optional[str] = None,
+        cassette: Optional[Cassette] = None,
+        result_cache: Optional[SearchResultCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
         """
-        Инициализация: создаётся менеджер cookies и HTTP-клиент на его основе.
+        Инициализация: HTTP-клиент создаётся поверх поставщика cookies,
+        по умолчанию — общего на процесс кэша (CachedCookieProvider над
+        файловым CookieManager).
+
+        :param pool_config: настройки пула соединений; экземпляры с одинаковой
+            конфигурацией используют общий пул на процесс.
+        :param polling: стратегия опроса результатов; по умолчанию
+            BackoffPolling с общей на процесс историей маршрутов.
+        :param cookie_provider: поставщик cookies, например HttpCookieManager
+            (без браузера) или CachedCookieProvider над ним.
+        :param base_url: адрес API; по умолчанию AVIASALES_API_BASE_URL
+            из окружения или DEFAULT_BASE_URL.
+        :param cassette: кассета записи/воспроизведения; по умолчанию задаётся
+            переменными окружения AVIASALES_CASSETTE*. При воспроизведении
+            без realtime паузы опроса отключаются.
+        :param result_cache: кэш результатов по параметрам поиска; если задан,
+            повторный одинаковый поиск в окне свежести не обращается к серверу.
+        :param instrumentation: приёмник замеров запросов; по умолчанию
+            общий на процесс default_instrumentation.
         """
-        cookie_manager = CookieManager()
-        self._http_client = AviasalesHttpClient(cookie_manager)
-        self.base_url = "https://tickets-api.aviasales.ru"
+        cookie_provider = cookie_provider or get_shared_cookie_provider()
+        cassette = cassette or cassette_from_env()
+        self._http_client = AviasalesHttpClient(
+            cookie_provider, pool_config, cassette=cassette
+        )
+        if polling is None and cassette is not None and cassette.replaying:
+            if not cassette.realtime:
+                # Ответы уже записаны: ждать их «готовности» незачем.
+                polling = FixedPolling(initial_delay=0, interval=0, max_attempts=100)
+        self.base_url = base_url or os.environ.get(
+            "AVIASALES_API_BASE_URL", DEFAULT_BASE_URL
+        )
         self.search_id: Optional[str] = None
-        self.last_request_id: Optional[str] = None
+        # search_id -> последний X-Request-Id ответа по этому поиску.
+        self._request_ids: dict[str, str] = {}
+        self.polling = polling or default_polling()
+        self.result_cache = result_cache
+        self.instrumentation = instrumentation or default_instrumentation
+        # search_id -> маршрут, чтобы search_result учитывал историю маршрута.
+        self._routes: dict[str, str] = {}
+        # search_id -> ключ кэша результатов для сохранения ответа.
+        self._cache_keys: dict[str, str] = {}
+        # Псевдо-search_id попаданий в кэш -> сохранённые результаты.
+        # Запись не удаляется при чтении: один псевдо-search_id могут
+        # прочитать несколько раз (повторный search_result, дубли в search_many).
+        self._cached_results: dict[str, list] = {}
+
+    def close(self) -> None:
+        """
+        Закрывает HTTP-клиент: дальнейшие запросы выбрасывают RuntimeError.
+        Общий пул соединений остаётся открытым для других клиентов
+        (см. AviasalesHttpClient.close и close_shared_sessions).
+        """
+        self._http_client.close()
 
-    def _make_request(self, method: str, endpoint: str, **kwargs: Any) -> Any:
+    def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        attempt: int = 1,
+        search_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Any:
         """
-        Выполняет запрос к API: собирает URL, при необходимости подставляет
-        X-Request-Id из предыдущего ответа, вызывает HTTP-клиент и сохраняет
-        новый X-Request-Id из заголовков ответа.
+        Выполняет запрос к API: собирает URL, подставляет X-Request-Id
+        из предыдущего ответа по тому же поиску, вызывает HTTP-клиент
+        и сохраняет новый X-Request-Id из заголовков ответа. Время запроса
+        передаётся в self.instrumentation, в том числе для упавших запросов.
 
         :param method: HTTP-метод (например, 'post').
         :param endpoint: путь относительно base_url (например, '/search/v2/start').
+        :param attempt: номер попытки опроса для замера.
+        :param search_id: поиск, к которому относится запрос; без него
+            X-Request-Id не подставляется и не сохраняется.
         :param kwargs: аргументы для запроса (json, headers и т.д.).
         :return: объект requests.Response.
         """
         url = f"{self.base_url}{endpoint}"
 
-        if self.last_request_id:
+        request_id = self._request_ids.get(search_id) if search_id else None
+        if request_id:
             if "headers" not in kwargs:
                 kwargs["headers"] = {}
-            kwargs["headers"]["X-Request-Id"] = self.last_request_id
-
-        response = self._http_client.request(method, url, **kwargs)
+            kwargs["headers"]["X-Request-Id"] = request_id
+
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self._http_client.request(method, url, **kwargs)
+        finally:
+            elapsed = getattr(response, "elapsed", None)
+            self.instrumentation.emit(
+                RequestTiming(
+                    method=method.upper(),
+                    endpoint=endpoint,
+                    status_code=response.status_code if response is not None else None,
+                    attempt=attempt,
+                    total=time.perf_counter() - started,
+                    ttfb=elapsed.total_seconds() if elapsed is not None else None,
+                )
+            )
 
-        if "X-Request-Id" in response.headers:
-            self.last_request_id = response.headers["X-Request-Id"]
+        if search_id and "X-Request-Id" in response.headers:
+            self._request_ids[search_id] = response.headers["X-Request-Id"]
 
         return response
 
+    def _start(self, payload: dict[str, Any]) -> Optional[str]:
+        """
+        Отправляет payload в /search/v2/start и возвращает search_id.
+
+        Не меняет self.search_id, поэтому безопасен для параллельных запусков.
+
+        :param payload: payload, сформированный build_search_payload.
+        :return: search_id при успехе, None при ошибке ответа.
+        """
+        response = self._make_request("post", "/search/v2/start", json=payload)
+
+        if response.status_code == 200:
+            search_id = response.json().get("search_id")
+            if search_id and "X-Request-Id" in response.headers:
+                self._request_ids[search_id] = response.headers["X-Request-Id"]
+            return search_id
+        return None
+
+    def _begin_search(self, payload: dict[str, Any], route: str) -> Optional[str]:
+        """
+        Запускает поиск с учётом кэша результатов.
+
+        При попадании в кэш запрос к серверу не выполняется: возвращается
+        псевдо-search_id, по которому search_result отдаст сохранённые данные.
+        Псевдо-search_id на сервер не отправляется; неизвестный этому
+        экземпляру (например, из другого клиента) даёт None.
+
+        :param payload: payload, сформированный build_search_payload.
+        :param route: ключ маршрута.
+        :return: search_id (или псевдо-search_id) при успехе, None при ошибке.
+        """
+        key = None
+        if self.result_cache is not None:
+            key = self.result_cache.make_key(payload["search_params"])
+            data = self.result_cache.get(key, route)
+            if data is not None:
+                search_id = f"{CACHED_SEARCH_PREFIX}{key}"
+                self._cached_results[search_id] = data
+                self._routes[search_id] = route
+                return search_id
+
+        search_id = self._start(payload)
+        if search_id:
+            self._routes[search_id] = route
+            if key is not None:
+                self._cache_keys[search_id] = key
+        return search_id
+
+    def _store_result(self, search_id: str, data: list) -> None:
+        """
+        Сохраняет полученные результаты в кэш, если поиск был запущен с ним.
+        """
+        key = self._cache_keys.pop(search_id, None)
+        if key is not None and self.result_cache is not None:
+            self.result_cache.put(key, data)
+
     def search_start(
         self,
         origin: str,
@@ -78,39 +361,14 @@ class AviasalesAPI:
         :param infants: количество младенцев.
         :return: search_id при успехе, None при ошибке ответа.
         """
-        payload = {
-            "search_params": {
-                "directions": [
-                    {
-                        "origin": origin,
-                        "destination": destination,
-                        "date": date_from,
-                    },
-                    {
-                        "origin": destination,
-                        "destination": origin,
-                        "date": date_to,
-                    },
-                ],
-                "passengers": {
-                    "adults": adults,
-                    "children": children,
-                    "infants": infants,
-                },
-                "trip_class": "Y",
-            },
-            "marker": "direct",
-            "market_code": "ru",
-            "currency_code": "rub",
-        }
+        directions = [
+            {"origin": origin, "destination": destination, "date": date_from},
+            {"origin": destination, "destination": origin, "date": date_to},
+        ]
+        payload = build_search_payload(directions, adults, children, infants)
 
-        response = self._make_request("post", "/search/v2/start", json=payload)
-
-        if response.status_code == 200:
-            data = response.json()
-            self.search_id = data.get("search_id")
-            return self.search_id
-        return None
+        self.search_id = self._begin_search(payload, route_key(origin, destination))
+        return self.search_id
 
     def search_one_way(
         self,
@@ -132,47 +390,32 @@ class AviasalesAPI:
         :param infants: количество младенцев.
         :return: search_id при успехе, None при ошибке ответа.
         """
-        payload = {
-            "search_params": {
-                "directions": [
-                    {
-                        "origin": origin,
-                        "destination": destination,
-                        "date": date,
-                    },
-                ],
-                "passengers": {
-                    "adults": adults,
-                    "children": children,
-                    "infants": infants,
-                },
-                "trip_class": "Y",
-            },
-            "marker": "direct",
-            "market_code": "ru",
-            "currency_code": "rub",
-        }
-
-        response = self._make_request("post", "/search/v2/start", json=payload)
+        directions = [
+            {"origin": origin, "destination": destination, "date": date},
+        ]
+        payload = build_search_payload(directions, adults, children, infants)
 
-        if response.status_code == 200:
-            data = response.json()
-            self.search_id = data.get("search_id")
-            return self.search_id
-        return None
+        self.search_id = self._begin_search(payload, route_key(origin, destination))
+        return self.search_id
 
-    def search_result(self, search_id: Optional[str] = None) -> Optional[list]:
+    def search_result(
+        self,
+        search_id: Optional[str] = None,
+        polling: Optional[PollingStrategy] = None,
+    ) -> Optional[list]:
         """
-        Запрашивает результаты поиска по search_id (несколько попыток при 204/304).
+        Запрашивает результаты поиска по search_id, повторяя запрос при 204/304.
 
-        Перед первым запросом ждёт 2 секунды; при ответах 204/304 повторяет
-        до 5 раз с паузой 2 секунды. При 200 и наличии билетов в ответе
-        возвращает данные, иначе None.
+        Паузы между запросами задаёт стратегия опроса (по умолчанию —
+        экспоненциальная пауза с джиттером, дедлайном и учётом Retry-After).
+        При 200 и наличии билетов в ответе возвращает данные, иначе None.
 
         :param search_id: идентификатор поиска; если передан, используется он,
             иначе — сохранённый при search_start/search_one_way.
+        :param polling: стратегия опроса для этого вызова; по умолчанию
+            self.polling.
         :return: список данных с билетами при успехе, None при ошибке или
-            превышении попыток.
+            исчерпании расписания опроса.
         """
         if search_id is not None:
             self.search_id = search_id
@@ -180,42 +423,334 @@ class AviasalesAPI:
         if not self.search_id:
             return None
 
-        current_timestamp = int(time.time())
-
-        print("\n Ждем 2 секунды перед первым запросом результатов...")
-        time.sleep(2)
-
-        payload = {
-            "limit": 1,
-            "price_per_person": False,
-            "search_by_airport": False,
-            "search_id": self.search_id,
-            "last_update_timestamp": current_timestamp,
-        }
-
-        print(f"\n Получаем результаты для search_id: {self.search_id}")
-
-        for attempt in range(5):
-            print(f"  Попытка {attempt + 1}/5...")
+        if self.search_id.startswith(CACHED_SEARCH_PREFIX):
+            return self._cached_results.get(self.search_id)
+
+        polling = polling or self.polling
+        route = self._routes.get(self.search_id)
+        schedule = polling.schedule([route] if route else [])
+        payload = build_results_payload(self.search_id, int(time.time()))
+
+        delay = schedule.first_delay()
+        logger.info(
+            "Ожидание результатов: search_id=%s route=%s first_delay=%.1f",
+            self.search_id,
+            route,
+            delay,
+        )
+
+        while delay is not None:
+            time.sleep(delay)
+            logger.debug(
+                "Запрос результатов: search_id=%s attempt=%d",
+                self.search_id,
+                schedule.attempt,
+            )
             response = self._make_request(
-                "post", "/search/v3.2/results", json=payload
+                "post",
+                "/search/v3.2/results",
+                schedule.attempt,
+                self.search_id,
+                json=payload,
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = loads(response.content)
                 if data and len(data) > 0 and "tickets" in data[0]:
-                    tickets = data[0]["tickets"]
-                    print(f" Получено {len(tickets)} билетов")
+                    logger.info(
+                        "Получены билеты: search_id=%s tickets=%d attempt=%d"
+                        " elapsed=%.2f",
+                        self.search_id,
+                        len(data[0]["tickets"]),
+                        schedule.attempt,
+                        schedule.elapsed(),
+                    )
+                    polling.record_first_result(route, schedule.elapsed())
+                    self.instrumentation.observe("search_result", schedule.elapsed())
+                    self._store_result(self.search_id, data)
                     return data
 
             elif response.status_code in (204, 304):
-                print(f" Результаты готовятся ({response.status_code})")
-                time.sleep(2)
-                continue
+                logger.debug(
+                    "Результаты готовятся: search_id=%s status=%d",
+                    self.search_id,
+                    response.status_code,
+                )
             else:
-                print(f" Ошибка: {response.status_code}")
-                print(f" Ответ: {response.text[:200]}")
+                logger.warning(
+                    "Ошибка результатов: search_id=%s status=%d body=%.200s",
+                    self.search_id,
+                    response.status_code,
+                    response.text,
+                )
                 return None
 
-        print(" Превышено количество попыток")
+            delay = schedule.next_delay(parse_retry_after(response.headers))
+
+        logger.warning(
+            "Превышено время ожидания результатов: search_id=%s attempts=%d",
+            self.search_id,
+            schedule.attempt,
+        )
         return None
+
+    def search_tickets(
+        self,
+        search_id: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        polling: Optional[PollingStrategy] = None,
+    ) -> Optional[list[Ticket]]:
+        """
+        Как search_result, но возвращает компактные объекты Ticket.
+
+        :param search_id: идентификатор поиска (см. search_result).
+        :param fields: поля билета для разбора (подмножество models.FIELDS);
+            по умолчанию все.
+        :param polling: стратегия опроса для этого вызова.
+        :return: список Ticket при успехе, None при ошибке или таймауте.
+        """
+        data = self.search_result(search_id, polling)
+        if data is None:
+            return None
+        return parse_results(data, fields)
+
+    def search_result_stream(
+        self,
+        search_id: Optional[str] = None,
+        limit: int = 100,
+        polling: Optional[PollingStrategy] = None,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Отдаёт новые пачки билетов по мере их появления, пока поиск не завершится.
+
+        После каждого ответа с билетами last_update_timestamp в payload
+        сдвигается на максимальный из полученных чанков, поэтому следующий
+        запрос возвращает только новые билеты. Поиск считается завершённым,
+        когда сервер присылает чанк с is_over. Расписание опроса
+        перезапускается после каждой новой пачки: дедлайн стратегии
+        ограничивает время ожидания очередного обновления, а не весь поиск.
+
+        :param search_id: идентификатор поиска; если передан, используется он,
+            иначе — сохранённый при search_start/search_one_way.
+        :param limit: максимум билетов в одном ответе.
+        :param polling: стратегия опроса для этого вызова; по умолчанию
+            self.polling.
+        :return: итератор списков билетов (только новые в каждой пачке).
+        """
+        if search_id is not None:
+            self.search_id = search_id
+
+        if not self.search_id:
+            return
+
+        if self.search_id.startswith(CACHED_SEARCH_PREFIX):
+            data = self._cached_results.get(self.search_id)
+            if data is not None:
+                yield [ticket for chunk in data for ticket in chunk.get("tickets", [])]
+            return
+
+        polling = polling or self.polling
+        route = self._routes.get(self.search_id)
+        payload = build_results_payload(self.search_id, int(time.time()), limit)
+        first_batch = True
+
+        schedule = polling.schedule([route] if route else [])
+        delay = schedule.first_delay()
+        while delay is not None:
+            time.sleep(delay)
+            response = self._make_request(
+                "post",
+                "/search/v3.2/results",
+                schedule.attempt,
+                self.search_id,
+                json=payload,
+            )
+
+            if response.status_code == 200:
+                chunks = loads(response.content) or []
+                tickets = [
+                    ticket for chunk in chunks for ticket in chunk.get("tickets", [])
+                ]
+                timestamps = [
+                    chunk["last_update_timestamp"]
+                    for chunk in chunks
+                    if "last_update_timestamp" in chunk
+                ]
+                if timestamps:
+                    payload["last_update_timestamp"] = max(timestamps)
+
+                if tickets:
+                    if first_batch:
+                        polling.record_first_result(route, schedule.elapsed())
+                        first_batch = False
+                    yield tickets
+
+                if any(chunk.get("is_over") for chunk in chunks):
+                    return
+
+                if tickets:
+                    schedule = polling.schedule([route] if route else [])
+                    delay = schedule.next_delay(parse_retry_after(response.headers))
+                    continue
+
+            elif response.status_code not in (204, 304):
+                logger.warning(
+                    "Ошибка результатов: search_id=%s status=%d body=%.200s",
+                    self.search_id,
+                    response.status_code,
+                    response.text,
+                )
+                return
+
+            delay = schedule.next_delay(parse_retry_after(response.headers))
+
+    def search_many(
+        self,
+        specs: Iterable[SearchSpec],
+        max_workers: int = 10,
+        polling: Optional[PollingStrategy] = None,
+        limit: int = 1,
+        drain: bool = False,
+    ) -> Iterator[tuple[SearchSpec, Optional[list]]]:
+        """
+        Запускает пакет поисков и отдаёт результаты по мере готовности.
+
+        Все поиски стартуют параллельно, затем незавершённые search_id
+        опрашиваются вместе по общему расписанию: раунд параллельных запросов
+        результатов, пауза по стратегии опроса, следующий раунд. Общее время
+        близко к самому медленному поиску, а не к сумме всех.
+
+        По умолчанию поиск отдаётся с первым ответом, где есть билеты.
+        С drain=True результаты дочитываются до is_over, как в
+        search_result_stream: last_update_timestamp сдвигается после каждой
+        пачки, чанки всех пачек собираются в один список, а расписание
+        опроса перезапускается, когда в раунде пришли новые билеты.
+
+        :param specs: параметры поисков.
+        :param max_workers: максимум одновременных HTTP-запросов.
+        :param polling: стратегия опроса; по умолчанию self.polling.
+        :param limit: максимум билетов в ответе результатов каждого поиска.
+        :param drain: дочитывать ли результаты каждого поиска до is_over.
+        :return: итератор пар (spec, данные); данные None, если поиск
+            не стартовал, вернул ошибку, упал с ошибкой соединения или
+            не завершился по расписанию опроса (с drain — не дошёл до is_over).
+        """
+        specs = list(specs)
+        polling = polling or self.polling
+
+        def begin(spec: SearchSpec) -> Optional[str]:
+            try:
+                return self._begin_search(
+                    spec.payload(), route_key(spec.origin, spec.destination)
+                )
+            except requests.RequestException as error:
+                logger.warning("Поиск не стартовал: spec=%s error=%s", spec, error)
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            search_ids = list(executor.map(begin, specs))
+
+            # Ключ — позиция в specs: одинаковые поиски могут вернуть один search_id.
+            pending: dict[int, tuple[SearchSpec, dict[str, Any]]] = {}
+            for index, (spec, search_id) in enumerate(zip(specs, search_ids)):
+                if search_id is None:
+                    yield spec, None
+                    continue
+                if search_id.startswith(CACHED_SEARCH_PREFIX):
+                    yield spec, self._cached_results.get(search_id)
+                    continue
+                payload = build_results_payload(search_id, int(time.time()), limit)
+                pending[index] = (spec, payload)
+
+            def pending_schedule() -> PollSchedule:
+                return polling.schedule(
+                    [
+                        route_key(spec.origin, spec.destination)
+                        for spec, _ in pending.values()
+                    ]
+                )
+
+            # Чанки дочитываемых поисков (drain) по позиции в specs.
+            collected: dict[int, list] = {}
+            schedule = pending_schedule()
+            started = time.monotonic()
+            delay = schedule.first_delay() if pending else None
+
+            while pending and delay is not None:
+                time.sleep(delay)
+                new_tickets = False
+
+                futures = {
+                    executor.submit(
+                        self._make_request,
+                        "post",
+                        "/search/v3.2/results",
+                        schedule.attempt,
+                        payload["search_id"],
+                        json=payload,
+                    ): index
+                    for index, (_, payload) in pending.items()
+                }
+                retry_after: Optional[float] = None
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        response = future.result()
+                    except requests.RequestException as error:
+                        # Ошибка одного поиска не прерывает остальные.
+                        spec, _ = pending.pop(index)
+                        logger.warning(
+                            "Ошибка опроса: spec=%s error=%s", spec, error
+                        )
+                        yield spec, None
+                        continue
+                    if response.status_code in (204, 304):
+                        hint = parse_retry_after(response.headers)
+                        if hint is not None:
+                            retry_after = max(retry_after or 0.0, hint)
+                        continue
+                    if response.status_code != 200:
+                        spec, _ = pending.pop(index)
+                        yield spec, None
+                        continue
+                    data = loads(response.content)
+                    if drain:
+                        spec, payload = pending[index]
+                        chunks = data or []
+                        timestamps = [
+                            chunk["last_update_timestamp"]
+                            for chunk in chunks
+                            if "last_update_timestamp" in chunk
+                        ]
+                        if timestamps:
+                            payload["last_update_timestamp"] = max(timestamps)
+                        if any(chunk.get("tickets") for chunk in chunks):
+                            earlier = collected.get(index, ())
+                            if not any(chunk.get("tickets") for chunk in earlier):
+                                polling.record_first_result(
+                                    route_key(spec.origin, spec.destination),
+                                    time.monotonic() - started,
+                                )
+                            new_tickets = True
+                        collected.setdefault(index, []).extend(chunks)
+                        if any(chunk.get("is_over") for chunk in chunks):
+                            pending.pop(index)
+                            data = collected.pop(index)
+                            self._store_result(payload["search_id"], data)
+                            yield spec, data
+                    elif data and len(data) > 0 and "tickets" in data[0]:
+                        spec, payload = pending.pop(index)
+                        self._store_result(payload["search_id"], data)
+                        polling.record_first_result(
+                            route_key(spec.origin, spec.destination),
+                            time.monotonic() - started,
+                        )
+                        yield spec, data
+
+                if pending:
+                    if new_tickets:
+                        schedule = pending_schedule()
+                    delay = schedule.next_delay(retry_after)
+
+        for spec, _ in pending.values():
+            yield spec, None
@@ -0,0 +1,203 @@
+"""
+Кассеты запросов к API Aviasales: запись и воспроизведение без сети.
+
+В режиме записи AviasalesHttpClient выполняет настоящие запросы и сохраняет
+пары запрос/ответ (код, заголовки с X-Request-Id, тело) в сжатый файл.
+В режиме воспроизведения ответы берутся из кассеты: сеть и получение
+cookies не нужны. Запросы сопоставляются по методу, пути и нормализованному
+payload без изменчивых полей (last_update_timestamp).
+"""
+
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Поля payload, которые меняются от запуска к запуску и не участвуют в сопоставлении.
+VOLATILE_FIELDS = ("last_update_timestamp",)
+
+
+class CassetteMiss(LookupError):
+    """В кассете нет записанного ответа на запрос."""
+
+
+class Cassette:
+    """
+    Файл с записанными взаимодействиями HTTP-клиента.
+
+    Формат — gzip с JSON-строкой на взаимодействие. Одинаковые запросы
+    (например, повторные опросы результатов) воспроизводятся в порядке записи;
+    после исчерпания повторяется последний ответ.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = REPLAY,
+        realtime: bool = False,
+        volatile_fields: Iterable[str] = VOLATILE_FIELDS,
+    ) -> None:
+        """
+        :param path: путь к файлу кассеты (например, cassettes/api.jsonl.gz).
+        :param mode: RECORD — записывать, REPLAY — воспроизводить.
+        :param realtime: при воспроизведении выдерживать записанное время ответа.
+        :param volatile_fields: поля payload, игнорируемые при сопоставлении.
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Неизвестный режим кассеты: {mode}")
+        self.path = path
+        self.mode = mode
+        self.realtime = realtime
+        self.volatile_fields = frozenset(volatile_fields)
+        self.misses = 0
+        self._interactions: list[dict[str, Any]] = []
+        self._replay: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._positions: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        if mode == REPLAY:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        """Воспроизводит ли кассета ответы вместо сети."""
+        return self.mode == REPLAY
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.save()
+
+    def match_key(self, method: str, url: str, payload: Any) -> str:
+        """
+        Ключ сопоставления запроса: метод, путь и payload без изменчивых полей.
+
+        :param method: HTTP-метод.
+        :param url: полный URL (учитывается только путь).
+        :param payload: тело запроса (json) или None.
+        :return: строковый ключ.
+        """
+        if isinstance(payload, dict):
+            payload = {
+                key: value
+                for key, value in payload.items()
+                if key not in self.volatile_fields
+            }
+        normalized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return f"{method.upper()} {urlsplit(url).path} {normalized}"
+
+    def record(
+        self, method: str, url: str, payload: Any, response: requests.Response
+    ) -> None:
+        """
+        Добавляет взаимодействие в кассету (в памяти; на диск — в save()).
+
+        :param method: HTTP-метод.
+        :param url: полный URL запроса.
+        :param payload: тело запроса (json) или None.
+        :param response: полученный ответ.
+        """
+        interaction = {
+            "key": self.match_key(method, url, payload),
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "body": response.text,
+            "elapsed": response.elapsed.total_seconds(),
+        }
+        with self._lock:
+            self._interactions.append(interaction)
+
+    def play(self, method: str, url: str, payload: Any) -> requests.Response:
+        """
+        Возвращает записанный ответ на запрос.
+
+        :param method: HTTP-метод.
+        :param url: полный URL запроса.
+        :param payload: тело запроса (json) или None.
+        :return: requests.Response, собранный из записи.
+        :raises CassetteMiss: если такого запроса в кассете нет.
+        """
+        key = self.match_key(method, url, payload)
+        with self._lock:
+            recorded = self._replay.get(key)
+            if not recorded:
+                self.misses += 1
+                raise CassetteMiss(f"Нет записи в кассете {self.path}: {key}")
+            position = self._positions[key]
+            interaction = recorded[min(position, len(recorded) - 1)]
+            self._positions[key] = position + 1
+
+        if self.realtime:
+            time.sleep(interaction["elapsed"])
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response._content = interaction["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = url
+        response.elapsed = timedelta(seconds=interaction["elapsed"])
+        return response
+
+    def save(self) -> None:
+        """Записывает накопленные взаимодействия на диск (только в режиме записи)."""
+        if self.mode != RECORD:
+            return
+        with self._lock:
+            interactions = list(self._interactions)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            for interaction in interactions:
+                f.write(json.dumps(interaction, separators=(",", ":")))
+                f.write("\n")
+
+    def _load(self) -> None:
+        """Читает кассету с диска и группирует ответы по ключу сопоставления."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    interaction = json.loads(line)
+                    self._replay[interaction["key"]].append(interaction)
+
+
+_shared_cassettes: dict[str, Cassette] = {}
+_shared_cassettes_lock = threading.Lock()
+
+
+def cassette_from_env() -> Optional[Cassette]:
+    """
+    Общая на процесс кассета по переменным окружения.
+
+    AVIASALES_CASSETTE — путь к файлу, AVIASALES_CASSETTE_MODE — record/replay
+    (по умолчанию replay), AVIASALES_CASSETTE_REALTIME=1 — воспроизводить
+    с записанными задержками. Записанная кассета сохраняется при выходе.
+
+    :return: Cassette или None, если переменная AVIASALES_CASSETTE не задана.
+    """
+    path = os.environ.get("AVIASALES_CASSETTE")
+    if not path:
+        return None
+    with _shared_cassettes_lock:
+        cassette = _shared_cassettes.get(path)
+        if cassette is None:
+            cassette = Cassette(
+                path,
+                mode=os.environ.get("AVIASALES_CASSETTE_MODE", REPLAY),
+                realtime=os.environ.get("AVIASALES_CASSETTE_REALTIME") == "1",
+            )
+            _shared_cassettes[path] = cassette
+            atexit.register(cassette.save)
+        return cassette
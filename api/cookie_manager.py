@@ -4,10 +4,15 @@
 Не знает про HTTP, заголовки, origin/referer. Логика «когда брать из кэша,
 когда обновлять через Selenium» сосредоточена здесь; хранилище и TTL можно
 подменять без изменения вызывающего кода.
+
+CachedCookieProvider — кэш в памяти процесса поверх файла, чтобы частые
+запросы (опрос результатов) не читали и не разбирали JSON на каждом вызове.
 """
 
 import json
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -17,7 +22,26 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
+from api.file_lock import FileLock, atomic_write_json
+from browser.chromedriver import resolve_chromedriver
+
+# Файл cookies по умолчанию; переопределяется AVIASALES_COOKIE_FILE.
+DEFAULT_COOKIE_FILE = "aviasales_cookies.json"
+
+
+def default_cookie_file() -> str:
+    """
+    Файл cookies API по умолчанию.
+
+    Файл общий для всех процессов, в том числе воркеров pytest-xdist:
+    обновление идёт под FileLock, поэтому при истечении cookies браузер
+    для их получения запускает один процесс, а остальные читают результат.
+    UI тесты этот файл не используют — их изоляция держится на отдельных
+    профилях Chrome у каждого воркера.
+
+    :return: путь к файлу cookies.
+    """
+    return os.environ.get("AVIASALES_COOKIE_FILE", DEFAULT_COOKIE_FILE)
 
 
 class CookieManager:
@@ -28,14 +52,23 @@ class CookieManager:
     получает свежие cookies через headless Selenium.
     """
 
-    def __init__(self, cookie_file: str = "aviasales_cookies.json") -> None:
+    def __init__(
+        self,
+        cookie_file: Optional[str] = None,
+        ttl: timedelta = timedelta(minutes=30),
+    ) -> None:
         """
         Инициализация менеджера.
 
         :param cookie_file: путь к файлу для кэширования cookies (по умолчанию
-            aviasales_cookies.json в текущей директории).
+            default_cookie_file(): aviasales_cookies.json в текущей директории,
+            общий для всех процессов).
+        :param ttl: срок годности сохранённых cookies.
         """
-        self.cookie_file = cookie_file
+        self.cookie_file = cookie_file or default_cookie_file()
+        self.ttl = ttl
+        # Срок годности последних загруженных/сохранённых cookies.
+        self.expires: Optional[datetime] = None
 
     def get_cookies(self) -> dict[str, str]:
         """
@@ -45,43 +78,93 @@ class CookieManager:
         Если кэш отсутствует или просрочен — получает свежие cookies через
         Selenium, сохраняет в хранилище и возвращает их.
 
+        Обновление однопоточное на все процессы: под файловой блокировкой
+        кэш проверяется повторно, поэтому процессы, ждавшие блокировку,
+        берут cookies, полученные первым, а не запускают свой браузер.
+
         :return: словарь имя_куки -> значение (готов для подстановки в заголовки
             или в requests).
         """
         cookies = self._load_cookies()
         if cookies is not None:
             return cookies
-        cookies = self._get_fresh_cookies()
-        self._save_cookies(cookies)
-        return cookies
+        with FileLock(self.cookie_file + ".lock"):
+            cookies = self._load_cookies()
+            if cookies is not None:
+                return cookies
+            cookies = self._get_fresh_cookies()
+            self._save_cookies(cookies)
+            return cookies
+
+    def refresh(self, min_remaining: Optional[timedelta] = None) -> dict[str, str]:
+        """
+        Принудительно обновляет cookies, не дожидаясь истечения TTL.
+
+        Выполняется под той же файловой блокировкой, что и get_cookies. Если
+        задан min_remaining и сохранённым cookies осталось жить дольше него
+        (их уже обновил другой процесс), браузер не запускается.
+
+        :param min_remaining: порог оставшегося срока годности для обновления.
+        :return: словарь имя_куки -> значение.
+        """
+        return self._refresh(min_remaining)[0]
+
+    def _refresh(
+        self, min_remaining: Optional[timedelta] = None
+    ) -> tuple[dict[str, str], bool]:
+        """
+        Реализация refresh.
+
+        :return: (cookies, True — если cookies получены заново, False — если
+            взяты из файла, уже обновлённого другим процессом).
+        """
+        with FileLock(self.cookie_file + ".lock"):
+            if min_remaining is not None:
+                cookies = self._load_cookies()
+                if (
+                    cookies is not None
+                    and self.expires - datetime.now() > min_remaining
+                ):
+                    return cookies, False
+            cookies = self._get_fresh_cookies()
+            self._save_cookies(cookies)
+            return cookies, True
 
     def _load_cookies(self) -> Optional[dict[str, str]]:
         """
         Загружает cookies из файлового кэша, если файл есть и TTL не истёк.
 
-        :return: словарь cookies или None, если кэш недоступен или просрочен.
+        :return: словарь cookies или None, если кэш недоступен, повреждён
+            или просрочен.
         """
         if not os.path.exists(self.cookie_file):
             return None
-        with open(self.cookie_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        expires = datetime.fromisoformat(data["expires"])
+        try:
+            with open(self.cookie_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            expires = datetime.fromisoformat(data["expires"])
+        except (OSError, ValueError, KeyError):
+            return None
+        self.expires = expires
         if datetime.now() < expires:
             return data["cookies"]
         return None
 
     def _save_cookies(self, cookies: dict[str, str]) -> None:
         """
-        Сохраняет cookies в файл с указанием времени истечения (TTL 30 минут).
+        Сохраняет cookies в файл с указанием времени истечения (now + ttl).
+
+        Запись атомарная (временный файл + rename), чтобы параллельные
+        читатели не получили недописанный JSON.
 
         :param cookies: словарь имя_куки -> значение.
         """
+        self.expires = datetime.now() + self.ttl
         data = {
             "cookies": cookies,
-            "expires": (datetime.now() + timedelta(minutes=30)).isoformat(),
+            "expires": self.expires.isoformat(),
         }
-        with open(self.cookie_file, "w", encoding="utf-8") as f:
-            json.dump(data, f)
+        atomic_write_json(self.cookie_file, data)
 
     def _get_fresh_cookies(self) -> dict[str, str]:
         """
@@ -97,7 +180,7 @@ class CookieManager:
         options.add_argument("--window-size=1920,1080")
 
         driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()), options=options
+            service=Service(resolve_chromedriver()), options=options
         )
 
         try:
@@ -111,3 +194,213 @@ class CookieManager:
             return cookies
         finally:
             driver.quit()
+
+
+class CachedCookieProvider:
+    """
+    Кэш cookies в памяти процесса поверх файлового CookieManager.
+
+    Реализует протокол CookieProvider. Файл читается не чаще раза за окно ttl;
+    внутри окна cookies отдаются из памяти. Кэш сбрасывается раньше, если
+    изменился mtime файла (cookies обновил другой процесс) или истёк срок
+    годности, записанный в файле.
+    """
+
+    def __init__(self, cookie_manager: CookieManager, ttl: float = 60.0) -> None:
+        """
+        :param cookie_manager: файловый менеджер cookies, к которому идут промахи.
+        :param ttl: время жизни записи в памяти, секунды.
+        """
+        self.cookie_manager = cookie_manager
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._cookies: Optional[dict[str, str]] = None
+        self._valid_until = 0.0
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get_cookies(self) -> dict[str, str]:
+        """
+        Возвращает cookies из памяти, а при промахе — из CookieManager.
+
+        :return: словарь имя_куки -> значение.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._cookies is not None
+                and now < self._valid_until
+                and self._file_mtime() == self._mtime
+            ):
+                self.hits += 1
+                return self._cookies
+
+            self.misses += 1
+            cookies = self.cookie_manager.get_cookies()
+            self._cookies = cookies
+            self._mtime = self._file_mtime()
+            self._valid_until = now + min(self.ttl, self._file_ttl_left())
+            return cookies
+
+    def invalidate(self) -> None:
+        """Сбрасывает кэш: следующий вызов get_cookies прочитает файл."""
+        with self._lock:
+            self._cookies = None
+            self._valid_until = 0.0
+
+    def stats(self) -> dict[str, float]:
+        """
+        Счётчики кэша.
+
+        :return: словарь hits, misses и hit_rate (доля попаданий, 0..1).
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _file_mtime(self) -> Optional[float]:
+        """mtime файла cookies или None, если файла нет."""
+        try:
+            return os.stat(self.cookie_manager.cookie_file).st_mtime
+        except OSError:
+            return None
+
+    def _file_ttl_left(self) -> float:
+        """
+        Сколько секунд осталось до истечения срока, записанного в файле.
+
+        Если срок неизвестен — возвращает ttl кэша.
+        """
+        expires = self.cookie_manager.expires
+        if expires is None:
+            return self.ttl
+        return max(0.0, (expires - datetime.now()).total_seconds())
+
+
+class BackgroundCookieRefresher:
+    """
+    Фоновое обновление cookies до истечения TTL.
+
+    Поток-демон обновляет cookies, когда прошла доля fraction от TTL, пока
+    вызывающие продолжают получать ещё действующие cookies из кэша. Так
+    ни один запрос не ждёт загрузки страницы в Selenium на истечении TTL.
+    """
+
+    def __init__(
+        self,
+        cookie_manager: CookieManager,
+        fraction: float = 0.8,
+        retry_interval: float = 30.0,
+    ) -> None:
+        """
+        :param cookie_manager: менеджер, cookies которого нужно обновлять.
+        :param fraction: доля TTL, после которой запускается обновление (0..1).
+        :param retry_interval: пауза перед повтором после неудачного обновления,
+            секунды.
+        """
+        self.cookie_manager = cookie_manager
+        self.fraction = fraction
+        self.retry_interval = retry_interval
+        # Обновления, запустившие получение cookies, и плановые проверки,
+        # где файл уже обновил другой процесс.
+        self.refreshes = 0
+        self.skipped = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "BackgroundCookieRefresher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Запускает поток обновления (повторный вызов ничего не делает)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cookie-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Останавливает поток обновления.
+
+        :param timeout: сколько ждать завершения потока, секунды.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def seconds_until_refresh(self) -> float:
+        """
+        Сколько секунд осталось до планового обновления.
+
+        :return: 0, если cookies ещё не загружены или пора обновлять.
+        """
+        expires = self.cookie_manager.expires
+        if expires is None:
+            return 0.0
+        ttl = self.cookie_manager.ttl
+        refresh_at = expires - ttl + ttl * self.fraction
+        return max(0.0, (refresh_at - datetime.now()).total_seconds())
+
+    def _run(self) -> None:
+        manager = self.cookie_manager
+        min_remaining = manager.ttl * (1 - self.fraction)
+        while not self._stop.is_set():
+            try:
+                if manager.expires is None:
+                    manager.get_cookies()
+                delay = self.seconds_until_refresh()
+                if delay > 0:
+                    self._stop.wait(delay)
+                    continue
+                _, fetched = manager._refresh(min_remaining=min_remaining)
+                if fetched:
+                    self.refreshes += 1
+                else:
+                    self.skipped += 1
+            except Exception:
+                self.errors += 1
+                self._stop.wait(self.retry_interval)
+
+
+_shared_providers: dict[tuple[str, type[CookieManager]], CachedCookieProvider] = {}
+_shared_providers_lock = threading.Lock()
+
+
+def get_shared_cookie_provider(
+    cookie_file: Optional[str] = None,
+    manager_class: type[CookieManager] = CookieManager,
+) -> CachedCookieProvider:
+    """
+    Возвращает общий на процесс кэш cookies для файла.
+
+    Все клиенты API с одним файлом cookies и классом менеджера делят кэш
+    в памяти, поэтому файл читается один раз за окно ttl на процесс, а не
+    на каждый экземпляр. Для другого manager_class создаётся свой поставщик
+    над тем же файлом (запись в файл защищена FileLock).
+
+    :param cookie_file: путь к файлу cookies; по умолчанию default_cookie_file().
+    :param manager_class: класс менеджера, создаваемого при первом обращении
+        (CookieManager или, например, HttpCookieManager).
+    :return: CachedCookieProvider поверх manager_class(cookie_file).
+    """
+    cookie_file = cookie_file or default_cookie_file()
+    with _shared_providers_lock:
+        key = (cookie_file, manager_class)
+        provider = _shared_providers.get(key)
+        if provider is None:
+            provider = CachedCookieProvider(manager_class(cookie_file))
+            _shared_providers[key] = provider
+        return provider
@@ -0,0 +1,312 @@
+"""
+Локальная замена tickets-api.aviasales.ru для тестов без сети и замеров.
+
+Эмулирует /search/v2/start и /search/v3.2/results: выдаёт search_id,
+заданное число опросов отвечает 204 (результаты готовятся), затем отдаёт
+билеты пачками до флага is_over. Задержка ответов настраивается, поэтому
+сервер годится и для детерминированных тестов, и для измерения пропускной
+способности клиента и поведения опроса.
+"""
+
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+CARRIERS = ("SU", "S7", "DP", "U6", "UT", "FV")
+
+
+class StaticCookieProvider:
+    """
+    Поставщик фиксированных cookies (протокол CookieProvider) без браузера и файлов.
+    """
+
+    def __init__(self, cookies: Optional[dict[str, str]] = None) -> None:
+        """
+        :param cookies: cookies для подстановки; по умолчанию одна фиктивная.
+        """
+        self.cookies = cookies if cookies is not None else {"auid": "fake"}
+
+    def get_cookies(self) -> dict[str, str]:
+        """Возвращает заданные cookies."""
+        return self.cookies
+
+
+class FakeSearch:
+    """
+    Состояние одного поиска на фейковом сервере.
+    """
+
+    def __init__(self, search_id: str, directions: list[dict[str, str]]) -> None:
+        self.search_id = search_id
+        self.directions = directions
+        self.polls = 0
+        self.sent = 0
+
+
+class FakeTicketsApi:
+    """
+    Фейковый tickets-api на ThreadingHTTPServer в фоновом потоке.
+
+    Используется как контекстный менеджер; адрес для AviasalesAPI(base_url=...)
+    доступен в свойстве url после старта.
+    """
+
+    def __init__(
+        self,
+        pending_polls: int = 1,
+        tickets_per_search: int = 10,
+        batch_size: Optional[int] = None,
+        latency: tuple[float, float] = (0.0, 0.0),
+        pending_status: int = 204,
+        retry_after: Optional[int] = None,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        :param pending_polls: сколько запросов результатов отвечать pending_status.
+        :param tickets_per_search: сколько билетов всего вернуть по поиску.
+        :param batch_size: сколько новых билетов «появляется» за опрос;
+            по умолчанию все сразу.
+        :param latency: диапазон задержки ответа (min, max), секунды.
+        :param pending_status: код ответа, пока результаты «готовятся» (204/304).
+        :param retry_after: значение Retry-After в ответах pending_status.
+        :param seed: зерно генератора цен и рейсов.
+        :param host: адрес, на котором слушает сервер.
+        :param port: порт; 0 — любой свободный.
+        """
+        self.pending_polls = pending_polls
+        self.tickets_per_search = tickets_per_search
+        self.batch_size = batch_size or tickets_per_search
+        self.latency = latency
+        self.pending_status = pending_status
+        self.retry_after = retry_after
+        self.seed = seed
+        self.requests: dict[str, int] = {}
+        self.searches: dict[str, FakeSearch] = {}
+        self._host = host
+        self._port = port
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "FakeTicketsApi":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Базовый URL запущенного сервера, например http://127.0.0.1:50123."""
+        if self._server is None:
+            raise RuntimeError("Сервер не запущен")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """Запускает сервер в фоновом потоке."""
+        fake = self
+
+        class Handler(_FakeHandler):
+            api = fake
+
+        self._server = ThreadingHTTPServer((self._host, self._port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="fake-tickets-api",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает сервер и освобождает порт."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def handle_start(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        """
+        Обрабатывает /search/v2/start.
+
+        :param payload: тело запроса.
+        :return: (код ответа, тело ответа).
+        """
+        directions = payload.get("search_params", {}).get("directions") or []
+        if not directions or any(
+            d.get("origin") == d.get("destination") for d in directions
+        ):
+            return 400, {"error": "invalid directions"}
+
+        search_id = str(uuid.uuid4())
+        with self._lock:
+            self.searches[search_id] = FakeSearch(search_id, directions)
+        return 200, {"search_id": search_id}
+
+    def handle_results(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        """
+        Обрабатывает /search/v3.2/results.
+
+        Пока число опросов не превысило pending_polls — pending_status;
+        затем каждый опрос «открывает» batch_size новых билетов и отдаёт
+        до limit ещё не отправленных. Последний чанк помечается is_over.
+
+        :param payload: тело запроса.
+        :return: (код ответа, тело ответа или None для пустого тела).
+        """
+        with self._lock:
+            search = self.searches.get(payload.get("search_id"))
+            if search is None:
+                return 404, {"error": "unknown search_id"}
+            search.polls += 1
+            ready_polls = search.polls - self.pending_polls
+            if ready_polls <= 0:
+                return self.pending_status, None
+
+            available = min(self.tickets_per_search, ready_polls * self.batch_size)
+            limit = int(payload.get("limit") or self.tickets_per_search)
+            start = search.sent
+            end = min(available, start + limit)
+            search.sent = end
+
+        chunk = self._build_chunk(search, start, end)
+        chunk["is_over"] = end >= self.tickets_per_search
+        return 200, [chunk]
+
+    def _build_chunk(self, search: FakeSearch, start: int, end: int) -> dict[str, Any]:
+        """
+        Формирует чанк результатов в формате v3.2 для билетов [start, end).
+
+        Билеты детерминированы: зависят только от seed, маршрута и номера.
+        """
+        tickets = []
+        flight_legs = []
+        for index in range(start, end):
+            rng = random.Random(f"{self.seed}:{search.directions}:{index}")
+            segments = []
+            for direction in search.directions:
+                flights = []
+                for leg in self._build_legs(rng, direction):
+                    flights.append(len(flight_legs))
+                    flight_legs.append(leg)
+                segments.append({"flights": flights})
+            price = rng.randrange(3000, 40000, 10)
+            tickets.append(
+                {
+                    "id": f"{search.search_id}:{index}",
+                    "signature": f"sig-{index}",
+                    "segments": segments,
+                    "proposals": [
+                        {
+                            "id": f"p-{index}",
+                            "agent_id": rng.randrange(1, 50),
+                            "price": {"currency_code": "rub", "value": price},
+                            "price_per_person": {
+                                "currency_code": "rub",
+                                "value": price,
+                            },
+                        }
+                    ],
+                }
+            )
+        return {
+            "chunk_id": str(uuid.uuid4()),
+            "search_id": search.search_id,
+            "last_update_timestamp": int(time.time()),
+            "tickets": tickets,
+            "flight_legs": flight_legs,
+        }
+
+    @staticmethod
+    def _build_legs(
+        rng: random.Random, direction: dict[str, str]
+    ) -> list[dict[str, Any]]:
+        """
+        Рейсы одного направления: прямой или с одной пересадкой через MOW.
+        """
+        day = datetime.strptime(direction["date"], "%Y-%m-%d")
+        departure = day + timedelta(minutes=rng.randrange(0, 24 * 60, 5))
+        points = [direction["origin"], direction["destination"]]
+        if rng.random() < 0.4:
+            points.insert(1, "MOW")
+        legs = []
+        for origin, destination in zip(points, points[1:]):
+            arrival = departure + timedelta(minutes=rng.randrange(60, 300, 5))
+            legs.append(
+                {
+                    "origin": origin,
+                    "destination": destination,
+                    "local_departure_date_time": departure.isoformat(),
+                    "local_arrival_date_time": arrival.isoformat(),
+                    "operating_carrier_designator": {
+                        "carrier": rng.choice(CARRIERS),
+                        "number": str(rng.randrange(100, 9999)),
+                    },
+                }
+            )
+            departure = arrival + timedelta(minutes=rng.randrange(45, 240, 5))
+        return legs
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    """HTTP-обработчик: маршрутизирует запросы в FakeTicketsApi."""
+
+    api: FakeTicketsApi
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят отдельными записями: без TCP_NODELAY каждый
+    # ответ ждёт delayed ACK клиента (~40 мс) и искажает замеры задержек.
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "invalid json"})
+            return
+
+        api = self.api
+        with api._lock:
+            api.requests[self.path] = api.requests.get(self.path, 0) + 1
+
+        low, high = api.latency
+        if high > 0:
+            time.sleep(random.uniform(low, high))
+
+        if self.path == "/search/v2/start":
+            status, body = api.handle_start(payload)
+        elif self.path == "/search/v3.2/results":
+            status, body = api.handle_results(payload)
+        else:
+            status, body = 404, {"error": "not found"}
+        self._send(status, body)
+
+    def _send(self, status: int, body: Any) -> None:
+        self.send_response(status)
+        self.send_header("X-Request-Id", str(uuid.uuid4()))
+        if status == self.api.pending_status and self.api.retry_after is not None:
+            self.send_header("Retry-After", str(self.api.retry_after))
+        if status in (204, 304) or body is None:
+            # У 204/304 тела нет по протоколу, Content-Length не нужен.
+            self.end_headers()
+            return
+        content = json.dumps(body).encode("utf-8")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
@@ -0,0 +1,122 @@
+"""
+Межпроцессная блокировка файла и атомарная запись JSON.
+
+Нужны там, где несколько процессов (например, воркеры pytest-xdist) делят
+один файловый кэш: блокировка даёт «одно обновление на всех», атомарная
+запись через временный файл и os.replace исключает чтение недописанного файла.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+    Эксклюзивная блокировка на уровне ОС через lock-файл.
+
+    Используется как контекстный менеджер. Блокировка снимается ОС при
+    завершении процесса, поэтому «зависших» lock-файлов после падения
+    воркера не остаётся.
+    """
+
+    def __init__(
+        self, path: str, timeout: float = 120.0, poll_interval: float = 0.1
+    ) -> None:
+        """
+        :param path: путь к lock-файлу (создаётся при необходимости).
+        :param timeout: сколько ждать блокировку, секунды.
+        :param poll_interval: пауза между попытками захвата, секунды.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file: Optional[Any] = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def acquire(self) -> None:
+        """
+        Захватывает блокировку, ожидая не дольше timeout.
+
+        :raises TimeoutError: если блокировку держит другой процесс дольше timeout.
+        """
+        lock_file = open(self.path, "a+")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._lock(lock_file)
+                self._file = lock_file
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    lock_file.close()
+                    raise TimeoutError(
+                        f"Не удалось захватить блокировку {self.path} "
+                        f"за {self.timeout} с"
+                    )
+                time.sleep(self.poll_interval)
+
+    def release(self) -> None:
+        """Снимает блокировку, если она захвачена."""
+        lock_file = self._file
+        self._file = None
+        if lock_file is None:
+            return
+        try:
+            self._unlock(lock_file)
+        finally:
+            lock_file.close()
+
+    @staticmethod
+    def _lock(lock_file: Any) -> None:
+        if os.name == "nt":
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    @staticmethod
+    def _unlock(lock_file: Any) -> None:
+        if os.name == "nt":
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """
+    Атомарно записывает JSON: во временный файл рядом, затем os.replace.
+
+    Читатели видят либо старое, либо новое содержимое целиком.
+
+    :param path: путь к целевому файлу.
+    :param data: сериализуемые в JSON данные.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
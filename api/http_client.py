@@ -2,14 +2,123 @@
 HTTP-клиент с подстановкой cookies для запросов к API Aviasales.
 
 Принимает «поставщика cookies» (например, CookieManager), сам формирует
-заголовки Cookie, origin, referer и выполняет requests.request(...).
+заголовки Cookie, origin, referer и выполняет запрос через пул соединений.
 Вся специфика «как вызывать API Aviasales» с точки зрения заголовков
 сосредоточена здесь; менеджер cookies остаётся универсальным.
+
+Пул соединений (requests.Session с HTTPAdapter) общий на процесс для каждой
+конфигурации PoolConfig: все экземпляры клиента с одинаковой конфигурацией
+переиспользуют keep-alive соединения и не платят за TCP+TLS handshake
+на каждом запросе.
 """
 
-from typing import Any, Protocol
+import atexit
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional, Protocol
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from api.cassette import Cassette
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    Настройки пула HTTP-соединений.
+
+    :param pool_connections: количество пулов по хостам, кэшируемых адаптером.
+    :param pool_maxsize: максимум соединений в пуле одного хоста.
+    :param max_retries: число повторов при ошибках соединения; идемпотентные
+        методы (GET и т.п.) повторяются также при ответах 502/503/504.
+    :param backoff_factor: множитель паузы между повторами (urllib3 Retry).
+    :param keep_alive: держать ли соединения открытыми между запросами.
+    """
+
+    pool_connections: int = 10
+    pool_maxsize: int = 20
+    max_retries: int = 3
+    backoff_factor: float = 0.3
+    keep_alive: bool = True
+
+
+# Ответы, после которых идемпотентный запрос повторяется.
+RETRY_STATUSES = (502, 503, 504)
+# Методы, которые можно повторить после ответа сервера (без POST).
+RETRY_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+_shared_sessions: dict[PoolConfig, requests.Session] = {}
+_shared_sessions_lock = threading.Lock()
+
+
+def get_shared_session(pool_config: Optional[PoolConfig] = None) -> requests.Session:
+    """
+    Возвращает общую на процесс сессию с пулом соединений для конфигурации.
+
+    Сессия создаётся при первом обращении и затем переиспользуется всеми
+    клиентами с той же конфигурацией.
+
+    :param pool_config: настройки пула; по умолчанию PoolConfig().
+    :return: requests.Session с подключённым HTTPAdapter.
+    """
+    config = pool_config or PoolConfig()
+    with _shared_sessions_lock:
+        session = _shared_sessions.get(config)
+        if session is None:
+            session = _create_session(config)
+            _shared_sessions[config] = session
+        return session
+
+
+def close_shared_sessions() -> None:
+    """
+    Закрывает все общие сессии и освобождает соединения пула.
+
+    Следующий запрос любого клиента создаст пул заново.
+    """
+    with _shared_sessions_lock:
+        sessions = list(_shared_sessions.values())
+        _shared_sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_shared_sessions)
+
+
+def _create_session(config: PoolConfig) -> requests.Session:
+    """
+    Создаёт сессию с HTTPAdapter по настройкам пула.
+
+    Ошибки установки соединения повторяются для любых методов: запрос
+    до сервера не дошёл. Ответы 502/503/504 и обрывы чтения повторяются
+    только для идемпотентных методов: POST /search/v2/start, принятый
+    сервером до 502, при повторе создал бы второй поиск. Ответы 204/304
+    при опросе результатов не повторяются.
+
+    :param config: настройки пула.
+    :return: новая requests.Session.
+    """
+    retry = Retry(
+        total=config.max_retries,
+        backoff_factor=config.backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not config.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
 
 
 class CookieProvider(Protocol):
@@ -40,14 +149,55 @@ class AviasalesHttpClient:
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     )
 
-    def __init__(self, cookie_provider: CookieProvider) -> None:
+    def __init__(
+        self,
+        cookie_provider: CookieProvider,
+        pool_config: Optional[PoolConfig] = None,
+        session: Optional[requests.Session] = None,
+        cassette: Optional[Cassette] = None,
+    ) -> None:
         """
         Инициализация клиента.
 
         :param cookie_provider: объект с методом get_cookies() -> dict[str, str],
             например экземпляр CookieManager.
+        :param pool_config: настройки пула соединений; клиенты с одинаковой
+            конфигурацией используют одну общую сессию.
+        :param session: готовая сессия (например, из фикстуры); если передана,
+            pool_config игнорируется.
+        :param cassette: кассета для записи ответов или их воспроизведения
+            без сети.
         """
         self._cookie_provider = cookie_provider
+        self._pool_config = pool_config or PoolConfig()
+        self._session = session
+        self._closed = False
+        self.cassette = cassette
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Сессия с пулом соединений, через которую выполняются запросы.
+
+        :raises RuntimeError: если клиент закрыт.
+        """
+        if self._closed:
+            raise RuntimeError("HTTP-клиент закрыт")
+        if self._session is None:
+            self._session = get_shared_session(self._pool_config)
+        return self._session
+
+    def close(self) -> None:
+        """
+        Закрывает клиент: последующие запросы выбрасывают RuntimeError.
+
+        Свою сессию клиент не создаёт, поэтому соединения не закрываются:
+        общая сессия остаётся открытой для других клиентов с той же
+        конфигурацией (её закрывает close_shared_sessions), переданную
+        в конструктор закрывает её владелец.
+        """
+        self._closed = True
+        self._session = None
 
     def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
         """
@@ -55,14 +205,25 @@ class AviasalesHttpClient:
 
         Получает валидные cookies у поставщика, формирует строку заголовка Cookie,
         объединяет с переданными в kwargs заголовками (переданные имеют приоритет)
-        и вызывает requests.request. Также передаёт cookies в kwargs для requests,
-        чтобы библиотека при необходимости использовала их сама.
+        и выполняет запрос через сессию с пулом соединений. Также передаёт
+        cookies в kwargs для requests, чтобы библиотека при необходимости
+        использовала их сама.
+
+        С кассетой в режиме воспроизведения ответ берётся из кассеты без сети
+        и без обращения к поставщику cookies; в режиме записи ответ сохраняется.
 
         :param method: HTTP-метод (GET, POST и т.д.).
         :param url: полный URL запроса.
-        :param kwargs: аргументы для requests.request (headers, json, data и т.д.).
+        :param kwargs: аргументы для Session.request (headers, json, data и т.д.).
         :return: ответ requests.Response.
+        :raises RuntimeError: если клиент закрыт.
         """
+        if self._closed:
+            raise RuntimeError("HTTP-клиент закрыт")
+        cassette = self.cassette
+        if cassette is not None and cassette.replaying:
+            return cassette.play(method, url, kwargs.get("json"))
+
         cookies = self._cookie_provider.get_cookies()
         cookie_header_value = self._format_cookie_header(cookies)
 
@@ -80,7 +241,11 @@ class AviasalesHttpClient:
         kwargs["headers"] = headers
         kwargs["cookies"] = cookies
 
-        return requests.request(method, url, **kwargs)
+        response = self.session.request(method, url, **kwargs)
+
+        if cassette is not None:
+            cassette.record(method, url, kwargs.get("json"), response)
+        return response
 
     def _format_cookie_header(self, cookies: dict[str, str]) -> str:
         """
@@ -0,0 +1,88 @@
+"""
+Менеджер cookies без запуска браузера.
+
+Получает cookies обычным HTTP GET главной страницы Aviasales и разбором
+Set-Cookie; к headless Chrome через CookieManager обращается только если
+в ответе нет обязательных cookies. Файловый кэш, TTL и межпроцессная
+блокировка наследуются от CookieManager без изменений.
+"""
+
+from datetime import timedelta
+from typing import Iterable, Optional
+
+import requests
+
+from api.cookie_manager import CookieManager
+from api.http_client import AviasalesHttpClient
+
+
+class HttpCookieManager(CookieManager):
+    """
+    Поставщик cookies через HTTP GET с откатом на Selenium.
+
+    Реализует протокол CookieProvider так же, как CookieManager: отличается
+    только способ получения свежих cookies.
+    """
+
+    LANDING_URL = "https://www.aviasales.ru"
+
+    def __init__(
+        self,
+        cookie_file: Optional[str] = None,
+        ttl: timedelta = timedelta(minutes=30),
+        required_cookies: Iterable[str] = ("auid",),
+        timeout: float = 10.0,
+    ) -> None:
+        """
+        Инициализация менеджера.
+
+        :param cookie_file: путь к файлу для кэширования cookies; по умолчанию
+            default_cookie_file().
+        :param ttl: срок годности сохранённых cookies.
+        :param required_cookies: имена cookies, без которых ответ считается
+            неполным и нужен откат на Selenium.
+        :param timeout: таймаут HTTP-запроса главной страницы, секунды.
+        """
+        super().__init__(cookie_file, ttl)
+        self.required_cookies = frozenset(required_cookies)
+        self.timeout = timeout
+        self.fallbacks = 0
+
+    def _get_fresh_cookies(self) -> dict[str, str]:
+        """
+        Получает cookies главной страницы без браузера.
+
+        Если HTTP-запрос не удался или в ответе нет обязательных cookies,
+        получает их через headless Chrome (CookieManager._get_fresh_cookies).
+
+        :return: словарь имя_куки -> значение.
+        """
+        try:
+            cookies = self._fetch_landing_cookies()
+        except requests.RequestException:
+            cookies = {}
+        if self.required_cookies.issubset(cookies):
+            return cookies
+        self.fallbacks += 1
+        return super()._get_fresh_cookies()
+
+    def _fetch_landing_cookies(self) -> dict[str, str]:
+        """
+        Загружает главную страницу и собирает cookies из Set-Cookie.
+
+        Отдельная сессия нужна, чтобы учесть cookies со всех редиректов
+        и не смешивать их с общим пулом API-клиента.
+
+        :return: словарь имя_куки -> значение.
+        """
+        headers = {
+            "user-agent": AviasalesHttpClient.DEFAULT_USER_AGENT,
+            "accept": "text/html,application/xhtml+xml",
+            "accept-language": "ru-RU,ru;q=0.9",
+        }
+        with requests.Session() as session:
+            response = session.get(
+                self.LANDING_URL, headers=headers, timeout=self.timeout
+            )
+            response.raise_for_status()
+            return {cookie.name: cookie.value for cookie in session.cookies}
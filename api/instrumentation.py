@@ -0,0 +1,263 @@
+"""
+Замеры времени запросов к API: события, хуки и гистограммы задержек.
+
+Каждый запрос AviasalesAPI превращается в событие RequestTiming (endpoint,
+метод, статус, номер попытки опроса, полное время и время до первого байта).
+События передаются подписанным хукам и складываются в гистограммы
+LatencyHistogram в стиле HDR: логарифмические корзины с фиксированной
+относительной точностью, поэтому память не растёт с числом замеров,
+а перцентили считаются без хранения всех значений. Снимок гистограмм
+сохраняется в JSON, например в конце тестовой сессии.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from api.file_lock import atomic_write_json
+
+
+@dataclass(frozen=True, slots=True)
+class RequestTiming:
+    """
+    Замер одного HTTP-запроса.
+
+    Фазы DNS/connect/TLS requests не раскрывает; ttfb берётся из
+    Response.elapsed (от отправки запроса до разбора заголовков ответа).
+
+    :param method: HTTP-метод в верхнем регистре.
+    :param endpoint: путь относительно base_url.
+    :param status_code: статус ответа или None, если запрос упал.
+    :param attempt: номер попытки опроса (1 для одиночных запросов).
+    :param total: полное время запроса с получением тела, секунды.
+    :param ttfb: время до первого байта ответа, секунды, или None.
+    """
+
+    method: str
+    endpoint: str
+    status_code: Optional[int]
+    attempt: int
+    total: float
+    ttfb: Optional[float]
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек с логарифмическими корзинами (HDR-style).
+
+    Значения хранятся в микросекундах: в каждом интервале [2^k, 2^(k+1))
+    2^precision_bits корзин, относительная погрешность перцентилей не больше
+    2^-precision_bits (около 0.8% при precision_bits=7).
+    """
+
+    def __init__(self, precision_bits: int = 7) -> None:
+        """
+        :param precision_bits: число бит точности внутри порядка величины.
+        """
+        self.precision_bits = precision_bits
+        self._counts: dict[tuple[int, int], int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float) -> None:
+        """
+        Учитывает одно значение.
+
+        :param seconds: задержка в секундах.
+        """
+        key = self._bucket(max(1, round(seconds * 1_000_000)))
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self.count += 1
+            self.total += seconds
+            self.min = seconds if self.min is None else min(self.min, seconds)
+            self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Значение перцентиля (верхняя граница корзины).
+
+        :param percent: уровень перцентиля, 0..100.
+        :return: задержка в секундах или None для пустой гистограммы.
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            threshold = max(1, round(self.count * percent / 100))
+            seen = 0
+            for (shift, sub), count in sorted(self._counts.items()):
+                seen += count
+                if seen >= threshold:
+                    upper = ((sub + 1) << shift) - 1
+                    return min(upper / 1_000_000, self.max)
+            return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Сводка гистограммы для JSON-отчёта.
+
+        :return: count, mean, min, max и p50/p90/p99/p999 в секундах.
+        """
+        summary: dict[str, Any] = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+        }
+        for name, percent in (("p50", 50), ("p90", 90), ("p99", 99), ("p999", 99.9)):
+            summary[name] = self.percentile(percent)
+        return summary
+
+    def export(self) -> dict[str, Any]:
+        """
+        Полное состояние гистограммы (корзины и агрегаты) для merge
+        в другом процессе, например в контроллере pytest-xdist.
+
+        :return: сериализуемый словарь.
+        """
+        with self._lock:
+            return {
+                "buckets": [
+                    [shift, sub, count] for (shift, sub), count in self._counts.items()
+                ],
+                "count": self.count,
+                "total": self.total,
+                "min": self.min,
+                "max": self.max,
+            }
+
+    def merge(self, state: dict[str, Any]) -> None:
+        """
+        Добавляет состояние, полученное из export.
+
+        :param state: результат export гистограммы с той же точностью.
+        """
+        if not state["count"]:
+            return
+        with self._lock:
+            for shift, sub, count in state["buckets"]:
+                key = (shift, sub)
+                self._counts[key] = self._counts.get(key, 0) + count
+            self.count += state["count"]
+            self.total += state["total"]
+            self.min = state["min"] if self.min is None else min(self.min, state["min"])
+            self.max = state["max"] if self.max is None else max(self.max, state["max"])
+
+    def _bucket(self, micros: int) -> tuple[int, int]:
+        shift = max(0, micros.bit_length() - 1 - self.precision_bits)
+        return shift, micros >> shift
+
+
+# Хук получает каждое событие RequestTiming.
+TimingHook = Callable[[RequestTiming], None]
+
+
+class Instrumentation:
+    """
+    Приёмник замеров: рассылает события хукам и ведёт гистограммы.
+
+    Гистограммы заводятся по ключу "МЕТОД endpoint" для запросов
+    и по произвольному имени для observe (например, время опроса поиска).
+    """
+
+    def __init__(self) -> None:
+        self._hooks: list[TimingHook] = []
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: TimingHook) -> None:
+        """
+        Подписывает хук на события запросов.
+
+        :param hook: вызываемый объект, принимающий RequestTiming.
+        """
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: TimingHook) -> None:
+        """
+        Отписывает хук; неизвестный хук игнорируется.
+        """
+        with self._lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+
+    def emit(self, timing: RequestTiming) -> None:
+        """
+        Учитывает замер запроса в гистограмме и передаёт его хукам.
+
+        :param timing: замер запроса.
+        """
+        self.histogram(f"{timing.method} {timing.endpoint}").record(timing.total)
+        for hook in list(self._hooks):
+            hook(timing)
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Учитывает произвольную длительность в гистограмме name.
+
+        :param name: имя гистограммы.
+        :param seconds: длительность, секунды.
+        """
+        self.histogram(name).record(seconds)
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """
+        Гистограмма по имени; создаётся при первом обращении.
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            return histogram
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Сводки всех гистограмм.
+
+        :return: имя -> сводка LatencyHistogram.to_dict().
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histogram.to_dict() for name, histogram in sorted(histograms.items())}
+
+    def export(self) -> dict[str, dict[str, Any]]:
+        """
+        Состояние всех гистограмм для передачи в другой процесс.
+
+        :return: имя -> LatencyHistogram.export().
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histogram.export() for name, histogram in histograms.items()}
+
+    def merge(self, exported: dict[str, dict[str, Any]]) -> None:
+        """
+        Добавляет гистограммы другого процесса (результат export).
+
+        :param exported: имя -> состояние гистограммы.
+        """
+        for name, state in exported.items():
+            self.histogram(name).merge(state)
+
+    def dump(self, path: str) -> None:
+        """
+        Атомарно сохраняет снимок гистограмм в JSON-файл.
+
+        :param path: путь к файлу отчёта.
+        """
+        atomic_write_json(path, self.snapshot())
+
+    def reset(self) -> None:
+        """
+        Удаляет все гистограммы; хуки остаются подписанными.
+        """
+        with self._lock:
+            self._histograms.clear()
+
+
+# Общий на процесс приёмник замеров: используется AviasalesAPI по умолчанию.
+default_instrumentation = Instrumentation()
@@ -0,0 +1,175 @@
+"""
+Компактная типизированная модель билетов из ответа /search/v3.2/results.
+
+Ответ API — вложенные словари со множеством полей; для проверок и анализа
+нужны цена, рейсы и перевозчики. Модель хранит только их в объектах
+со __slots__, повторяющиеся строки (коды аэропортов и перевозчиков)
+интернируются, а ненужные вызывающему поля не разбираются вовсе.
+Для декодирования JSON используется orjson, если он установлен.
+"""
+
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - зависит от окружения
+    orjson = None
+
+# Поля билета, которые можно запросить у parse_results (id разбирается всегда).
+FIELDS = frozenset({"price", "segments"})
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    """
+    Декодирует JSON самым быстрым доступным декодером.
+
+    :param content: тело ответа (bytes или str).
+    :return: декодированные данные.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+@dataclass(frozen=True, slots=True)
+class Price:
+    """
+    Цена предложения.
+
+    :param value: сумма.
+    :param currency: код валюты (например, rub).
+    """
+
+    value: float
+    currency: str
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    """
+    Одно направление билета (туда или обратно) со всеми пересадками.
+
+    :param origin: аэропорт вылета первого рейса.
+    :param destination: аэропорт прилёта последнего рейса.
+    :param departure: местное время вылета (ISO 8601).
+    :param arrival: местное время прилёта (ISO 8601).
+    :param carriers: коды перевозчиков рейсов по порядку.
+    :param transfers: количество пересадок.
+    """
+
+    origin: str
+    destination: str
+    departure: str
+    arrival: str
+    carriers: tuple[str, ...]
+    transfers: int
+
+
+@dataclass(frozen=True, slots=True)
+class Ticket:
+    """
+    Билет: идентификатор, минимальная цена среди предложений и направления.
+
+    Поля, не запрошенные при разборе, равны None.
+
+    :param id: идентификатор билета.
+    :param price: минимальная цена или None.
+    :param segments: направления или None.
+    """
+
+    id: str
+    price: Optional[Price] = None
+    segments: Optional[tuple[Segment, ...]] = None
+
+    @property
+    def carrier(self) -> Optional[str]:
+        """Перевозчик первого рейса билета или None, если рейсы не разобраны."""
+        if not self.segments or not self.segments[0].carriers:
+            return None
+        return self.segments[0].carriers[0]
+
+    @property
+    def transfers(self) -> Optional[int]:
+        """Общее количество пересадок по всем направлениям."""
+        if self.segments is None:
+            return None
+        return sum(segment.transfers for segment in self.segments)
+
+
+def parse_results(
+    payload: Union[bytes, str, list],
+    fields: Optional[Iterable[str]] = None,
+) -> list[Ticket]:
+    """
+    Разбирает ответ /search/v3.2/results в список Ticket.
+
+    :param payload: тело ответа (bytes/str) или уже декодированный список чанков.
+    :param fields: какие поля разбирать (подмножество FIELDS); по умолчанию все.
+    :return: билеты из всех чанков в порядке ответа.
+    :raises ValueError: если запрошено неизвестное поле.
+    """
+    wanted = FIELDS if fields is None else frozenset(fields)
+    unknown = wanted - FIELDS
+    if unknown:
+        raise ValueError(f"Неизвестные поля билета: {sorted(unknown)}")
+
+    chunks = loads(payload) if isinstance(payload, (bytes, str)) else payload
+    want_price = "price" in wanted
+    want_segments = "segments" in wanted
+
+    tickets = []
+    for chunk in chunks or []:
+        flight_legs = chunk.get("flight_legs") or []
+        for raw in chunk.get("tickets") or []:
+            tickets.append(
+                Ticket(
+                    id=raw.get("id") or raw.get("signature", ""),
+                    price=_parse_price(raw) if want_price else None,
+                    segments=(
+                        _parse_segments(raw, flight_legs) if want_segments else None
+                    ),
+                )
+            )
+    return tickets
+
+
+def _parse_price(raw: dict[str, Any]) -> Optional[Price]:
+    """Минимальная цена среди предложений билета."""
+    best = None
+    for proposal in raw.get("proposals") or []:
+        price = proposal.get("price")
+        if price and (best is None or price["value"] < best["value"]):
+            best = price
+    if best is None:
+        return None
+    return Price(best["value"], sys.intern(best.get("currency_code", "")))
+
+
+def _parse_segments(
+    raw: dict[str, Any], flight_legs: list[dict[str, Any]]
+) -> tuple[Segment, ...]:
+    """Направления билета по индексам рейсов в flight_legs чанка."""
+    segments = []
+    for segment in raw.get("segments") or []:
+        legs = [flight_legs[i] for i in segment.get("flights") or []]
+        if not legs:
+            continue
+        segments.append(
+            Segment(
+                origin=sys.intern(legs[0]["origin"]),
+                destination=sys.intern(legs[-1]["destination"]),
+                departure=legs[0].get("local_departure_date_time", ""),
+                arrival=legs[-1].get("local_arrival_date_time", ""),
+                carriers=tuple(
+                    sys.intern(
+                        leg.get("operating_carrier_designator", {}).get("carrier", "")
+                    )
+                    for leg in legs
+                ),
+                transfers=len(legs) - 1,
+            )
+        )
+    return tuple(segments)
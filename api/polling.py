@@ -0,0 +1,301 @@
+"""
+Стратегии опроса результатов поиска (/search/v3.2/results).
+
+Отвечает только на вопрос «сколько ждать перед следующим запросом и когда
+прекратить»: HTTP и разбор ответов остаются в клиентах API. Стратегию
+можно подменить без изменения AviasalesAPI/AsyncAviasalesAPI.
+"""
+
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional, Sequence
+
+
+def route_key(origin: str, destination: str) -> str:
+    """
+    Ключ маршрута для статистики опроса.
+
+    :param origin: код аэропорта вылета.
+    :param destination: код аэропорта прилёта.
+    :return: строка вида "KUF-AER".
+    """
+    return f"{origin}-{destination}"
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Достаёт подсказку сервера о паузе из заголовка Retry-After.
+
+    Поддерживаются оба формата заголовка: число секунд и HTTP-дата.
+
+    :param headers: заголовки ответа.
+    :return: пауза в секундах или None, если подсказки нет или она некорректна.
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RouteLatencyHistory:
+    """
+    Наблюдаемое время до первого результата по маршрутам.
+
+    Хранит экспоненциально сглаженное среднее (EWMA), чтобы следующий опрос
+    того же маршрута начинался примерно тогда, когда результаты обычно готовы.
+    Потокобезопасна: используется из параллельных опросов search_many.
+    """
+
+    def __init__(self, smoothing: float = 0.3) -> None:
+        """
+        :param smoothing: вес нового наблюдения в EWMA (0..1].
+        """
+        self.smoothing = smoothing
+        self._estimates: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, elapsed: float) -> None:
+        """
+        Учитывает наблюдение времени до первого результата.
+
+        :param route: ключ маршрута (см. route_key).
+        :param elapsed: секунды от старта опроса до первого ответа с билетами.
+        """
+        with self._lock:
+            previous = self._estimates.get(route)
+            if previous is None:
+                self._estimates[route] = elapsed
+            else:
+                self._estimates[route] = (
+                    self.smoothing * elapsed + (1 - self.smoothing) * previous
+                )
+
+    def estimate(self, route: str) -> Optional[float]:
+        """
+        :param route: ключ маршрута.
+        :return: сглаженное время до первого результата или None, если
+            маршрут ещё не наблюдался.
+        """
+        with self._lock:
+            return self._estimates.get(route)
+
+    def snapshot(self) -> dict[str, float]:
+        """Копия всех оценок: маршрут -> секунды."""
+        with self._lock:
+            return dict(self._estimates)
+
+
+class PollSchedule(ABC):
+    """
+    Расписание одного цикла опроса.
+
+    Создаётся стратегией на каждый цикл; first_delay вызывается один раз
+    перед первым запросом, next_delay — после каждого «ещё не готово».
+    Наследник обязан реализовать оба метода.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.attempt = 0
+
+    def elapsed(self) -> float:
+        """Секунды с начала цикла опроса."""
+        return time.monotonic() - self.started
+
+    @abstractmethod
+    def first_delay(self) -> float:
+        """Пауза перед первым запросом результатов, секунды."""
+
+    @abstractmethod
+    def next_delay(self, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Пауза перед следующим запросом.
+
+        :param retry_after: подсказка сервера (Retry-After), если была.
+        :return: секунды ожидания или None, если опрос пора прекратить.
+        """
+
+
+class PollingStrategy(ABC):
+    """
+    Базовая стратегия опроса: создаёт расписания и учитывает результаты.
+    """
+
+    @abstractmethod
+    def schedule(self, routes: Sequence[str] = ()) -> PollSchedule:
+        """
+        Создаёт расписание для цикла опроса.
+
+        :param routes: маршруты, которые опрашиваются в этом цикле
+            (один для search_result, несколько для search_many).
+        :return: новое расписание.
+        """
+
+    def record_first_result(self, route: Optional[str], elapsed: float) -> None:
+        """
+        Сообщает стратегии, через сколько секунд маршрут вернул билеты.
+
+        :param route: ключ маршрута или None, если маршрут неизвестен.
+        :param elapsed: секунды от начала цикла опроса.
+        """
+
+
+class _FixedSchedule(PollSchedule):
+    def __init__(self, initial_delay: float, interval: float, max_attempts: int) -> None:
+        super().__init__()
+        self._initial_delay = initial_delay
+        self._interval = interval
+        self._max_attempts = max_attempts
+
+    def first_delay(self) -> float:
+        self.attempt = 1
+        return self._initial_delay
+
+    def next_delay(self, retry_after: Optional[float] = None) -> Optional[float]:
+        if self.attempt >= self._max_attempts:
+            return None
+        self.attempt += 1
+        return self._interval
+
+
+class FixedPolling(PollingStrategy):
+    """
+    Фиксированные паузы: прежнее поведение search_result (2 с, затем до 5 попыток по 2 с).
+    """
+
+    def __init__(
+        self, initial_delay: float = 2.0, interval: float = 2.0, max_attempts: int = 5
+    ) -> None:
+        """
+        :param initial_delay: пауза перед первым запросом, секунды.
+        :param interval: пауза между запросами, секунды.
+        :param max_attempts: максимум запросов результатов.
+        """
+        self.initial_delay = initial_delay
+        self.interval = interval
+        self.max_attempts = max_attempts
+
+    def schedule(self, routes: Sequence[str] = ()) -> PollSchedule:
+        return _FixedSchedule(self.initial_delay, self.interval, self.max_attempts)
+
+
+class _BackoffSchedule(PollSchedule):
+    def __init__(self, strategy: "BackoffPolling", initial_delay: float) -> None:
+        super().__init__()
+        self._strategy = strategy
+        self._initial_delay = initial_delay
+        self._delay = strategy.initial_delay
+
+    def first_delay(self) -> float:
+        self.attempt = 1
+        return self._clip(self._initial_delay)
+
+    def next_delay(self, retry_after: Optional[float] = None) -> Optional[float]:
+        strategy = self._strategy
+        if strategy.max_attempts is not None and self.attempt >= strategy.max_attempts:
+            return None
+        if strategy.timeout is not None and self.elapsed() >= strategy.timeout:
+            return None
+
+        if retry_after is not None and strategy.honor_retry_after:
+            delay = retry_after
+        else:
+            delay = self._delay * strategy.rng.uniform(
+                1 - strategy.jitter, 1 + strategy.jitter
+            )
+            self._delay = min(self._delay * strategy.factor, strategy.max_delay)
+
+        self.attempt += 1
+        return self._clip(delay)
+
+    def _clip(self, delay: float) -> float:
+        """Не даёт паузе выйти за общий дедлайн опроса."""
+        timeout = self._strategy.timeout
+        if timeout is None:
+            return max(0.0, delay)
+        return max(0.0, min(delay, timeout - self.elapsed()))
+
+
+class BackoffPolling(PollingStrategy):
+    """
+    Экспоненциальная пауза с джиттером, общим дедлайном и учётом Retry-After.
+
+    Первая пауза берётся из истории маршрута (если маршрут уже наблюдался),
+    поэтому быстрые маршруты не ждут лишнего, а медленные не тратят попытки
+    впустую на слишком частые запросы.
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = 1.0,
+        factor: float = 1.5,
+        max_delay: float = 5.0,
+        jitter: float = 0.2,
+        timeout: Optional[float] = 30.0,
+        max_attempts: Optional[int] = None,
+        honor_retry_after: bool = True,
+        history: Optional[RouteLatencyHistory] = None,
+        lead: float = 0.8,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """
+        :param initial_delay: первая пауза для неизвестных маршрутов и база
+            для экспоненты, секунды.
+        :param factor: множитель паузы после каждого «ещё не готово».
+        :param max_delay: верхняя граница паузы, секунды.
+        :param jitter: относительный разброс паузы (0.2 — ±20%).
+        :param timeout: общий дедлайн цикла опроса, секунды; None — без дедлайна.
+        :param max_attempts: максимум запросов результатов; None — без ограничения.
+        :param honor_retry_after: использовать ли Retry-After из ответа сервера.
+        :param history: история времени до первого результата по маршрутам.
+        :param lead: доля оценки из истории, используемая как первая пауза;
+            меньше 1, чтобы оценка могла снижаться, если сервер стал быстрее.
+        :param rng: генератор случайных чисел для джиттера.
+        """
+        self.initial_delay = initial_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.honor_retry_after = honor_retry_after
+        self.history = history if history is not None else RouteLatencyHistory()
+        self.lead = lead
+        self.rng = rng or random.Random()
+
+    def schedule(self, routes: Sequence[str] = ()) -> PollSchedule:
+        estimates = [
+            estimate
+            for estimate in (self.history.estimate(route) for route in routes)
+            if estimate is not None
+        ]
+        # В общем цикле опроса ждём самый быстрый из известных маршрутов.
+        if estimates:
+            initial_delay = min(estimates) * self.lead
+        else:
+            initial_delay = self.initial_delay
+        return _BackoffSchedule(self, initial_delay)
+
+    def record_first_result(self, route: Optional[str], elapsed: float) -> None:
+        if route is not None:
+            self.history.record(route, elapsed)
+
+
+# История по умолчанию общая на процесс: новые экземпляры AviasalesAPI
+# начинают опрос маршрута с уже наблюдавшейся задержки.
+default_route_history = RouteLatencyHistory()
+
+
+def default_polling() -> PollingStrategy:
+    """Стратегия опроса по умолчанию для клиентов API."""
+    return BackoffPolling(history=default_route_history)
@@ -0,0 +1,280 @@
+"""
+Календарь цен по маршруту: минимальная цена на каждую дату или пару дат.
+
+Окно дат разворачивается в набор SearchSpec (в один конец — по дате,
+туда-обратно — по парам дат в пределах длительности поездки), повторы
+отбрасываются, и поиски идут через AviasalesAPI.search_many партиями
+ограниченного размера. Ячейки календаря помнят время обновления, поэтому
+повторный прогон (например, ежедневное обновление окна на 90 дней)
+перезапрашивает только устаревшие и не полученные ранее ячейки.
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from typing import Optional
+
+from api.aviasales_api import AviasalesAPI, SearchSpec
+from api.file_lock import atomic_write_json
+from api.models import parse_results
+from api.polling import PollingStrategy
+
+# Ключ ячейки: (дата туда, дата обратно или None для поиска в один конец).
+CellKey = tuple[str, Optional[str]]
+
+# Сколько билетов запрашивать на ячейку: минимум ищется среди них, а при
+# limit=1 в ячейку попала бы цена первого пришедшего билета.
+RESULTS_LIMIT = 100
+
+
+@dataclass(slots=True)
+class CalendarCell:
+    """
+    Ячейка календаря.
+
+    :param price: минимальная цена или None, если билетов нет.
+    :param currency: код валюты цены.
+    :param updated_at: время получения результата (unix).
+    """
+
+    price: Optional[float]
+    currency: Optional[str]
+    updated_at: float
+
+
+class PriceCalendar:
+    """
+    Календарь минимальных цен по маршруту и составу пассажиров.
+
+    Если задан path, ячейки загружаются из файла при создании
+    и сохраняются после каждого sweep.
+    """
+
+    def __init__(
+        self,
+        origin: str,
+        destination: str,
+        adults: int = 1,
+        children: int = 0,
+        infants: int = 0,
+        max_age: float = 86400.0,
+        path: Optional[str] = None,
+    ) -> None:
+        """
+        :param origin: код аэропорта вылета.
+        :param destination: код аэропорта прилёта.
+        :param adults: количество взрослых.
+        :param children: количество детей.
+        :param infants: количество младенцев.
+        :param max_age: через сколько секунд ячейка считается устаревшей.
+        :param path: JSON-файл для хранения ячеек между запусками.
+        """
+        self.origin = origin
+        self.destination = destination
+        self.adults = adults
+        self.children = children
+        self.infants = infants
+        self.max_age = max_age
+        self.path = path
+        self.cells: dict[CellKey, CalendarCell] = {}
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def specs(
+        self,
+        first_date: str,
+        last_date: str,
+        min_stay: Optional[int] = None,
+        max_stay: Optional[int] = None,
+    ) -> list[SearchSpec]:
+        """
+        Поиски для окна дат вылета (границы включительно).
+
+        Без min_stay — поиски в один конец на каждую дату. С min_stay —
+        туда-обратно на каждую пару дат с длительностью поездки
+        от min_stay до max_stay дней (max_stay по умолчанию равен min_stay);
+        дата возврата может выходить за last_date.
+
+        :param first_date: первая дата вылета (YYYY-MM-DD).
+        :param last_date: последняя дата вылета (YYYY-MM-DD).
+        :param min_stay: минимальная длительность поездки, дни.
+        :param max_stay: максимальная длительность поездки, дни.
+        :return: список SearchSpec без повторов.
+        :raises ValueError: если окно или длительность заданы неверно.
+        """
+        start, end = date.fromisoformat(first_date), date.fromisoformat(last_date)
+        if end < start:
+            raise ValueError(f"Окно дат пустое: {first_date} > {last_date}")
+        if max_stay is not None and min_stay is None:
+            raise ValueError("max_stay задан без min_stay")
+        if min_stay is not None:
+            max_stay = min_stay if max_stay is None else max_stay
+            if min_stay < 0 or max_stay < min_stay:
+                raise ValueError(f"Неверная длительность поездки: {min_stay}..{max_stay}")
+
+        keys: list[CellKey] = []
+        day = start
+        while day <= end:
+            if min_stay is None:
+                keys.append((day.isoformat(), None))
+            else:
+                for stay in range(min_stay, max_stay + 1):
+                    keys.append((day.isoformat(), (day + timedelta(stay)).isoformat()))
+            day += timedelta(1)
+        return [self._spec(key) for key in dict.fromkeys(keys)]
+
+    def is_stale(self, spec: SearchSpec, now: Optional[float] = None) -> bool:
+        """
+        Нужно ли перезапросить ячейку поиска.
+
+        :param spec: поиск календаря.
+        :param now: текущее время (unix); по умолчанию time.time().
+        :return: True, если ячейки нет или она старше max_age.
+        """
+        cell = self.cells.get((spec.date_from, spec.date_to))
+        if cell is None:
+            return True
+        now = time.time() if now is None else now
+        return now - cell.updated_at > self.max_age
+
+    def update(self, spec: SearchSpec, data: list) -> CalendarCell:
+        """
+        Записывает в ячейку минимальную цену из результатов поиска.
+
+        :param spec: поиск календаря.
+        :param data: данные search_result.
+        :return: обновлённая ячейка.
+        """
+        prices = [
+            ticket.price
+            for ticket in parse_results(data, fields=("price",))
+            if ticket.price is not None
+        ]
+        best = min(prices, key=lambda price: price.value, default=None)
+        cell = CalendarCell(
+            price=best.value if best else None,
+            currency=best.currency if best else None,
+            updated_at=time.time(),
+        )
+        self.cells[(spec.date_from, spec.date_to)] = cell
+        return cell
+
+    def matrix(
+        self,
+    ) -> tuple[list[str], list[Optional[str]], list[list[Optional[float]]]]:
+        """
+        Календарь в виде матрицы цен.
+
+        Строки — даты вылета туда, столбцы — даты обратно (единственный
+        столбец None для поиска в один конец). Пустые ячейки равны None.
+
+        :return: (даты туда, даты обратно, строки цен).
+        """
+        departures = sorted({key[0] for key in self.cells})
+        returns = sorted({key[1] for key in self.cells}, key=lambda d: d or "")
+        rows = []
+        for departure in departures:
+            row = []
+            for return_date in returns:
+                cell = self.cells.get((departure, return_date))
+                row.append(cell.price if cell else None)
+            rows.append(row)
+        return departures, returns, rows
+
+    def save(self) -> None:
+        """
+        Сохраняет ячейки в path (атомарно); без path ничего не делает.
+        """
+        if self.path is None:
+            return
+        atomic_write_json(
+            self.path,
+            {
+                "origin": self.origin,
+                "destination": self.destination,
+                "passengers": [self.adults, self.children, self.infants],
+                "cells": [
+                    {"date_from": key[0], "date_to": key[1], **asdict(cell)}
+                    for key, cell in self.cells.items()
+                ],
+            },
+        )
+
+    def _load(self) -> None:
+        """
+        Загружает ячейки из path; файл другого маршрута или повреждённый
+        игнорируется — календарь будет собран заново.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if (
+                stored["origin"] != self.origin
+                or stored["destination"] != self.destination
+                or stored["passengers"] != [self.adults, self.children, self.infants]
+            ):
+                return
+            self.cells = {
+                (item["date_from"], item["date_to"]): CalendarCell(
+                    item["price"], item["currency"], item["updated_at"]
+                )
+                for item in stored["cells"]
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            self.cells = {}
+
+    def _spec(self, key: CellKey) -> SearchSpec:
+        return SearchSpec(
+            self.origin,
+            self.destination,
+            key[0],
+            key[1],
+            adults=self.adults,
+            children=self.children,
+            infants=self.infants,
+        )
+
+
+def sweep(
+    api: AviasalesAPI,
+    calendar: PriceCalendar,
+    specs: list[SearchSpec],
+    max_in_flight: int = 30,
+    max_workers: int = 10,
+    polling: Optional[PollingStrategy] = None,
+    limit: int = RESULTS_LIMIT,
+) -> int:
+    """
+    Обновляет устаревшие ячейки календаря.
+
+    Повторяющиеся и свежие поиски пропускаются, остальные идут через
+    search_many партиями не больше max_in_flight одновременных поисков.
+    Результаты каждого поиска дочитываются до is_over (drain), чтобы
+    минимум считался по всем билетам, а не по первой пачке.
+    Неудавшийся поиск оставляет ячейку прежней и будет повторён
+    при следующем прогоне.
+
+    :param api: клиент API.
+    :param calendar: календарь для обновления.
+    :param specs: поиски окна (см. PriceCalendar.specs).
+    :param max_in_flight: максимум одновременно опрашиваемых поисков.
+    :param max_workers: максимум одновременных HTTP-запросов.
+    :param polling: стратегия опроса; по умолчанию api.polling.
+    :param limit: сколько билетов запрашивать в одном ответе результатов.
+    :return: количество обновлённых ячеек.
+    """
+    now = time.time()
+    stale = [spec for spec in dict.fromkeys(specs) if calendar.is_stale(spec, now)]
+    updated = 0
+    for start in range(0, len(stale), max_in_flight):
+        batch = stale[start:start + max_in_flight]
+        for spec, data in api.search_many(
+            batch, max_workers, polling, limit, drain=True
+        ):
+            if data is not None:
+                calendar.update(spec, data)
+                updated += 1
+    calendar.save()
+    return updated
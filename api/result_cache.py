@@ -0,0 +1,149 @@
+"""
+Кэш результатов поиска по нормализованным параметрам поиска.
+
+Повторный одинаковый поиск (те же направления, даты, пассажиры, класс)
+в пределах окна свежести отдаёт сохранённые билеты без запросов к серверу.
+Кэш в памяти с вытеснением LRU, опционально — на диске, чтобы переживать
+перезапуск тестов. Статистика попаданий ведётся по маршрутам.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from api.file_lock import atomic_write_json
+
+
+class SearchResultCache:
+    """
+    Кэш результатов /search/v3.2/results с TTL, LRU и дисковым хранилищем.
+
+    Потокобезопасен: используется из параллельных опросов search_many.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 600.0,
+        max_entries: int = 256,
+        directory: Optional[str] = None,
+    ) -> None:
+        """
+        :param ttl: окно свежести результатов, секунды.
+        :param max_entries: максимум записей в памяти (старые вытесняются LRU).
+        :param directory: каталог дискового кэша; None — только память.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: OrderedDict[str, tuple[float, list]] = OrderedDict()
+        self._stats: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(search_params: dict[str, Any]) -> str:
+        """
+        Ключ кэша по канонизированным search_params.
+
+        :param search_params: раздел search_params из payload /search/v2/start.
+        :return: hex-дайджест канонического JSON.
+        """
+        canonical = json.dumps(search_params, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, route: Optional[str] = None) -> Optional[list]:
+        """
+        Возвращает свежие результаты по ключу и учитывает попадание/промах.
+
+        :param key: ключ из make_key.
+        :param route: маршрут для статистики (см. polling.route_key).
+        :return: сохранённые данные или None.
+        """
+        with self._lock:
+            data = self._get_memory(key)
+        if data is None:
+            data = self._get_disk(key)
+        with self._lock:
+            counters = self._stats.setdefault(route or "", {"hits": 0, "misses": 0})
+            counters["hits" if data is not None else "misses"] += 1
+        return data
+
+    def put(self, key: str, data: list) -> None:
+        """
+        Сохраняет результаты поиска.
+
+        :param key: ключ из make_key.
+        :param data: данные ответа /search/v3.2/results.
+        """
+        stored_at = time.time()
+        with self._lock:
+            self._put_memory(key, stored_at, data)
+        if self.directory is not None:
+            atomic_write_json(self._path(key), {"stored_at": stored_at, "data": data})
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Статистика по маршрутам.
+
+        :return: маршрут -> {hits, misses, hit_rate}.
+        """
+        with self._lock:
+            result = {}
+            for route, counters in self._stats.items():
+                total = counters["hits"] + counters["misses"]
+                result[route] = {
+                    "hits": counters["hits"],
+                    "misses": counters["misses"],
+                    "hit_rate": counters["hits"] / total if total else 0.0,
+                }
+            return result
+
+    def _get_memory(self, key: str) -> Optional[list]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, data = entry
+        if time.time() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def _put_memory(self, key: str, stored_at: float, data: list) -> None:
+        self._entries[key] = (stored_at, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_disk(self, key: str) -> Optional[list]:
+        """
+        Читает запись с диска; просроченную или повреждённую удаляет.
+        """
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            stored_at, data = entry["stored_at"], entry["data"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            stored_at, data = 0.0, None
+        if time.time() - stored_at > self.ttl:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        with self._lock:
+            self._put_memory(key, stored_at, data)
+        return data
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
@@ -0,0 +1,125 @@
+"""
+Бенчмарки API-клиента против фейкового tickets-api в том же процессе.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_api                  # сравнить с базовой линией
+    python -m benchmarks.bench_api --save-baseline  # записать базовую линию
+
+Код выхода 1, если найдены регрессии относительно базовой линии.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import timedelta
+
+from api.aviasales_api import AviasalesAPI, SearchSpec, build_search_payload
+from api.cookie_manager import CachedCookieProvider, CookieManager
+from api.fake_server import FakeTicketsApi, StaticCookieProvider
+from api.http_client import AviasalesHttpClient
+from api.instrumentation import Instrumentation
+from api.polling import FixedPolling
+from benchmarks.harness import (
+    BenchResult,
+    find_regressions,
+    format_results,
+    load_baseline,
+    run_benchmark,
+    save_baseline,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+DIRECTIONS = [
+    {"origin": "KUF", "destination": "AER", "date": "2026-11-08"},
+    {"origin": "AER", "destination": "KUF", "date": "2026-11-15"},
+]
+
+
+def bench_http_client(fake: FakeTicketsApi, duration: float) -> list[BenchResult]:
+    """AviasalesHttpClient.request: один поток и параллельно через общий пул."""
+    client = AviasalesHttpClient(StaticCookieProvider())
+    url = f"{fake.url}/search/v2/start"
+    payload = build_search_payload(DIRECTIONS)
+
+    def request() -> None:
+        client.request("post", url, json=payload)
+
+    return [
+        run_benchmark("http_client.request", request, duration),
+        run_benchmark("http_client.request x8", request, duration, concurrency=8),
+    ]
+
+
+def bench_cookies(directory: str, duration: float) -> list[BenchResult]:
+    """CookieManager.get_cookies из файла и через CachedCookieProvider."""
+    manager = CookieManager(
+        os.path.join(directory, "cookies.json"), ttl=timedelta(hours=1)
+    )
+    manager._save_cookies({"auid": "bench"})
+    cached = CachedCookieProvider(manager)
+    return [
+        run_benchmark("cookie_manager.get_cookies", manager.get_cookies, duration),
+        run_benchmark("cached_cookies.get_cookies", cached.get_cookies, duration),
+    ]
+
+
+def bench_payloads(duration: float) -> list[BenchResult]:
+    """Построение payload поиска туда-обратно и в один конец."""
+    spec = SearchSpec("KUF", "AER", "2026-11-08", "2026-11-15", adults=2)
+    one_way = SearchSpec("KUF", "AER", "2026-11-08")
+    return [
+        run_benchmark("payload.search_start", spec.payload, duration),
+        run_benchmark("payload.search_one_way", one_way.payload, duration),
+    ]
+
+
+def bench_search(fake: FakeTicketsApi, duration: float) -> list[BenchResult]:
+    """Полный цикл: search_one_way и опрос search_result без пауз."""
+    api = AviasalesAPI(
+        cookie_provider=StaticCookieProvider(),
+        base_url=fake.url,
+        polling=FixedPolling(initial_delay=0, interval=0, max_attempts=10),
+        instrumentation=Instrumentation(),
+    )
+
+    def search() -> None:
+        api.search_result(api.search_one_way("KUF", "AER", "2026-11-08"))
+
+    return [run_benchmark("search_result.end_to_end", search, duration)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    with FakeTicketsApi(pending_polls=1) as fake, tempfile.TemporaryDirectory() as tmp:
+        results = (
+            bench_http_client(fake, args.duration)
+            + bench_cookies(tmp, args.duration)
+            + bench_payloads(args.duration)
+            + bench_search(fake, args.duration)
+        )
+
+    baseline = load_baseline(args.baseline)
+    print(format_results(results, baseline))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nБазовая линия сохранена: {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"РЕГРЕССИЯ {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Простой бенчмарк-харнесс: пропускная способность и перцентили задержек.
+
+Функция замеряется в течение заданного времени (после прогрева), в один
+или несколько потоков; задержки собираются в LatencyHistogram. Результаты
+сохраняются как базовая линия в JSON, и следующий прогон сравнивается с ней:
+падение запросов в секунду или рост медианы больше допуска — регрессия.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from api.file_lock import atomic_write_json
+from api.instrumentation import LatencyHistogram
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    """
+    Результат одного бенчмарка.
+
+    :param name: имя бенчмарка.
+    :param ops: количество выполненных вызовов.
+    :param seconds: общее время замера.
+    :param ops_per_sec: вызовов в секунду.
+    :param p50: медиана задержки, секунды.
+    :param p90: 90-й перцентиль задержки, секунды.
+    :param p99: 99-й перцентиль задержки, секунды.
+    """
+
+    name: str
+    ops: int
+    seconds: float
+    ops_per_sec: float
+    p50: float
+    p90: float
+    p99: float
+
+
+def run_benchmark(
+    name: str,
+    func: Callable[[], object],
+    duration: float = 1.0,
+    warmup: int = 3,
+    concurrency: int = 1,
+    max_ops: Optional[int] = None,
+) -> BenchResult:
+    """
+    Замеряет func: вызывает её в concurrency потоках, пока не истечёт duration
+    (или не наберётся max_ops вызовов).
+
+    :param name: имя бенчмарка.
+    :param func: замеряемая функция без аргументов.
+    :param duration: длительность замера, секунды.
+    :param warmup: число вызовов прогрева (не учитываются).
+    :param concurrency: число потоков.
+    :param max_ops: предел числа вызовов на поток; None — без предела.
+    :return: BenchResult.
+    """
+    for _ in range(warmup):
+        func()
+
+    histogram = LatencyHistogram()
+    started = time.perf_counter()
+    deadline = started + duration
+
+    def worker() -> None:
+        done = 0
+        while time.perf_counter() < deadline and (max_ops is None or done < max_ops):
+            call_started = time.perf_counter()
+            func()
+            histogram.record(time.perf_counter() - call_started)
+            done += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    seconds = time.perf_counter() - started
+
+    return BenchResult(
+        name=name,
+        ops=histogram.count,
+        seconds=seconds,
+        ops_per_sec=histogram.count / seconds if seconds else 0.0,
+        p50=histogram.percentile(50) or 0.0,
+        p90=histogram.percentile(90) or 0.0,
+        p99=histogram.percentile(99) or 0.0,
+    )
+
+
+def load_baseline(path: str) -> dict[str, BenchResult]:
+    """
+    Загружает базовую линию; отсутствующий файл — пустая базовая линия.
+
+    :param path: путь к JSON-файлу.
+    :return: имя бенчмарка -> BenchResult.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        stored = json.load(f)
+    return {name: BenchResult(**result) for name, result in stored.items()}
+
+
+def save_baseline(path: str, results: list[BenchResult]) -> None:
+    """
+    Сохраняет результаты как базовую линию (атомарно).
+
+    :param path: путь к JSON-файлу.
+    :param results: результаты прогона.
+    """
+    atomic_write_json(path, {result.name: asdict(result) for result in results})
+
+
+def find_regressions(
+    results: list[BenchResult],
+    baseline: dict[str, BenchResult],
+    tolerance: float = 0.2,
+) -> list[str]:
+    """
+    Сравнивает прогон с базовой линией.
+
+    :param results: результаты прогона.
+    :param baseline: базовая линия из load_baseline.
+    :param tolerance: допустимое относительное ухудшение (0.2 — 20%).
+    :return: описания регрессий; пустой список, если их нет.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        if result.ops_per_sec < base.ops_per_sec * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: {result.ops_per_sec:.1f} ops/s "
+                f"(базовая линия {base.ops_per_sec:.1f})"
+            )
+        if result.p50 > base.p50 * (1 + tolerance):
+            regressions.append(
+                f"{result.name}: p50 {result.p50 * 1000:.3f} мс "
+                f"(базовая линия {base.p50 * 1000:.3f} мс)"
+            )
+    return regressions
+
+
+def format_results(
+    results: list[BenchResult], baseline: dict[str, BenchResult]
+) -> str:
+    """
+    Таблица результатов с изменением ops/s относительно базовой линии.
+
+    :param results: результаты прогона.
+    :param baseline: базовая линия.
+    :return: текст таблицы.
+    """
+    lines = [
+        f"{'benchmark':<32} {'ops/s':>10} {'p50 ms':>9} {'p90 ms':>9} "
+        f"{'p99 ms':>9} {'vs base':>8}"
+    ]
+    for result in results:
+        base = baseline.get(result.name)
+        change = (
+            f"{(result.ops_per_sec / base.ops_per_sec - 1) * 100:+.0f}%"
+            if base and base.ops_per_sec
+            else "-"
+        )
+        lines.append(
+            f"{result.name:<32} {result.ops_per_sec:>10.1f} "
+            f"{result.p50 * 1000:>9.3f} {result.p90 * 1000:>9.3f} "
+            f"{result.p99 * 1000:>9.3f} {change:>8}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,107 @@
+"""
+Путь к chromedriver: разрешается один раз на машину, а не на каждый запуск.
+
+ChromeDriverManager().install() определяет версию Chrome, ищет драйвер
+в своём кэше и иногда ходит в сеть. Здесь результат запоминается в процессе
+и в общем файле кэша (AVIASALES_CACHE_DIR, по умолчанию
+~/.cache/aviasales-tests), поэтому последующие сессии и воркеры xdist берут
+готовый путь. Разрешение выполняется под файловой блокировкой: при
+параллельном старте webdriver-manager вызывается один раз.
+
+Офлайн-режим для изолированных машин:
+- CHROMEDRIVER_PATH — закреплённый локальный бинарник, используется как есть;
+- CHROMEDRIVER_OFFLINE=1 — брать только путь из кэша, не вызывая
+  webdriver-manager.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+from api.file_lock import FileLock, atomic_write_json
+
+# Сколько секунд путь из файла кэша считается актуальным (в онлайн-режиме):
+# после обновления Chrome драйвер нужно разрешить заново.
+CACHE_MAX_AGE = 24 * 3600.0
+
+_resolved_path: Optional[str] = None
+_resolved_lock = threading.Lock()
+
+
+def cache_dir() -> str:
+    """
+    Каталог общего кэша тестов на машине.
+    """
+    return os.environ.get(
+        "AVIASALES_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "aviasales-tests"),
+    )
+
+
+def resolve_chromedriver(max_age: float = CACHE_MAX_AGE) -> str:
+    """
+    Возвращает путь к chromedriver.
+
+    Порядок: CHROMEDRIVER_PATH, путь, уже найденный в этом процессе, файл
+    кэша (в офлайн-режиме — любой давности), ChromeDriverManager().install().
+
+    :param max_age: срок актуальности файла кэша, секунды.
+    :return: путь к исполняемому файлу chromedriver.
+    :raises FileNotFoundError: если закреплённого или закэшированного
+        бинарника нет, а разрешать через сеть запрещено.
+    """
+    global _resolved_path
+
+    pinned = os.environ.get("CHROMEDRIVER_PATH")
+    if pinned:
+        if not os.path.isfile(pinned):
+            raise FileNotFoundError(f"CHROMEDRIVER_PATH не найден: {pinned}")
+        return pinned
+
+    with _resolved_lock:
+        if _resolved_path is not None and os.path.isfile(_resolved_path):
+            return _resolved_path
+
+        offline = os.environ.get("CHROMEDRIVER_OFFLINE") == "1"
+        directory = cache_dir()
+        os.makedirs(directory, exist_ok=True)
+        cache_file = os.path.join(directory, "chromedriver.json")
+
+        path = _read_cache(cache_file, None if offline else max_age)
+        if path is None and offline:
+            raise FileNotFoundError(
+                "CHROMEDRIVER_OFFLINE=1, но путь к chromedriver не закэширован; "
+                "задайте CHROMEDRIVER_PATH"
+            )
+        if path is None:
+            with FileLock(cache_file + ".lock"):
+                path = _read_cache(cache_file, max_age)
+                if path is None:
+                    path = ChromeDriverManager().install()
+                    atomic_write_json(
+                        cache_file, {"path": path, "resolved_at": time.time()}
+                    )
+        _resolved_path = path
+        return path
+
+
+def _read_cache(cache_file: str, max_age: Optional[float]) -> Optional[str]:
+    """
+    Путь из файла кэша, если файл читается, не устарел и бинарник существует.
+
+    :param cache_file: путь к файлу кэша.
+    :param max_age: срок актуальности, секунды; None — без ограничения.
+    """
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        path, resolved_at = stored["path"], stored["resolved_at"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if max_age is not None and time.time() - resolved_at > max_age:
+        return None
+    return path if os.path.isfile(path) else None
@@ -0,0 +1,191 @@
+"""
+Пул «тёплых» экземпляров WebDriver, переиспользуемых между UI-тестами.
+
+Запуск Chrome занимает секунды, поэтому браузеры создаются лениво
+(не больше size) и возвращаются в пул после теста. При возврате состояние
+сбрасывается: cookies, localStorage/sessionStorage, лишние вкладки,
+переход на about:blank. Перед выдачей браузер проверяется; упавший или
+не сбросившийся экземпляр закрывается и заменяется новым.
+"""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from pages.waits import forget_absent
+
+logger = logging.getLogger(__name__)
+
+CLEAR_STORAGE_SCRIPT = (
+    "try { window.localStorage.clear(); } catch (e) {}"
+    "try { window.sessionStorage.clear(); } catch (e) {}"
+)
+
+
+class DriverPool:
+    """
+    Потокобезопасный пул WebDriver.
+
+    Используется через acquire/release или контекстный менеджер driver().
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], WebDriver],
+        size: int = 1,
+        reset_url: str = "about:blank",
+    ) -> None:
+        """
+        :param factory: создаёт и настраивает новый WebDriver.
+        :param size: максимум одновременно живых браузеров.
+        :param reset_url: страница, на которую браузер переходит при сбросе.
+        """
+        if size < 1:
+            raise ValueError(f"Размер пула должен быть не меньше 1: {size}")
+        self.factory = factory
+        self.size = size
+        self.reset_url = reset_url
+        self._idle: queue.LifoQueue[WebDriver] = queue.LifoQueue()
+        self._slots = threading.Semaphore(size)
+        self._lock = threading.Lock()
+        self._drivers: set[WebDriver] = set()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> WebDriver:
+        """
+        Выдаёт исправный браузер: свободный из пула или новый.
+
+        :param timeout: сколько ждать свободного места, секунды; None — без предела.
+        :return: WebDriver на странице reset_url.
+        :raises TimeoutError: если за timeout место в пуле не освободилось.
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"Нет свободного браузера в пуле за {timeout} с")
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if self.is_healthy(driver):
+                    self.reused += 1
+                    return driver
+                self._discard(driver)
+
+            driver = self.factory()
+            with self._lock:
+                self._drivers.add(driver)
+            self.created += 1
+            return driver
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, driver: WebDriver, discard: bool = False) -> None:
+        """
+        Возвращает браузер в пул, предварительно сбросив состояние.
+
+        :param driver: браузер, полученный из acquire.
+        :param discard: закрыть браузер вместо возврата (например, после сбоя).
+        """
+        try:
+            if discard or not self.reset(driver):
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None) -> Iterator[WebDriver]:
+        """
+        Контекстный менеджер: acquire при входе, release при выходе.
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def reset(self, driver: WebDriver) -> bool:
+        """
+        Сбрасывает состояние браузера между тестами.
+
+        Хранилище очищается на текущей странице (до ухода с неё), cookies —
+        для всех доменов через CDP, если драйвер его поддерживает,
+        иначе для текущего домена. Вместе с cookies забывается, каких
+        необязательных элементов не было (баннер cookies появится снова).
+
+        :param driver: браузер.
+        :return: True, если сброс удался.
+        """
+        forget_absent(driver)
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_script(CLEAR_STORAGE_SCRIPT)
+            if hasattr(driver, "execute_cdp_cmd"):
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            else:
+                driver.delete_all_cookies()
+            driver.get(self.reset_url)
+            return True
+        except WebDriverException as error:
+            logger.warning("Не удалось сбросить браузер: %s", error.msg)
+            return False
+
+    @staticmethod
+    def is_healthy(driver: WebDriver) -> bool:
+        """
+        Проверяет, что сессия браузера жива и отвечает на команды.
+
+        :param driver: браузер.
+        :return: True, если браузер исправен.
+        """
+        try:
+            return driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    def close(self) -> None:
+        """
+        Закрывает все браузеры пула.
+        """
+        with self._lock:
+            drivers = list(self._drivers)
+            self._drivers.clear()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for driver in drivers:
+            self._quit(driver)
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _discard(self, driver: WebDriver) -> None:
+        # Кэш отсутствия закрытого браузера больше не понадобится.
+        forget_absent(driver)
+        with self._lock:
+            self._drivers.discard(driver)
+        self.discarded += 1
+        self._quit(driver)
+
+    @staticmethod
+    def _quit(driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,114 @@
+"""
+Профили запуска Chrome для UI-тестов.
+
+Полный браузер с окном, картинками, шрифтами и счётчиками тратит на раннерах
+больше всего CPU и памяти на отрисовку и загрузку ресурсов. Профиль задаёт,
+от чего можно отказаться: окно (headless), ожидание полной загрузки
+страницы (стратегия eager), картинки, шрифты, сторонние трекеры,
+а также фиксированный размер окна вместо maximize_window().
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Шаблоны URL для Network.setBlockedURLs.
+FONT_URL_PATTERNS = ("*.woff", "*.woff2", "*.ttf", "*.otf")
+TRACKER_URL_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*mc.yandex.ru*",
+    "*top-fwz1.mail.ru*",
+    "*vk.com/rtrg*",
+    "*facebook.net*",
+    "*hotjar.com*",
+)
+
+
+@dataclass(frozen=True)
+class LaunchProfile:
+    """
+    Набор настроек запуска браузера.
+
+    :param name: имя профиля (для отчёта и опции --browser-profile).
+    :param headless: запуск без окна.
+    :param page_load_strategy: normal, eager или none (Selenium).
+    :param block_images: не загружать картинки.
+    :param block_fonts: не загружать веб-шрифты.
+    :param block_trackers: не загружать сторонние трекеры и аналитику.
+    :param window_size: фиксированный размер окна (ширина, высота);
+        None — maximize_window().
+    """
+
+    name: str
+    headless: bool = False
+    page_load_strategy: str = "normal"
+    block_images: bool = False
+    block_fonts: bool = False
+    block_trackers: bool = False
+    window_size: Optional[tuple[int, int]] = None
+
+    def options(self) -> Options:
+        """
+        Опции Chrome по профилю.
+
+        :return: новый объект Options.
+        """
+        options = Options()
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.window_size is not None:
+            options.add_argument("--window-size={},{}".format(*self.window_size))
+        if self.block_images:
+            options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        return options
+
+    def blocked_urls(self) -> list[str]:
+        """
+        Шаблоны URL, загрузку которых блокирует профиль.
+        """
+        patterns: list[str] = []
+        if self.block_fonts:
+            patterns.extend(FONT_URL_PATTERNS)
+        if self.block_trackers:
+            patterns.extend(TRACKER_URL_PATTERNS)
+        return patterns
+
+    def apply(self, driver: WebDriver) -> None:
+        """
+        Настройки, применяемые к уже запущенному браузеру: размер окна
+        и блокировка URL через CDP.
+
+        :param driver: браузер, запущенный с options() этого профиля.
+        """
+        if self.window_size is None:
+            driver.maximize_window()
+        else:
+            driver.set_window_size(*self.window_size)
+        patterns = self.blocked_urls()
+        if patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+PROFILES = {
+    # Как раньше: браузер с окном во весь экран, все ресурсы.
+    "full": LaunchProfile("full"),
+    "headless": LaunchProfile("headless", headless=True, window_size=(1920, 1080)),
+    # Самый дешёвый: без окна, без картинок, шрифтов и трекеров, eager-загрузка.
+    "lean": LaunchProfile(
+        "lean",
+        headless=True,
+        page_load_strategy="eager",
+        block_images=True,
+        block_fonts=True,
+        block_trackers=True,
+        window_size=(1366, 900),
+    ),
+}
@@ -0,0 +1,98 @@
+"""
+Отчёт о загрузке страниц и памяти браузера за прогон UI-тестов.
+
+После каждого теста с открытой страницы снимаются метрики Navigation
+Timing (DOMContentLoaded, load, объём переданных данных, число ресурсов)
+и занятая JS-куча. Отчёт группирует их по профилю запуска, чтобы сравнить
+профили и выбрать самый дешёвый, с которым MainPage и ResultPage работают.
+"""
+
+import statistics
+import threading
+from typing import Any, Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from api.file_lock import atomic_write_json
+
+PAGE_METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const memory = performance.memory;
+return {
+    url: location.href,
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+    transfer_size: nav ? nav.transferSize : null,
+    resources: performance.getEntriesByType('resource').length,
+    js_heap_used: memory ? memory.usedJSHeapSize : null,
+};
+"""
+
+
+class PageLoadReport:
+    """
+    Накопитель метрик страниц по тестам.
+    """
+
+    def __init__(self, profile: str) -> None:
+        """
+        :param profile: имя профиля запуска браузера.
+        """
+        self.profile = profile
+        self.samples: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, driver: WebDriver, test: str) -> Optional[dict[str, Any]]:
+        """
+        Снимает метрики текущей страницы браузера.
+
+        Страницы без Navigation Timing (about:blank) и упавшие браузеры
+        пропускаются.
+
+        :param driver: браузер.
+        :param test: идентификатор теста.
+        :return: записанные метрики или None.
+        """
+        try:
+            metrics = driver.execute_script(PAGE_METRICS_SCRIPT)
+        except WebDriverException:
+            return None
+        if not metrics or metrics.get("dom_content_loaded") is None:
+            return None
+        metrics["test"] = test
+        with self._lock:
+            self.samples.append(metrics)
+        return metrics
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Сводка по профилю: медианы и максимумы времени загрузки и памяти.
+
+        :return: словарь для JSON-отчёта.
+        """
+        with self._lock:
+            samples = list(self.samples)
+
+        def column(name: str) -> list[float]:
+            return [s[name] for s in samples if s.get(name) is not None]
+
+        summary: dict[str, Any] = {"profile": self.profile, "pages": len(samples)}
+        for name in ("dom_content_loaded", "load", "js_heap_used", "transfer_size"):
+            values = column(name)
+            summary[name] = (
+                {"median": statistics.median(values), "max": max(values)}
+                if values
+                else None
+            )
+        return summary
+
+    def dump(self, path: str) -> None:
+        """
+        Атомарно сохраняет сводку и все замеры в JSON.
+
+        :param path: путь к файлу отчёта.
+        """
+        with self._lock:
+            samples = list(self.samples)
+        atomic_write_json(path, {"summary": self.summary(), "samples": samples})
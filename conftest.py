@@ -2,35 +2,305 @@ import pytest
 from selenium import webdriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.remote.webdriver import WebDriver
 from dotenv import load_dotenv
 import os
+import socket
+import requests
 
+from api.aviasales_api import AviasalesAPI
+from api.cassette import cassette_from_env
+from api.cookie_manager import BackgroundCookieRefresher, get_shared_cookie_provider
+from api.fake_server import FakeTicketsApi, StaticCookieProvider
+from api.http_client import close_shared_sessions, get_shared_session
+from api.instrumentation import default_instrumentation
+from browser.chromedriver import resolve_chromedriver
+from browser.driver_pool import DriverPool
+from browser.launch_profile import PROFILES, LaunchProfile
+from browser.page_metrics import PageLoadReport
+from pages.mainPage import MainPage
 
-@pytest.fixture(scope="function")
-def driver() -> WebDriver:
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--fake-api",
+        action="store_true",
+        help="Запускать API тесты против локального FakeTicketsApi (без сети)",
+    )
+    parser.addoption(
+        "--cassette",
+        default=None,
+        help="Файл кассеты API-запросов (например, cassettes/api.jsonl.gz)",
+    )
+    parser.addoption(
+        "--cassette-mode",
+        default="replay",
+        choices=("record", "replay", "replay-realtime"),
+        help="record — записать ответы API, replay — воспроизвести без сети",
+    )
+    parser.addoption(
+        "--latency-report",
+        default=None,
+        help="JSON-файл, куда в конце сессии сохраняются гистограммы задержек API",
+    )
+    parser.addoption(
+        "--cookie-refresh",
+        action="store_true",
+        default=os.environ.get("AVIASALES_COOKIE_REFRESH") == "1",
+        help="Обновлять cookies API в фоне до истечения TTL "
+        "(или AVIASALES_COOKIE_REFRESH=1)",
+    )
+    parser.addoption(
+        "--dom-diagnostics",
+        action="store_true",
+        help="Логировать диагностику DOM страниц (нужен --log-cli-level=DEBUG)",
+    )
+    parser.addoption(
+        "--browser-pool-size",
+        type=int,
+        default=1,
+        help="Сколько браузеров держать в пуле для UI тестов",
+    )
+    parser.addoption(
+        "--browser-profile",
+        default=os.environ.get("AVIASALES_BROWSER_PROFILE", "full"),
+        choices=sorted(PROFILES),
+        help="Профиль запуска Chrome: full — с окном и всеми ресурсами, "
+        "headless, lean — headless без картинок, шрифтов и трекеров",
+    )
+    parser.addoption(
+        "--browser-report",
+        default=None,
+        help="JSON-файл отчёта о времени загрузки страниц и памяти браузера",
+    )
+
+
+page_load_report_key = pytest.StashKey[PageLoadReport]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("--dom-diagnostics"):
+        MainPage.DOM_DIAGNOSTICS = True
+    config.stash[page_load_report_key] = PageLoadReport(
+        config.getoption("--browser-profile")
+    )
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """
+    Сохраняет гистограммы задержек запросов API (--latency-report) и отчёт
+    о загрузке страниц (--browser-report).
+
+    Воркер pytest-xdist не пишет файлы сам, а передаёт данные контроллеру,
+    который объединяет их (pytest_testnodedown) и сохраняет общие отчёты.
+    """
+    config = session.config
+    report = config.stash[page_load_report_key]
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["latency"] = default_instrumentation.export()
+        workeroutput["page_loads"] = report.samples
+        return
+    path = config.getoption("--latency-report")
+    if path:
+        default_instrumentation.dump(path)
+    path = config.getoption("--browser-report")
+    if path:
+        report.dump(path)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error) -> None:
+    """
+    Контроллер xdist: добавляет замеры завершившегося воркера к общим.
+
+    У упавшего воркера workeroutput нет — его замеры пропускаются.
+    """
+    workeroutput = getattr(node, "workeroutput", {})
+    default_instrumentation.merge(workeroutput.get("latency", {}))
+    node.config.stash[page_load_report_key].samples.extend(
+        workeroutput.get("page_loads", [])
+    )
+
+
+def free_port() -> int:
     """
-    Фикстура для запуска браузера перед каждым тестом.
+    Свободный TCP-порт на localhost (выдаётся ОС).
     """
-    options = Options()
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def create_driver(profile_dir: str, launch_profile: LaunchProfile) -> WebDriver:
+    """
+    Запускает и настраивает новый браузер для пула.
+
+    У каждого браузера свой профиль и свои порты chromedriver и отладки,
+    поэтому браузеры параллельных воркеров xdist не мешают друг другу.
+
+    :param profile_dir: каталог профиля Chrome.
+    :param launch_profile: профиль запуска (headless, блокировки, размер окна).
+    """
+    options = launch_profile.options()
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    options.add_argument(f"--remote-debugging-port={free_port()}")
     # Опция, чтобы браузер не закрывался сразу после ошибки (удобно для отладки)
     # options.add_experimental_option("detach", True)
     
-    # Автоматически скачает нужный драйвер и запустит браузер
-    service = Service(ChromeDriverManager().install())
+    # Путь к драйверу разрешается один раз на машину (см. browser/chromedriver.py)
+    service = Service(resolve_chromedriver(), port=free_port())
     driver = webdriver.Chrome(service=service, options=options)
-    driver.maximize_window()
-    driver.implicitly_wait(10)  # Ждем появления элементов до 10 секунд
+    launch_profile.apply(driver)
+    # Неявное ожидание не задаем: все ожидания страниц идут через
+    # pages/waits.py, а implicitly_wait умножал бы их таймауты
+    return driver
+
+
+@pytest.fixture(scope="session")
+def driver_pool(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> DriverPool:
+    """
+    Пул браузеров на всю сессию: Chrome запускается один раз, а не на каждый тест.
+
+    Профили создаются во временном каталоге сессии, который у каждого
+    воркера xdist свой.
+    """
+    launch_profile = PROFILES[request.config.getoption("--browser-profile")]
+    with DriverPool(
+        lambda: create_driver(
+            str(tmp_path_factory.mktemp("chrome-profile")), launch_profile
+        ),
+        size=request.config.getoption("--browser-pool-size"),
+    ) as pool:
+        yield pool
+
+
+@pytest.fixture(scope="function")
+def driver(driver_pool: DriverPool, request: pytest.FixtureRequest) -> WebDriver:
+    """
+    Фикстура браузера для теста: берётся из пула и после теста возвращается
+    в него со сброшенными cookies, хранилищем и вкладками. Перед возвратом
+    с открытой страницы снимаются метрики загрузки для --browser-report.
+    """
+    driver = driver_pool.acquire()
 
     yield driver  # Передаем драйвер в тест
 
-    # Проверить перед закрытием
-    if driver:
-        driver.quit()
+    try:
+        if request.config.getoption("--browser-report"):
+            request.config.stash[page_load_report_key].record(
+                driver, request.node.nodeid
+            )
+    finally:
+        driver_pool.release(driver)
+
+
+@pytest.fixture(scope="session")
+def http_session() -> requests.Session:
+    """
+    Фикстура с общим пулом HTTP-соединений к API Aviasales на всю сессию тестов.
+
+    Все AviasalesAPI с настройками пула по умолчанию используют эту же сессию;
+    после завершения тестов соединения закрываются.
+    """
+    session = get_shared_session()
+
+    yield session
+
+    close_shared_sessions()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_api_backend(request: pytest.FixtureRequest) -> FakeTicketsApi:
+    """
+    С опцией --fake-api подменяет tickets-api локальным FakeTicketsApi.
+
+    AviasalesAPI() и AsyncAviasalesAPI() в тестах получают адрес фейка через
+    AVIASALES_API_BASE_URL и фиксированные cookies вместо Selenium. Без опции
+    ничего не делает.
+    """
+    if not request.config.getoption("--fake-api"):
+        yield None
+        return
+
+    with FakeTicketsApi() as fake, pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("AVIASALES_API_BASE_URL", fake.url)
+        for module in ("api.aviasales_api", "api.async_aviasales_api"):
+            monkeypatch.setattr(
+                f"{module}.get_shared_cookie_provider", StaticCookieProvider
+            )
+        yield fake
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cookie_refresher(
+    request: pytest.FixtureRequest, fake_api_backend: FakeTicketsApi
+) -> BackgroundCookieRefresher:
+    """
+    С опцией --cookie-refresh на всю сессию запускает фоновое обновление
+    cookies общего поставщика API, чтобы ни один тест не ждал Selenium
+    на истечении TTL. С --fake-api и при воспроизведении кассеты cookies
+    не нужны, и поток не запускается.
+    """
+    replaying = request.config.getoption("--cassette") and request.config.getoption(
+        "--cassette-mode"
+    ).startswith("replay")
+    if not request.config.getoption("--cookie-refresh") or fake_api_backend or replaying:
+        yield None
+        return
+
+    manager = get_shared_cookie_provider().cookie_manager
+    with BackgroundCookieRefresher(manager) as refresher:
+        yield refresher
+
+
+@pytest.fixture(scope="session", autouse=True)
+def api_cassette(request: pytest.FixtureRequest) -> None:
+    """
+    С опцией --cassette включает запись или воспроизведение API-запросов.
+
+    Кассета передаётся в AviasalesAPI через переменные окружения
+    AVIASALES_CASSETTE*, записанная кассета сохраняется в конце сессии.
+    """
+    path = request.config.getoption("--cassette")
+    if not path:
+        yield None
+        return
+
+    mode = request.config.getoption("--cassette-mode")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("AVIASALES_CASSETTE", path)
+        monkeypatch.setenv("AVIASALES_CASSETTE_MODE", mode.split("-")[0])
+        if mode == "replay-realtime":
+            monkeypatch.setenv("AVIASALES_CASSETTE_REALTIME", "1")
+        cassette = cassette_from_env()
+
+        yield cassette
+
+        cassette.save()
+
+
+@pytest.fixture
+def fake_tickets_api() -> FakeTicketsApi:
+    """
+    Фикстура с локальным фейковым tickets-api на время теста.
+    """
+    with FakeTicketsApi() as fake:
+        yield fake
+
+
+@pytest.fixture
+def fake_api(fake_tickets_api: FakeTicketsApi) -> AviasalesAPI:
+    """
+    AviasalesAPI, направленный на фейковый tickets-api, без получения cookies.
+    """
+    return AviasalesAPI(
+        cookie_provider=StaticCookieProvider(), base_url=fake_tickets_api.url
+    )
+
 
-        
 # Отказаться от авторизации, не подставляется токен
 # load_dotenv()
 
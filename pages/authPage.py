@@ -6,28 +6,42 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
+from pages.waits import WaitEngine
+
 class AuthPage:
 
     def __init__(self, __driver: WebDriver) ->None:
         self.__driver = __driver
+        self.__wait = WaitEngine(__driver, timeout=10)
 
     # Нажать Войти
     def click_enter(self):
-        btn_enter = self.__driver.find_element(By.XPATH, "//button[contains(text(), 'Войти')]")
+        btn_enter = self.__wait.until(
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Войти')]")),
+            "auth_enter",
+        )
         btn_enter.click()
 
     # Нажать на Еще 4 способа
     def choice_of_method(self):
-        btn_choice = self.__driver.find_element(By.XPATH, "//button[contains(text(), 'Ещё 4 способа')]")
+        btn_choice = self.__wait.until(
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Ещё 4 способа')]")),
+            "auth_methods",
+        )
         btn_choice.click()
 
     # Ввести номер телефона
     def enter_phone_number(self, phone_number):
         # 1. Нажимаем на поле ввода номера телефона
-        input_field = self.__driver.find_element(By.CSS_SELECTOR, "[data-test-id='method-button-phone-number']")
+        input_field = self.__wait.until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-test-id='method-button-phone-number']")),
+            "auth_phone_method",
+        )
         input_field.click()
         # 2. вводим номер телефона
-        input_phone = self.__driver.find_element(By.ID, "phone-input")
+        input_phone = self.__wait.until(
+            EC.element_to_be_clickable((By.ID, "phone-input")), "auth_phone_input"
+        )
         input_phone.send_keys(phone_number)
 
     
\ No newline at end of file
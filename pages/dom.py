@@ -0,0 +1,79 @@
+"""
+Пакетное чтение DOM для page objects.
+
+Каждый get_attribute и .text у WebElement — отдельный HTTP-запрос
+к WebDriver, поэтому чтение n элементов по k полям стоит n*k обращений.
+query_elements находит элементы по локатору и собирает их атрибуты и текст
+одним execute_script.
+"""
+
+from typing import Any, Iterable, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+
+QUERY_ELEMENTS_SCRIPT = """
+const [kind, selector, attributes, withText, limit] = arguments;
+let nodes = [];
+if (kind === 'xpath') {
+    const found = document.evaluate(
+        selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < found.snapshotLength; i++) nodes.push(found.snapshotItem(i));
+} else {
+    nodes = Array.from(document.querySelectorAll(selector));
+}
+if (limit !== null) nodes = nodes.slice(0, limit);
+return nodes.map((node) => {
+    const record = {};
+    for (const name of attributes) record[name] = node.getAttribute(name);
+    if (withText) record.text = node.innerText;
+    return record;
+});
+"""
+
+
+def to_selector(locator: tuple[str, str]) -> tuple[str, str]:
+    """
+    Переводит локатор Selenium в (тип, селектор) для QUERY_ELEMENTS_SCRIPT.
+
+    :param locator: пара (By.*, значение).
+    :return: ("xpath", выражение) или ("css", селектор).
+    :raises ValueError: для стратегий, которые нельзя выразить через XPath/CSS.
+    """
+    by, value = locator
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.TAG_NAME:
+        return "css", value
+    if by == By.ID:
+        return "css", f'[id="{value}"]'
+    if by == By.NAME:
+        return "css", f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return "css", f".{value}"
+    raise ValueError(f"Локатор не поддерживается для пакетного чтения: {by}")
+
+
+def query_elements(
+    driver: WebDriver,
+    locator: tuple[str, str],
+    attributes: Iterable[str] = (),
+    text: bool = True,
+    limit: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    """
+    Атрибуты и текст всех элементов локатора за один запрос к WebDriver.
+
+    :param driver: браузер.
+    :param locator: пара (By.*, значение), как у page objects.
+    :param attributes: имена атрибутов; отсутствующий атрибут равен None.
+    :param text: добавлять ли видимый текст элемента (ключ "text").
+    :param limit: максимум элементов (первые по порядку документа).
+    :return: по словарю на элемент в порядке документа.
+    """
+    kind, selector = to_selector(locator)
+    return driver.execute_script(
+        QUERY_ELEMENTS_SCRIPT, kind, selector, list(attributes), text, limit
+    )
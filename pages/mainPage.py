@@ -1,16 +1,22 @@
 import pytest
 from selenium import webdriver
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-import time # потом удалить
+import logging
+import os
+import time
 from datetime import datetime, timedelta
 
+from pages.dom import query_elements
+from pages.waits import WaitEngine
+
 
 base_url = "https://www.aviasales.ru/"
 
+logger = logging.getLogger(__name__)
+
 class MainPage:
     """
     Класс для работы с главной страницей Aviasales.
@@ -32,30 +38,35 @@ class MainPage:
     # COOKIE_ACCEPT_BUTTON = (By.XPATH, "//button[@data-test-id='accept-cookies-button']")
     COOKIE_ACCEPT_BUTTON = (By.XPATH, "//button[@data-test-id='accept-cookies-button']")
 
+    # Диагностический дамп выпадающих списков в enter_destination: лишний
+    # запрос к WebDriver на каждый ввод, поэтому по умолчанию выключен.
+    # Включается AVIASALES_DOM_DIAGNOSTICS=1 или опцией pytest --dom-diagnostics
+    # и выводится только при уровне логирования DEBUG.
+    DOM_DIAGNOSTICS = os.environ.get("AVIASALES_DOM_DIAGNOSTICS") == "1"
+
     def __init__(self, driver: WebDriver) -> None:
         self.driver = driver
-        self.wait = WebDriverWait(driver, 20)
+        self.wait = WaitEngine(driver, timeout=20)
 
     def open(self) -> None:
         """ Открыть главную страницу"""
         self.driver.get(base_url)
         # Ждем, пока страница загрузится (например, появится поле ввода)
         self.wait.until(
-            EC.presence_of_element_located(self.SEARCH_BUTTON)
+            EC.presence_of_element_located(self.SEARCH_BUTTON), "search_button"
         )
         # Сразу принимаем куки
         self.accept_cookies()
 
     def accept_cookies(self):
         """Принять куки, если есть баннер."""
-        try:
-            # Пробуем найти кнопку принятия куки в течение 3 секунд
-            cookie_btn = self.wait.until(
-                EC.element_to_be_clickable(self.COOKIE_ACCEPT_BUTTON)
-            )
+        # Пробуем найти кнопку принятия куки в течение 3 секунд; если баннера
+        # не было, следующие вызовы не ждут его вовсе
+        cookie_btn = self.wait.optional(
+            EC.element_to_be_clickable(self.COOKIE_ACCEPT_BUTTON), "cookie_banner"
+        )
+        if cookie_btn is not None:
             cookie_btn.click()
-        except:
-            pass
 
         # Проверяем, что баннер куки исчез
         try:
@@ -72,18 +83,17 @@ class MainPage:
     def enter_origin(self, city: str) -> None:
         """ Ввести город вылета в поле Откуда"""
         origin_field = self.wait.until(
-            EC.element_to_be_clickable(self.ORIGIN_INPUT)
+            EC.element_to_be_clickable(self.ORIGIN_INPUT), "origin_input"
         )
 
         # 2. Ждем, пока автоподстановка заполнит поле
         #    Это заменяет time.sleep(1)
-        try:
-            self.wait.until(
-                lambda driver: origin_field.get_attribute('value') != ''
-            )
-            print("Автоподстановка сработала, поле заполнено")
-        except:
-            print("Автоподстановка не сработала ")
+        if self.wait.optional(
+            lambda driver: origin_field.get_attribute('value') != '', "origin_autofill"
+        ):
+            logger.debug("Автоподстановка сработала, поле заполнено")
+        else:
+            logger.debug("Автоподстановка не сработала")
 
         # 3. Очищаем поле (несколько способов для надежности)
         origin_field.clear()  # Очистить поле
@@ -94,62 +104,49 @@ class MainPage:
         origin_field.send_keys(city)
 
         # Ждем появления выпадающего списка
-        self.wait.until(EC.element_to_be_clickable(self.ORIGIN_SUGGEST))
+        self.wait.until(EC.element_to_be_clickable(self.ORIGIN_SUGGEST), "origin_suggest")
 
          # Выбираем пункт с кодом VVO (Владивосток)
-        try:
-            # Ищем элемент с кодом VVO
-            vvo_locator = (By.XPATH, "//li[contains(text(), 'VVO')]")
-            vvo_option = self.wait.until(
-                EC.element_to_be_clickable(vvo_locator)
-            )
+        # Ищем элемент с кодом VVO; наличие зависит от введенного города
+        vvo_locator = (By.XPATH, "//li[contains(text(), 'VVO')]")
+        vvo_option = self.wait.optional(
+            EC.element_to_be_clickable(vvo_locator), "origin_suggest_vvo", key=city
+        )
+        if vvo_option is not None:
             vvo_option.click()
-            print("Выбран Владивосток (VVO)")
-        except:
+            logger.info("Выбран пункт списка: city=%s code=VVO", city)
+        else:
             # Если не нашли VVO - первый пункт
             try:
                 first_option = self.driver.find_element(*self.ORIGIN_SUGGEST)
                 first_option.click()
-                print("Выбран первый пункт списка")
+                logger.info("Выбран первый пункт списка: city=%s", city)
             except:
                 origin_field.send_keys(Keys.RETURN)
-                print("Нажат Enter")
+                logger.info("Пункт списка не найден, нажат Enter: city=%s", city)
 
     # Проверка поля Откуда
     def get_origin_value(self) -> str:
         """Получить значение из поля Откуда"""
         origin_field = self.wait.until(
-            EC.presence_of_element_located(self.ORIGIN_INPUT)
+            EC.presence_of_element_located(self.ORIGIN_INPUT), "origin_input"
         )
         return origin_field.get_attribute('value')
 
     def enter_destination(self, city_destination):
         """Ввести город назначения."""
         dest_city = self.wait.until(
-            EC.element_to_be_clickable(self.DESTINATION_INPUT)
+            EC.element_to_be_clickable(self.DESTINATION_INPUT), "destination_input"
         )
         dest_city.clear()
         dest_city.send_keys(city_destination)
 
-        # Диагностика
-        time.sleep(2)  # ждем появления списка
-
-        # Ищем все выпадающие списки
-        all_lists = self.driver.find_elements(By.TAG_NAME, "ul")
-        print(f"\n🔍 Найдено списков: {len(all_lists)}")
+        # Ждем появления списка: проверенного локатора списка Куда пока нет
+        # (DESTINATION_SUGGEST не находится), поэтому остаётся пауза
+        time.sleep(2)
 
-        for i, ul in enumerate(all_lists[:10]):  # первые 10
-            ul_id = ul.get_attribute('id')
-            ul_class = ul.get_attribute('class')
-            ul_data_test = ul.get_attribute('data-test-id')
-            print(f"  Список {i}: id='{ul_id}', class='{ul_class[:30]}', data-test-id='{ul_data_test}'")
-
-        # Посмотрим первый пункт
-        try:
-            first_li = ul.find_element(By.TAG_NAME, "li")
-            print(f"    Первый пункт: '{first_li.text[:50]}'")
-        except:
-            pass
+        if self.DOM_DIAGNOSTICS and logger.isEnabledFor(logging.DEBUG):
+            self._log_dropdown_lists()
 
         # Пока используем Enter
         dest_city.send_keys(Keys.RETURN)
@@ -183,16 +180,33 @@ class MainPage:
         # )
         # return dest_field.get_attribute('value')
 
+    def _log_dropdown_lists(self) -> None:
+        """Диагностика: атрибуты и первый пункт списков <ul> (один запрос к WebDriver)."""
+        all_lists = query_elements(
+            self.driver, (By.TAG_NAME, "ul"), ("id", "class", "data-test-id")
+        )
+        logger.debug("Найдено списков: %d", len(all_lists))
+
+        for i, ul in enumerate(all_lists[:10]):  # первые 10
+            logger.debug(
+                "Список %d: id=%r class=%.30r data-test-id=%r первый пункт=%.50r",
+                i,
+                ul["id"],
+                ul["class"],
+                ul["data-test-id"],
+                (ul["text"] or "").split("\n", 1)[0],
+            )
+
     def enter_date_start(self, start_date):
         date_start = self.wait.until(
-            EC.element_to_be_clickable(self.DATE_START)
+            EC.element_to_be_clickable(self.DATE_START), "date_start"
         )
         date_start.click()
-        self.wait.until(EC.visibility_of_element_located(self.DATE_CALENDAR))
+        self.wait.until(EC.visibility_of_element_located(self.DATE_CALENDAR), "calendar")
         # Ищем родительскую кнопку (более надежно)
         button_locator = (By.XPATH, f"//div[@data-test-id='date-{start_date}']/ancestor::button")
         day_button = self.wait.until(
-            EC.element_to_be_clickable(button_locator)
+            EC.element_to_be_clickable(button_locator), "calendar_day"
         )
 
         day_button.click()
@@ -201,21 +215,21 @@ class MainPage:
     def get_start_date_value(self) -> str:
         """Получить значение даты вылета"""
         date_field = self.wait.until(
-            EC.presence_of_element_located(self.DATE_START)
+            EC.presence_of_element_located(self.DATE_START), "date_start"
         )
         return date_field.text
 
     def enter_date_end(self, end_date):
         """ Ввести дату прибытия"""
         date_end = self.wait.until(
-            EC.element_to_be_clickable(self.DATE_END)
+            EC.element_to_be_clickable(self.DATE_END), "date_end"
         )
         date_end.click()
-        self.wait.until(EC.visibility_of_element_located(self.DATE_CALENDAR))
+        self.wait.until(EC.visibility_of_element_located(self.DATE_CALENDAR), "calendar")
         # Ищем родительскую кнопку (более надежно)
         button_locator = (By.XPATH, f"//div[@data-test-id='date-{end_date}']/ancestor::button")
         day_button = self.wait.until(
-            EC.element_to_be_clickable(button_locator)
+            EC.element_to_be_clickable(button_locator), "calendar_day"
         )
         day_button.click()
 
@@ -223,14 +237,14 @@ class MainPage:
     def get_end_date_value(self) -> str:
         """Получить значение даты возвращения"""
         date_field = self.wait.until(
-            EC.presence_of_element_located(self.DATE_END)
+            EC.presence_of_element_located(self.DATE_END), "date_end"
         )
         return date_field.text
 
     def enter_search_btn(self):
         """Нажать кнопку поиска билетов."""
         search_btn = self.wait.until(
-            EC.element_to_be_clickable(self.SEARCH_BUTTON)
+            EC.element_to_be_clickable(self.SEARCH_BUTTON), "search_button"
         )
         search_btn.click()
 
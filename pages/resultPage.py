@@ -1,8 +1,88 @@
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 
+from pages.dom import query_elements
+from pages.waits import WaitEngine
+
+
+def parse_price(text: str) -> Optional[int]:
+    """Сумма из текста цены вида '12 345 ₽' или None, если цифр нет."""
+    digits = re.sub(r"\D", "", text or "")
+    return int(digits) if digits else None
+
+
+# Забирает карточки, ещё не помеченные атрибутом marker, помечает их
+# и прокручивает к последней карточке, чтобы лента подгрузила следующие.
+STREAM_CARDS_SCRIPT = """
+const [selector, priceSelector, marker, limit] = arguments;
+const cards = Array.from(document.querySelectorAll(selector));
+const fresh = [];
+for (const card of cards) {
+    if (card.hasAttribute(marker)) continue;
+    if (limit !== null && fresh.length >= limit) break;
+    card.setAttribute(marker, '');
+    const text = card.innerText || '';
+    const price = card.querySelector(priceSelector);
+    const transfers = text.match(/\\d+\\s+пересад\\S*|без пересадок|прямой/i);
+    fresh.push([
+        price ? price.innerText : null,
+        Array.from(card.querySelectorAll('img[alt]'), (img) => img.alt).filter(Boolean),
+        text.match(/\\b\\d{1,2}:\\d{2}\\b/g) || [],
+        transfers ? transfers[0] : null,
+    ]);
+}
+if (cards.length) cards[cards.length - 1].scrollIntoView({block: 'end'});
+return [cards.length, fresh];
+"""
+
+COUNT_CARDS_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+
+
+def parse_transfers(text: Optional[str]) -> Optional[int]:
+    """Число пересадок из подписи карточки ('2 пересадки', 'Без пересадок')."""
+    if not text:
+        return None
+    digits = re.match(r"\d+", text)
+    return int(digits.group()) if digits else 0
+
+
+@dataclass(frozen=True, slots=True)
+class TicketCard:
+    """
+    Карточка билета в выдаче.
+
+    :param price: сумма (parse_price) или None.
+    :param carriers: перевозчики по подписям логотипов.
+    :param departure: время вылета (ЧЧ:ММ) первого сегмента.
+    :param arrival: время прилёта (ЧЧ:ММ) первого сегмента.
+    :param transfers: количество пересадок или None, если подписи нет.
+    """
+
+    price: Optional[int]
+    carriers: tuple[str, ...]
+    departure: Optional[str]
+    arrival: Optional[str]
+    transfers: Optional[int]
+
+    @classmethod
+    def from_record(cls, record: list[Any]) -> "TicketCard":
+        """Карточка из записи STREAM_CARDS_SCRIPT."""
+        price, carriers, times, transfers = record
+        return cls(
+            parse_price(price) if price is not None else None,
+            tuple(dict.fromkeys(carriers)),
+            times[0] if times else None,
+            times[1] if len(times) > 1 else None,
+            parse_transfers(transfers),
+        )
+
 
 class ResultPage:
     """ Класс для работы со страницей результатов поиска """
@@ -10,19 +90,86 @@ class ResultPage:
     RESULTS_LIST = (By.XPATH, '//div[@data-test-id="search-results-items-list"]')  # окно с результатами
     FIRST_TICKET_PRICE = (By.XPATH, '(//div[@data-test-id="price"])[1]')  # Локатор цены первого билета
     ANY_TICKET_PRICE = (By.XPATH, '//div[@data-test-id="price"]')  # Локатор находит все элементы с ценами
+    TICKET_CARD = (By.CSS_SELECTOR, '[data-test-id="search-results-items-list"] > div')  # карточки билетов
+    CARD_PRICE = '[data-test-id="price"]'  # цена внутри карточки
+    SEEN_MARKER = "data-autotest-seen"  # пометка уже прочитанных карточек
 
     def __init__(self, driver: WebDriver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 60)
+        self.wait = WaitEngine(driver, timeout=60)
 
     def get_first_price(self) -> str:
         """Получить цену первого билета"""
         price_element = self.wait.until(
-            EC.presence_of_element_located(self.FIRST_TICKET_PRICE)
+            EC.presence_of_element_located(self.FIRST_TICKET_PRICE), "first_price"
         )
         return price_element.text
-    
 
+    def get_all_prices(self) -> list[dict[str, Any]]:
+        """
+        Все цены на странице за один запрос к WebDriver (вместо запроса
+        на каждый элемент ANY_TICKET_PRICE).
+
+        :return: записи в порядке выдачи: text — текст цены, value — сумма
+            (parse_price).
+        """
+        self.wait.until(
+            EC.presence_of_element_located(self.ANY_TICKET_PRICE), "any_price"
+        )
+        prices = query_elements(self.driver, self.ANY_TICKET_PRICE)
+        for price in prices:
+            price["value"] = parse_price(price["text"])
+        return prices
+
+    def stream_tickets(
+        self,
+        max_tickets: Optional[int] = None,
+        time_budget: float = 60.0,
+        idle_timeout: float = 5.0,
+    ) -> Iterator[list[TicketCard]]:
+        """
+        Карточки билетов пачками по мере подгрузки ленты результатов.
+
+        За раунд один execute_script забирает только новые карточки
+        и прокручивает ленту вниз; затем ждём, пока карточек станет больше.
+
+        :param max_tickets: остановиться, набрав столько карточек.
+        :param time_budget: общий бюджет чтения, секунды.
+        :param idle_timeout: сколько ждать роста ленты, прежде чем считать
+            её загруженной, секунды.
+        :return: итератор по пачкам новых карточек в порядке выдачи.
+        """
+        self.wait.until(
+            EC.presence_of_element_located(self.TICKET_CARD), "ticket_cards"
+        )
+        selector = self.TICKET_CARD[1]
+        deadline = time.monotonic() + time_budget
+        taken = 0
+        while True:
+            limit = None if max_tickets is None else max_tickets - taken
+            total, records = self.driver.execute_script(
+                STREAM_CARDS_SCRIPT, selector, self.CARD_PRICE, self.SEEN_MARKER, limit
+            )
+            if records:
+                taken += len(records)
+                yield [TicketCard.from_record(record) for record in records]
+            remaining = deadline - time.monotonic()
+            if (max_tickets is not None and taken >= max_tickets) or remaining <= 0:
+                return
+            try:
+                self.wait.until(
+                    lambda driver: driver.execute_script(COUNT_CARDS_SCRIPT, selector) > total,
+                    "results_growth",
+                    timeout=min(idle_timeout, remaining),
+                )
+            except TimeoutException:
+                return
+
+    def collect_tickets(self, **kwargs: Any) -> list[TicketCard]:
+        """
+        Все карточки выдачи одним списком (параметры как у stream_tickets).
+        """
+        return [card for batch in self.stream_tickets(**kwargs) for card in batch]
 
     # видимо долгое ожидание результата, отказаться от этой проверки
     # def wait_for_results(self):
@@ -37,5 +184,3 @@ class ResultPage:
     #         return self.wait_for_results().is_displayed()
     #     except:
     #         return False
-
-    
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""
+Единый механизм ожиданий для page objects.
+
+Вместо неявного ожидания драйвера (implicitly_wait), которое умножает
+таймауты на каждом неудачном find_element, и жёстких time.sleep все
+ожидания страниц идут через WaitEngine:
+
+- у каждого шага есть имя и бюджет времени (STEP_BUDGETS или timeout
+  страницы), опрос идёт с заданным интервалом;
+- необязательные проверки (баннер cookies, пункт подсказки) через optional
+  не падают по таймауту, а запоминают, что элемента нет: повторная
+  проверка того же шага в том же браузере в течение absent_ttl сразу
+  возвращает None. Память привязана к сессии браузера и сбрасывается
+  вместе с его состоянием (DriverPool.reset), ведь после очистки cookies
+  баннер снова появляется;
+- время каждого шага пишется в лог, в список timings страницы
+  и в гистограммы default_instrumentation под именем "wait:<шаг>".
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+from api.instrumentation import Instrumentation, default_instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Бюджеты шагов, секунды; остальные шаги (в том числе origin_autofill,
+# который ждёт сетевой ответ с городом по IP) ждут timeout страницы.
+STEP_BUDGETS: dict[str, float] = {
+    # Баннер проверяется после появления SEARCH_BUTTON, то есть уже
+    # отрисованной страницы; 3 с — исходный замысел accept_cookies.
+    "cookie_banner": 3.0,
+    # Шаг идёт после того, как список подсказок стал кликабельным:
+    # пункт VVO либо уже в нём, либо появится при перерисовке.
+    "origin_suggest_vvo": 5.0,
+}
+
+# Сколько секунд помнить, что необязательного элемента нет.
+ABSENT_TTL = 600.0
+
+# Сессия браузера -> {ключ шага: когда элемент не нашёлся (monotonic)}.
+_known_absent: dict[str, dict[str, float]] = {}
+_known_absent_lock = threading.Lock()
+
+
+def _session_key(driver: Any) -> str:
+    """Ключ браузера для кэша отсутствия: session_id WebDriver или id объекта."""
+    return getattr(driver, "session_id", None) or f"id:{id(driver)}"
+
+
+@dataclass(frozen=True, slots=True)
+class StepTiming:
+    """
+    Время одного шага ожидания.
+
+    :param step: имя шага.
+    :param seconds: сколько длилось ожидание.
+    :param outcome: found, timeout или skipped (элемент известен как отсутствующий).
+    """
+
+    step: str
+    seconds: float
+    outcome: str
+
+
+class WaitEngine:
+    """
+    Ожидания одной страницы с бюджетами, записью времени и кэшем отсутствия.
+    """
+
+    def __init__(
+        self,
+        driver: WebDriver,
+        timeout: float = 20.0,
+        poll_frequency: float = 0.25,
+        absent_ttl: float = ABSENT_TTL,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        """
+        :param driver: браузер.
+        :param timeout: бюджет шагов без записи в STEP_BUDGETS, секунды.
+        :param poll_frequency: интервал опроса условия, секунды.
+        :param absent_ttl: сколько помнить отсутствие необязательного элемента.
+        :param instrumentation: куда писать время шагов; по умолчанию
+            default_instrumentation.
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.absent_ttl = absent_ttl
+        self.instrumentation = instrumentation or default_instrumentation
+        self.timings: list[StepTiming] = []
+
+    def budget(self, step: Optional[str]) -> float:
+        """
+        Бюджет шага, секунды.
+        """
+        return STEP_BUDGETS.get(step, self.timeout) if step else self.timeout
+
+    def until(
+        self,
+        condition: Callable[[WebDriver], Any],
+        step: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Ждёт условие; по истечении бюджета выбрасывает TimeoutException.
+
+        :param condition: условие expected_conditions или функция от драйвера.
+        :param step: имя шага для бюджета и отчёта.
+        :param timeout: бюджет вместо budget(step), секунды.
+        :return: значение, возвращённое условием.
+        :raises TimeoutException: если условие не выполнилось за бюджет.
+        """
+        budget = self.budget(step) if timeout is None else timeout
+        started = time.perf_counter()
+        try:
+            result = WebDriverWait(
+                self.driver, budget, poll_frequency=self.poll_frequency
+            ).until(condition, f"Шаг {step or 'без имени'} не выполнен за {budget} с")
+        except TimeoutException:
+            self._record(step, started, "timeout")
+            raise
+        self._record(step, started, "found")
+        return result
+
+    def optional(
+        self,
+        condition: Callable[[WebDriver], Any],
+        step: str,
+        timeout: Optional[float] = None,
+        key: Optional[str] = None,
+    ) -> Any:
+        """
+        Необязательное ожидание: None вместо исключения по таймауту.
+
+        Если шаг с тем же ключом недавно завершился таймаутом в этом же
+        браузере, условие не ждётся вовсе.
+
+        :param condition: условие expected_conditions или функция от драйвера.
+        :param step: имя шага.
+        :param timeout: бюджет вместо budget(step), секунды.
+        :param key: уточнение ключа кэша отсутствия (например, введённый город),
+            если наличие элемента зависит от входных данных.
+        :return: значение условия или None.
+        """
+        absent_key = f"{step}:{key}" if key is not None else step
+        session = _session_key(self.driver)
+        with _known_absent_lock:
+            marked = _known_absent.get(session, {}).get(absent_key)
+        if marked is not None and time.monotonic() - marked < self.absent_ttl:
+            self._record(step, time.perf_counter(), "skipped")
+            return None
+        try:
+            result = self.until(condition, step, timeout)
+        except TimeoutException:
+            with _known_absent_lock:
+                _known_absent.setdefault(session, {})[absent_key] = time.monotonic()
+            return None
+        with _known_absent_lock:
+            _known_absent.get(session, {}).pop(absent_key, None)
+        return result
+
+    def _record(self, step: Optional[str], started: float, outcome: str) -> None:
+        seconds = time.perf_counter() - started
+        name = step or "unnamed"
+        self.timings.append(StepTiming(name, seconds, outcome))
+        self.instrumentation.observe(f"wait:{name}", seconds)
+        logger.debug("Ожидание: step=%s outcome=%s seconds=%.2f", name, outcome, seconds)
+
+
+def forget_absent(driver: Optional[WebDriver] = None) -> None:
+    """
+    Сбрасывает кэш отсутствующих элементов.
+
+    :param driver: браузер, для которого сбросить кэш (например, после
+        очистки его cookies); None — для всех браузеров.
+    """
+    with _known_absent_lock:
+        if driver is None:
+            _known_absent.clear()
+        else:
+            _known_absent.pop(_session_key(driver), None)
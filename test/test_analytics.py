@@ -0,0 +1,63 @@
+import numpy as np
+
+from api.analytics import TicketFrame
+from api.models import Price, Segment, Ticket
+
+
+def make_ticket(route, date, price, carrier, transfers=0):
+    origin, destination = route.split("-")
+    segment = Segment(
+        origin, destination, f"{date}T10:00:00", f"{date}T14:00:00",
+        (carrier,) * (transfers + 1), transfers,
+    )
+    return Ticket(f"{route}{date}{price}", Price(price, "rub"), (segment,))
+
+
+FRAME = TicketFrame.from_tickets(
+    [
+        make_ticket("KUF-AER", "2026-11-08", 5000, "SU"),
+        make_ticket("KUF-AER", "2026-11-08", 4000, "S7", transfers=1),
+        make_ticket("KUF-AER", "2026-11-09", 7000, "SU"),
+        make_ticket("VVO-KUF", "2026-11-08", 12000, "S7"),
+        Ticket("no-price"),
+    ]
+)
+
+
+def test_cheapest_per_route_and_date():
+    """Минимальная цена по маршруту и дате"""
+    assert FRAME.cheapest() == {
+        ("KUF-AER", "2026-11-08"): 4000.0,
+        ("KUF-AER", "2026-11-09"): 7000.0,
+        ("VVO-KUF", "2026-11-08"): 12000.0,
+    }
+
+
+def test_percentiles_and_carrier_stats():
+    """Перцентили цены и статистика по перевозчикам"""
+    assert FRAME.price_percentiles([0, 50, 100]) == {0: 4000.0, 50: 6000.0, 100: 12000.0}
+    assert FRAME.carrier_stats() == {
+        "S7": {"count": 2, "min": 4000.0, "median": 8000.0},
+        "SU": {"count": 2, "min": 5000.0, "median": 6000.0},
+    }
+
+
+def test_histogram_over_date_range():
+    """Гистограмма учитывает только даты из диапазона"""
+    counts, edges = FRAME.price_histogram(bins=[0, 6000, 20000], date_to="2026-11-08")
+
+    assert counts.tolist() == [2, 1]
+    assert np.array_equal(edges, [0, 6000, 20000])
+
+
+def test_frame_from_fake_results(fake_api, fake_tickets_api):
+    """Таблица строится из ответов нескольких поисков"""
+    results = []
+    for date in ("2026-11-08", "2026-11-09"):
+        search_id = fake_api.search_one_way("KUF", "AER", date)
+        results.append(fake_api.search_result(search_id))
+
+    frame = TicketFrame.from_results(*results, None)
+
+    assert len(frame) == sum(len(data[0]["tickets"]) for data in results)
+    assert set(frame.cheapest()) == {("KUF-AER", "2026-11-08"), ("KUF-AER", "2026-11-09")}
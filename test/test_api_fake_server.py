@@ -0,0 +1,218 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from api.async_aviasales_api import AsyncAviasalesAPI
+from api.aviasales_api import AviasalesAPI, SearchSpec
+from api.fake_server import FakeTicketsApi, StaticCookieProvider
+from api.polling import BackoffPolling, FixedPolling
+
+FAST_POLLING = FixedPolling(initial_delay=0.01, interval=0.01, max_attempts=20)
+
+
+def test_search_result_after_pending_polls(fake_api, fake_tickets_api):
+    """Результаты приходят после заданного числа ответов 204"""
+    fake_tickets_api.pending_polls = 3
+
+    search_id = fake_api.search_start("KUF", "AER", "2026-11-08", "2026-11-09")
+    results = fake_api.search_result(search_id, polling=FAST_POLLING)
+
+    assert results is not None
+    assert len(results[0]["tickets"]) == 1
+    assert fake_tickets_api.searches[search_id].polls == 4
+
+
+def test_duplicate_city_rejected(fake_api):
+    """Одинаковые города вылета и прилёта — поиск не стартует"""
+    assert fake_api.search_one_way("KUF", "KUF", "2026-11-08") is None
+
+
+def test_search_result_gives_up_by_schedule(fake_api, fake_tickets_api):
+    """Если результаты не готовы за расписание опроса, возвращается None"""
+    fake_tickets_api.pending_polls = 100
+
+    fake_api.search_one_way("KUF", "AER", "2026-11-08")
+    polling = FixedPolling(initial_delay=0.01, interval=0.01, max_attempts=3)
+
+    assert fake_api.search_result(polling=polling) is None
+
+
+def test_retry_after_hint_is_honored(fake_api, fake_tickets_api):
+    """Подсказка Retry-After от сервера задаёт паузу между опросами"""
+    fake_tickets_api.pending_polls = 1
+    fake_tickets_api.retry_after = 1
+    polling = BackoffPolling(initial_delay=0.01, jitter=0.0, timeout=5)
+
+    fake_api.search_one_way("KUF", "AER", "2026-11-08")
+    started = time.monotonic()
+    assert fake_api.search_result(polling=polling) is not None
+
+    assert time.monotonic() - started >= 1
+
+
+def test_search_many_polls_in_shared_rounds(fake_api, fake_tickets_api):
+    """Пакет поисков завершается за время одного поиска, а не суммы"""
+    fake_tickets_api.pending_polls = 2
+    specs = [SearchSpec("KUF", "AER", f"2026-11-{day:02d}") for day in range(1, 21)]
+    polling = FixedPolling(initial_delay=0.2, interval=0.2, max_attempts=5)
+
+    started = time.monotonic()
+    results = dict(fake_api.search_many(specs, polling=polling))
+
+    assert time.monotonic() - started < 2
+    assert set(results) == set(specs)
+    assert all(data is not None for data in results.values())
+
+
+def test_search_many_drain_reads_until_is_over(fake_api, fake_tickets_api):
+    """С drain поиск отдаётся только после is_over, со всеми пачками"""
+    fake_tickets_api.batch_size = 2
+    fake_tickets_api.tickets_per_search = 7
+    specs = [SearchSpec("KUF", "AER", f"2026-11-{day:02d}") for day in range(1, 4)]
+
+    results = dict(
+        fake_api.search_many(specs, polling=FAST_POLLING, limit=100, drain=True)
+    )
+
+    for data in results.values():
+        ticket_ids = [ticket["id"] for chunk in data for ticket in chunk["tickets"]]
+        assert len(set(ticket_ids)) == 7
+        assert data[-1]["is_over"]
+
+
+def test_stream_yields_only_new_batches(fake_api, fake_tickets_api):
+    """Поток отдаёт новые пачки билетов до is_over"""
+    fake_tickets_api.tickets_per_search = 25
+    fake_tickets_api.batch_size = 10
+
+    fake_api.search_one_way("VVO", "KUF", "2026-11-08")
+    batches = list(fake_api.search_result_stream(limit=100, polling=FAST_POLLING))
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    ticket_ids = [ticket["id"] for batch in batches for ticket in batch]
+    assert len(set(ticket_ids)) == 25
+
+
+def test_base_url_from_environment(monkeypatch, fake_tickets_api):
+    """Адрес API переключается переменной окружения"""
+    monkeypatch.setenv("AVIASALES_API_BASE_URL", fake_tickets_api.url)
+
+    api = AviasalesAPI(cookie_provider=StaticCookieProvider())
+
+    assert api.base_url == fake_tickets_api.url
+    assert api.search_one_way("KUF", "AER", "2026-11-08") is not None
+
+
+def test_fake_api_backend_covers_async_client(fake_api_backend):
+    """С --fake-api асинхронный клиент тоже не получает cookies через Selenium"""
+    if fake_api_backend is None:
+        pytest.skip("нужна опция --fake-api")
+
+    async def search():
+        async with AsyncAviasalesAPI(polling=FAST_POLLING) as api:
+            assert api.base_url == fake_api_backend.url
+            return await api.search_one_way("KUF", "AER", "2026-11-08")
+
+    assert asyncio.run(search()) is not None
+
+
+def test_async_client_runs_searches_concurrently():
+    """Асинхронный клиент выполняет сотню поисков на одном event loop"""
+
+    async def run(url):
+        async with AsyncAviasalesAPI(
+            StaticCookieProvider(), polling=FAST_POLLING, base_url=url
+        ) as api:
+            search_ids = await asyncio.gather(
+                *[api.search_one_way("KUF", "AER", "2026-11-08") for _ in range(100)]
+            )
+            return await asyncio.gather(*[api.search_result(i) for i in search_ids])
+
+    with FakeTicketsApi(pending_polls=2, latency=(0.01, 0.02)) as fake:
+        results = asyncio.run(run(fake.url))
+
+    assert len(results) == 100
+    assert all(result is not None for result in results)
+
+
+def failing_requests(api, broken):
+    """Подменяет запросы клиента: ConnectionError для поисков с вылетом из broken"""
+    request = api._http_client.request
+    started = {}
+
+    def wrapper(method, url, **kwargs):
+        payload = kwargs.get("json") or {}
+        directions = payload.get("search_params", {}).get("directions")
+        if directions and directions[0]["origin"] in broken["start"]:
+            raise requests.ConnectionError("start refused")
+        response = request(method, url, **kwargs)
+        if directions:
+            started[response.json()["search_id"]] = directions[0]["origin"]
+        if started.get(payload.get("search_id")) in broken["results"]:
+            raise requests.ConnectionError("results refused")
+        return response
+
+    api._http_client.request = wrapper
+
+
+def test_search_many_keeps_going_after_connection_errors(fake_api):
+    """Ошибка соединения одного поиска даёт (spec, None), остальные завершаются"""
+    failing_requests(fake_api, {"start": {"OVB"}, "results": {"LED"}})
+    specs = [
+        SearchSpec("KUF", "AER", "2026-11-08"),
+        SearchSpec("OVB", "AER", "2026-11-08"),
+        SearchSpec("LED", "AER", "2026-11-08"),
+        SearchSpec("VVO", "AER", "2026-11-08"),
+    ]
+
+    results = dict(fake_api.search_many(specs, polling=FAST_POLLING))
+
+    assert set(results) == set(specs)
+    assert results[specs[1]] is None
+    assert results[specs[2]] is None
+    assert results[specs[0]] is not None
+    assert results[specs[3]] is not None
+
+
+def test_search_many_reports_failed_start(fake_api):
+    """Поиск, отклонённый сервером при старте, отдаётся как (spec, None)"""
+    specs = [
+        SearchSpec("KUF", "KUF", "2026-11-08"),
+        SearchSpec("KUF", "AER", "2026-11-08"),
+    ]
+
+    results = list(fake_api.search_many(specs, polling=FAST_POLLING))
+
+    assert results[0] == (specs[0], None)
+    assert results[1][0] == specs[1]
+    assert results[1][1] is not None
+
+
+def test_search_many_sends_own_request_id_per_search(fake_api, fake_tickets_api):
+    """Опросы каждого поиска несут X-Request-Id из ответов этого же поиска"""
+    fake_tickets_api.pending_polls = 2
+    request = fake_api._http_client.request
+    # search_id -> X-Request-Id по порядку: ответы сервера и отправленные в опросах.
+    replies, sent = {}, {}
+
+    def recording(method, url, **kwargs):
+        payload = kwargs.get("json") or {}
+        if "search_id" in payload:
+            headers = kwargs.get("headers") or {}
+            sent.setdefault(payload["search_id"], []).append(headers.get("X-Request-Id"))
+        response = request(method, url, **kwargs)
+        search_id = payload.get("search_id") or response.json()["search_id"]
+        replies.setdefault(search_id, []).append(response.headers["X-Request-Id"])
+        return response
+
+    fake_api._http_client.request = recording
+    specs = [SearchSpec("KUF", "AER", f"2026-11-{day:02d}") for day in range(1, 5)]
+
+    results = dict(fake_api.search_many(specs, polling=FAST_POLLING))
+
+    assert all(data is not None for data in results.values())
+    assert len(sent) == 4
+    for search_id, ids in sent.items():
+        assert ids == replies[search_id][: len(ids)]
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+
+import pytest
+
+from api.async_aviasales_api import AsyncAviasalesAPI
+from api.async_http_client import AsyncAviasalesHttpClient, AsyncResponse
+from api.fake_server import StaticCookieProvider
+from api.http_client import PoolConfig
+from api.polling import FixedPolling, parse_retry_after
+
+
+class LowercaseHeadersHandler(BaseHTTPRequestHandler):
+    """Обработчик, отдающий заголовки в нижнем регистре, как некоторые прокси"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.send_response(204)
+        self.send_header("x-request-id", "req-1")
+        self.send_header("retry-after", "2")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def lowercase_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LowercaseHeadersHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    yield f"http://{host}:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+class BadGatewayHandler(BaseHTTPRequestHandler):
+    """Обработчик, отвечающий 502 на любой запрос и считающий запросы"""
+
+    protocol_version = "HTTP/1.1"
+    calls: dict[str, int] = {}
+
+    def _reply(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.calls[self.command] = self.calls.get(self.command, 0) + 1
+        self.send_response(502)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def bad_gateway():
+    BadGatewayHandler.calls = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BadGatewayHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    yield f"http://{host}:{port}", BadGatewayHandler.calls
+    server.shutdown()
+    server.server_close()
+
+
+class CountingCookieProvider(StaticCookieProvider):
+    """Поставщик cookies, считающий обращения"""
+
+    calls = 0
+
+    def get_cookies(self):
+        self.calls += 1
+        return super().get_cookies()
+
+
+def test_headers_case_insensitive(lowercase_server):
+    """Заголовки ответа ищутся без учёта регистра, Retry-After разбирается"""
+
+    async def run():
+        async with AsyncAviasalesHttpClient(StaticCookieProvider()) as client:
+            return await client.request("POST", lowercase_server, json={})
+
+    response = asyncio.run(run())
+
+    assert response.headers["X-Request-Id"] == "req-1"
+    assert parse_retry_after(response.headers) == 2.0
+
+
+def test_cookies_requested_once_for_concurrent_requests(lowercase_server):
+    """Свежие cookies отдаются из кэша клиента без повторных обращений к поставщику"""
+    provider = CountingCookieProvider()
+
+    async def run():
+        async with AsyncAviasalesHttpClient(provider) as client:
+            await asyncio.gather(
+                *[client.request("POST", lowercase_server, json={}) for _ in range(20)]
+            )
+
+    asyncio.run(run())
+
+    assert provider.calls == 1
+
+
+def test_pool_config_honoured(bad_gateway):
+    """Размер пула на хост и повторы 5xx берутся из PoolConfig, как у синхронного клиента"""
+    url, calls = bad_gateway
+    config = PoolConfig(pool_maxsize=4, max_retries=2, backoff_factor=0)
+
+    async def run():
+        async with AsyncAviasalesHttpClient(StaticCookieProvider(), 50, config) as client:
+            post = await client.request("POST", url, json={})
+            get = await client.request("GET", url)
+            return client._get_session().connector.limit_per_host, post, get
+
+    limit_per_host, post, get = asyncio.run(run())
+
+    assert limit_per_host == 4
+    assert (post.status_code, get.status_code) == (502, 502)
+    assert calls == {"POST": 1, "GET": 3}
+
+
+class ScriptedHttpClient:
+    """HTTP-клиент-заглушка: search_id — город вылета, запоминает X-Request-Id опросов"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def request(self, method, url, json=None, headers=None):
+        if url.endswith("/search/v2/start"):
+            search_id = json["search_params"]["directions"][0]["origin"]
+            body = {"search_id": search_id}
+        else:
+            search_id = json["search_id"]
+            self.sent.append((search_id, (headers or {}).get("X-Request-Id")))
+            await asyncio.sleep(0)
+            body = [{"tickets": []}]
+        reply_id = f"{search_id}-{len(self.sent)}"
+        return AsyncResponse(200, {"X-Request-Id": reply_id}, dumps(body).encode())
+
+    async def close(self):
+        pass
+
+
+def test_request_id_kept_per_search():
+    """Параллельные поиски отправляют каждый свой X-Request-Id"""
+    polling = FixedPolling(initial_delay=0, interval=0, max_attempts=1)
+
+    async def run():
+        api = AsyncAviasalesAPI(StaticCookieProvider(), polling=polling, base_url="")
+        api._http_client = ScriptedHttpClient()
+        first = await api.search_one_way("KUF", "AER", "2026-11-08")
+        second = await api.search_one_way("VVO", "AER", "2026-11-08")
+        await asyncio.gather(api.search_result(first), api.search_result(second))
+        return api._http_client.sent
+
+    sent = asyncio.run(run())
+
+    assert sorted(sent) == [("KUF", "KUF-0"), ("VVO", "VVO-0")]
@@ -0,0 +1,36 @@
+from dataclasses import replace
+
+from benchmarks.harness import (
+    find_regressions,
+    load_baseline,
+    run_benchmark,
+    save_baseline,
+)
+
+
+def test_run_benchmark_counts_operations():
+    """Бенчмарк учитывает все вызовы из всех потоков"""
+    calls = []
+
+    result = run_benchmark(
+        "noop", lambda: calls.append(1), warmup=2, concurrency=2, max_ops=50
+    )
+
+    assert result.ops == 100
+    assert len(calls) == 102
+    assert result.ops_per_sec > 0 and result.p50 <= result.p99
+
+
+def test_regressions_against_saved_baseline(tmp_path):
+    """Падение ops/s и рост медианы сверх допуска — регрессии"""
+    path = str(tmp_path / "baseline.json")
+    base = run_benchmark("noop", lambda: None, max_ops=10)
+    save_baseline(path, [base])
+    baseline = load_baseline(path)
+
+    slower = replace(base, ops_per_sec=base.ops_per_sec * 0.5, p50=base.p50 * 2)
+    noisy = replace(base, ops_per_sec=base.ops_per_sec * 0.9)
+
+    assert len(find_regressions([slower], baseline, tolerance=0.2)) == 2
+    assert find_regressions([noisy], baseline, tolerance=0.2) == []
+    assert load_baseline(str(tmp_path / "missing.json")) == {}
@@ -0,0 +1,68 @@
+import pytest
+
+from api.aviasales_api import AviasalesAPI
+from api.cassette import RECORD, REPLAY, Cassette, CassetteMiss
+from api.fake_server import StaticCookieProvider
+from api.polling import FixedPolling
+
+
+class FailingCookieProvider:
+    """Поставщик cookies, который не должен вызываться при воспроизведении"""
+
+    def get_cookies(self):
+        pytest.fail("cookies запрошены при воспроизведении кассеты")
+
+
+def record_search(path, url):
+    """Записывает в кассету поиск в один конец с ожиданием результатов"""
+    with Cassette(path, mode=RECORD) as cassette:
+        api = AviasalesAPI(
+            cookie_provider=StaticCookieProvider(),
+            base_url=url,
+            cassette=cassette,
+            polling=FixedPolling(initial_delay=0.01, interval=0.01),
+        )
+        search_id = api.search_one_way("KUF", "AER", "2026-11-08")
+        return search_id, api.search_result(search_id)
+
+
+def test_replay_serves_recorded_responses_without_network(tmp_path, fake_tickets_api):
+    """Воспроизведение повторяет записанные ответы без сервера и cookies"""
+    path = str(tmp_path / "api.jsonl.gz")
+    fake_tickets_api.pending_polls = 2
+    search_id, recorded = record_search(path, fake_tickets_api.url)
+    fake_tickets_api.stop()
+
+    api = AviasalesAPI(
+        cookie_provider=FailingCookieProvider(),
+        base_url="http://127.0.0.1:9",
+        cassette=Cassette(path, mode=REPLAY),
+    )
+
+    assert api.search_one_way("KUF", "AER", "2026-11-08") == search_id
+    assert api.search_result(search_id) == recorded
+
+
+def test_replay_ignores_volatile_fields(tmp_path, fake_tickets_api):
+    """last_update_timestamp не участвует в сопоставлении запросов"""
+    path = str(tmp_path / "api.jsonl.gz")
+    search_id, _ = record_search(path, fake_tickets_api.url)
+    cassette = Cassette(path, mode=REPLAY)
+    payload = {"search_id": search_id, "last_update_timestamp": 1, "limit": 1}
+    other = dict(payload, last_update_timestamp=2)
+    url = fake_tickets_api.url + "/search/v3.2/results"
+
+    assert cassette.match_key("post", url, payload) == cassette.match_key(
+        "POST", url, other
+    )
+
+
+def test_replay_miss_raises(tmp_path, fake_tickets_api):
+    """Запрос, которого нет в кассете, приводит к CassetteMiss"""
+    path = str(tmp_path / "api.jsonl.gz")
+    record_search(path, fake_tickets_api.url)
+    cassette = Cassette(path, mode=REPLAY)
+
+    with pytest.raises(CassetteMiss):
+        cassette.play("post", "http://x/search/v2/start", {"marker": "other"})
+    assert cassette.misses == 1
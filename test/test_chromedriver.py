@@ -0,0 +1,51 @@
+import pytest
+
+from browser import chromedriver
+
+
+@pytest.fixture
+def driver_binary(tmp_path, monkeypatch):
+    """Фиктивный chromedriver и чистый кэш в tmp_path"""
+    binary = tmp_path / "chromedriver"
+    binary.write_text("")
+    monkeypatch.setenv("AVIASALES_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    monkeypatch.delenv("CHROMEDRIVER_OFFLINE", raising=False)
+    monkeypatch.setattr(chromedriver, "_resolved_path", None)
+    return str(binary)
+
+
+def install_counter(monkeypatch, path):
+    calls = []
+
+    class CountingManager:
+        def install(self):
+            calls.append(1)
+            return path
+
+    monkeypatch.setattr(chromedriver, "ChromeDriverManager", CountingManager)
+    return calls
+
+
+def test_resolved_once_and_shared_through_cache_file(driver_binary, monkeypatch):
+    """webdriver-manager вызывается один раз, новый процесс берёт путь из файла"""
+    calls = install_counter(monkeypatch, driver_binary)
+
+    assert chromedriver.resolve_chromedriver() == driver_binary
+    assert chromedriver.resolve_chromedriver() == driver_binary
+    monkeypatch.setattr(chromedriver, "_resolved_path", None)
+    assert chromedriver.resolve_chromedriver() == driver_binary
+
+    assert calls == [1]
+
+
+def test_offline_mode(driver_binary, monkeypatch):
+    """Офлайн: закреплённый бинарник или ошибка без обращения к сети"""
+    calls = install_counter(monkeypatch, driver_binary)
+    monkeypatch.setenv("CHROMEDRIVER_OFFLINE", "1")
+
+    with pytest.raises(FileNotFoundError):
+        chromedriver.resolve_chromedriver()
+    monkeypatch.setenv("CHROMEDRIVER_PATH", driver_binary)
+    assert chromedriver.resolve_chromedriver() == driver_binary
+    assert calls == []
@@ -0,0 +1,63 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+from api.cookie_manager import CachedCookieProvider, CookieManager, default_cookie_file
+
+
+def write_cookie_file(path, cookies, minutes=30):
+    """Записывает файл cookies в формате CookieManager"""
+    data = {
+        "cookies": cookies,
+        "expires": (datetime.now() + timedelta(minutes=minutes)).isoformat(),
+    }
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_cache_reads_file_once_per_window(tmp_path):
+    """Повторные вызовы в окне TTL не читают файл"""
+    cookie_file = tmp_path / "cookies.json"
+    write_cookie_file(cookie_file, {"auid": "1"})
+    provider = CachedCookieProvider(CookieManager(str(cookie_file)), ttl=60)
+
+    for _ in range(5):
+        assert provider.get_cookies() == {"auid": "1"}
+
+    assert provider.stats() == {"hits": 4, "misses": 1, "hit_rate": 0.8}
+
+
+def test_cache_invalidated_by_mtime_change(tmp_path):
+    """Изменение файла другим процессом сбрасывает кэш"""
+    cookie_file = tmp_path / "cookies.json"
+    write_cookie_file(cookie_file, {"auid": "1"})
+    provider = CachedCookieProvider(CookieManager(str(cookie_file)), ttl=60)
+    provider.get_cookies()
+
+    write_cookie_file(cookie_file, {"auid": "2"})
+    stat = os.stat(cookie_file)
+    os.utime(cookie_file, (stat.st_atime, stat.st_mtime + 5))
+
+    assert provider.get_cookies() == {"auid": "2"}
+    assert provider.misses == 2
+
+
+def test_cache_expires_after_ttl(tmp_path):
+    """После окна TTL файл читается заново"""
+    cookie_file = tmp_path / "cookies.json"
+    write_cookie_file(cookie_file, {"auid": "1"})
+    provider = CachedCookieProvider(CookieManager(str(cookie_file)), ttl=0)
+
+    provider.get_cookies()
+    provider.get_cookies()
+
+    assert provider.misses == 2
+
+
+def test_default_cookie_file_shared_by_xdist_workers(monkeypatch):
+    """Воркеры xdist делят один файл cookies API (обновление под FileLock)"""
+    monkeypatch.delenv("AVIASALES_COOKIE_FILE", raising=False)
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+
+    assert default_cookie_file() == "aviasales_cookies.json"
+    monkeypatch.setenv("AVIASALES_COOKIE_FILE", "/tmp/shared.json")
+    assert default_cookie_file() == "/tmp/shared.json"
@@ -0,0 +1,91 @@
+import json
+import multiprocessing
+import time
+from datetime import timedelta
+
+from api.cookie_manager import BackgroundCookieRefresher, CookieManager
+
+
+class CountingCookieManager(CookieManager):
+    """CookieManager без браузера: считает обновления в отдельном файле"""
+
+    def __init__(self, cookie_file, counter_file):
+        super().__init__(cookie_file)
+        self.counter_file = counter_file
+
+    def _get_fresh_cookies(self):
+        with open(self.counter_file, "a", encoding="utf-8") as f:
+            f.write("x")
+        time.sleep(0.5)
+        return {"auid": "fresh"}
+
+
+def get_cookies_in_process(cookie_file, counter_file, queue):
+    queue.put(CountingCookieManager(cookie_file, counter_file).get_cookies())
+
+
+def test_refresh_is_single_flight_across_processes(tmp_path):
+    """Несколько процессов с просроченным кэшем запускают одно обновление"""
+    cookie_file = str(tmp_path / "cookies.json")
+    counter_file = str(tmp_path / "refreshes.txt")
+    queue = multiprocessing.Queue()
+
+    workers = [
+        multiprocessing.Process(
+            target=get_cookies_in_process, args=(cookie_file, counter_file, queue)
+        )
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    results = [queue.get(timeout=30) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert results == [{"auid": "fresh"}] * 4
+    with open(counter_file, encoding="utf-8") as f:
+        assert f.read() == "x"
+    with open(cookie_file, encoding="utf-8") as f:
+        assert json.load(f)["cookies"] == {"auid": "fresh"}
+
+
+def test_corrupted_cache_file_is_ignored(tmp_path):
+    """Повреждённый файл кэша считается отсутствующим"""
+    cookie_file = tmp_path / "cookies.json"
+    cookie_file.write_text('{"cookies": {"auid"', encoding="utf-8")
+    manager = CountingCookieManager(str(cookie_file), str(tmp_path / "n.txt"))
+
+    assert manager.get_cookies() == {"auid": "fresh"}
+
+
+def test_background_refresher_renews_before_expiry(tmp_path):
+    """Фоновый поток обновляет cookies до истечения TTL"""
+    manager = CountingCookieManager(
+        str(tmp_path / "cookies.json"), str(tmp_path / "refreshes.txt")
+    )
+    manager.ttl = timedelta(seconds=2)
+    manager.get_cookies()
+    first_expires = manager.expires
+
+    with BackgroundCookieRefresher(manager, fraction=0.25, retry_interval=0.1) as refresher:
+        time.sleep(1.5)
+
+    assert refresher.refreshes >= 1
+    assert refresher.errors == 0
+    assert manager.expires > first_expires
+
+
+def test_background_refresher_counts_only_real_refreshes(tmp_path):
+    """Обновление, уже сделанное другим процессом, не считается"""
+    cookie_file = str(tmp_path / "cookies.json")
+    manager = CountingCookieManager(cookie_file, str(tmp_path / "refreshes.txt"))
+    manager.ttl = timedelta(seconds=10)
+    manager.get_cookies()
+    # Срок в памяти устарел, но файл уже продлил «другой процесс».
+    manager.expires -= timedelta(seconds=9)
+
+    with BackgroundCookieRefresher(manager, fraction=0.5, retry_interval=0.1) as refresher:
+        time.sleep(0.3)
+
+    assert refresher.refreshes == 0
+    assert refresher.skipped >= 1
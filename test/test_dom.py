@@ -0,0 +1,121 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from pages.dom import QUERY_ELEMENTS_SCRIPT, query_elements, to_selector
+from pages.resultPage import (
+    COUNT_CARDS_SCRIPT,
+    STREAM_CARDS_SCRIPT,
+    ResultPage,
+    TicketCard,
+    parse_price,
+)
+
+
+class ScriptDriver:
+    """Драйвер-заглушка: отдаёт заранее заданный результат execute_script"""
+
+    def __init__(self, result):
+        self.result = result
+        self.scripts = []
+
+    def find_element(self, by, value):
+        return object()
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        return self.result
+
+
+def test_locators_translated_to_selectors():
+    """Локаторы page objects переводятся в XPath или CSS"""
+    assert to_selector((By.XPATH, "//ul")) == ("xpath", "//ul")
+    assert to_selector((By.TAG_NAME, "ul")) == ("css", "ul")
+    assert to_selector((By.ID, "phone-input")) == ("css", '[id="phone-input"]')
+    with pytest.raises(ValueError):
+        to_selector((By.LINK_TEXT, "Войти"))
+
+
+def test_query_elements_single_script_call():
+    """Атрибуты и текст всех элементов читаются одним execute_script"""
+    driver = ScriptDriver([{"id": "menu", "text": "Сочи"}])
+
+    records = query_elements(driver, (By.TAG_NAME, "ul"), ("id",), limit=10)
+
+    assert records == [{"id": "menu", "text": "Сочи"}]
+    assert driver.scripts == [(QUERY_ELEMENTS_SCRIPT, ("css", "ul", ["id"], True, 10))]
+
+
+def test_result_page_all_prices():
+    """ResultPage отдаёт все цены с разобранной суммой за один запрос"""
+    driver = ScriptDriver(
+        [
+            {"text": "12 345 ₽"},
+            {"text": "9 870 ₽"},
+        ]
+    )
+
+    prices = ResultPage(driver).get_all_prices()
+
+    assert [price["value"] for price in prices] == [12345, 9870]
+    assert all(set(price) == {"text", "value"} for price in prices)
+    assert len(driver.scripts) == 1
+    assert driver.scripts[0][1][2] == []
+    assert parse_price("нет цены") is None
+
+
+class FeedDriver:
+    """Драйвер-заглушка ленты: после каждой прокрутки подгружается следующая страница"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.loaded = 1
+        self.taken = 0
+        self.stream_calls = 0
+
+    def find_element(self, by, value):
+        return object()
+
+    def execute_script(self, script, *args):
+        cards = [card for page in self.pages[: self.loaded] for card in page]
+        if script == STREAM_CARDS_SCRIPT:
+            self.stream_calls += 1
+            limit = args[3]
+            fresh = cards[self.taken :]
+            if limit is not None:
+                fresh = fresh[:limit]
+            self.taken += len(fresh)
+            self.loaded = min(self.loaded + 1, len(self.pages))
+            return [len(cards), fresh]
+        assert script == COUNT_CARDS_SCRIPT
+        return len(cards)
+
+
+def card(price, carrier="S7", transfers="Без пересадок"):
+    return [price, [carrier, carrier], ["07:05", "10:40"], transfers]
+
+
+def test_stream_tickets_until_feed_stops_growing():
+    """Карточки читаются пачками только новые, пока лента растёт"""
+    driver = FeedDriver(
+        [[card("5 100 ₽"), card("6 200 ₽")], [card("7 300 ₽", "SU", "2 пересадки")]]
+    )
+    page = ResultPage(driver)
+    page.wait.poll_frequency = 0.01
+
+    batches = list(page.stream_tickets(idle_timeout=0.05))
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert batches[0][0] == TicketCard(5100, ("S7",), "07:05", "10:40", 0)
+    assert batches[1][0].carriers == ("SU",)
+    assert batches[1][0].transfers == 2
+    assert driver.stream_calls == 2
+
+
+def test_collect_tickets_stops_at_count_budget():
+    """Чтение ленты останавливается по лимиту числа карточек"""
+    driver = FeedDriver([[card("100 ₽"), card("200 ₽")], [card("300 ₽")]])
+
+    tickets = ResultPage(driver).collect_tickets(max_tickets=1)
+
+    assert [ticket.price for ticket in tickets] == [100]
+    assert driver.stream_calls == 1
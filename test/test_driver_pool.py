@@ -0,0 +1,112 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from api.instrumentation import Instrumentation
+from browser.driver_pool import DriverPool
+from pages.waits import WaitEngine, _known_absent, _session_key
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+
+class FakeDriver:
+    """Драйвер-заглушка: запоминает команды сброса и умеет «падать»"""
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.switch_to = FakeSwitchTo(self)
+        self.current_url = "data:,"
+        self.commands = []
+        self.alive = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise WebDriverException("session deleted")
+        self.commands.append("script")
+        return 1
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append(cmd)
+
+    def close(self):
+        self.window_handles.remove(self.current_handle)
+
+    def get(self, url):
+        self.current_url = url
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_driver_reused_and_reset_between_tests():
+    """Браузер возвращается в пул со сброшенным состоянием и выдаётся повторно"""
+    pool = DriverPool(FakeDriver, size=1)
+
+    with pool.driver() as first:
+        first.window_handles.append("popup")
+        first.current_url = "https://www.aviasales.ru/search"
+    with pool.driver() as second:
+        pass
+
+    assert second is first
+    assert first.window_handles == ["main"]
+    assert first.current_url == "about:blank"
+    assert "Network.clearBrowserCookies" in first.commands
+    assert (pool.created, pool.reused) == (1, 1)
+
+
+def test_dead_driver_replaced_and_pool_closed():
+    """Упавший браузер заменяется новым, close закрывает все браузеры"""
+    pool = DriverPool(FakeDriver, size=2)
+    dead = pool.acquire()
+    pool.release(dead)
+    dead.alive = False
+
+    replacement = pool.acquire()
+    pool.close()
+
+    assert replacement is not dead
+    assert dead.quit_called and replacement.quit_called
+    assert pool.discarded == 1
+
+
+def test_acquire_times_out_when_pool_busy():
+    """При занятом пуле acquire ждёт не дольше timeout"""
+    pool = DriverPool(FakeDriver, size=1)
+    pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+
+
+def test_reset_forgets_absent_elements():
+    """После сброса браузера отсутствовавший баннер cookies снова ждётся"""
+    pool = DriverPool(FakeDriver, size=1)
+
+    with pool.driver() as driver:
+        engine = WaitEngine(driver, instrumentation=Instrumentation())
+        engine.optional(lambda d: False, "cookie_banner", timeout=0.01)
+    with pool.driver() as driver:
+        engine = WaitEngine(driver, instrumentation=Instrumentation())
+        banner = engine.optional(lambda d: "banner", "cookie_banner", timeout=0.01)
+
+    assert banner == "banner"
+
+
+def test_discard_drops_absent_cache_entry():
+    """Закрытый браузер не оставляет записей в кэше отсутствия"""
+    pool = DriverPool(FakeDriver, size=1)
+    driver = pool.acquire()
+    engine = WaitEngine(driver, instrumentation=Instrumentation())
+    engine.optional(lambda d: False, "cookie_banner", timeout=0.01)
+    assert _session_key(driver) in _known_absent
+
+    pool.release(driver, discard=True)
+
+    assert _session_key(driver) not in _known_absent
@@ -0,0 +1,84 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api.fake_server import StaticCookieProvider
+from api.http_client import AviasalesHttpClient, PoolConfig, get_shared_session
+
+NO_BACKOFF = PoolConfig(max_retries=2, backoff_factor=0)
+
+
+class BadGatewayHandler(BaseHTTPRequestHandler):
+    """Обработчик, отвечающий 502 на любой запрос и считающий запросы"""
+
+    protocol_version = "HTTP/1.1"
+    calls: dict[str, int] = {}
+
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self.calls[self.command] = self.calls.get(self.command, 0) + 1
+        self.send_response(502)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def bad_gateway():
+    BadGatewayHandler.calls = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BadGatewayHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    yield f"http://{host}:{port}", BadGatewayHandler.calls
+    server.shutdown()
+    server.server_close()
+
+
+def test_clients_share_session_per_pool_config():
+    """Клиенты с одинаковым PoolConfig используют одну сессию, с разным — разные"""
+    provider = StaticCookieProvider()
+    first = AviasalesHttpClient(provider, PoolConfig(pool_maxsize=7))
+    second = AviasalesHttpClient(provider, PoolConfig(pool_maxsize=7))
+    other = AviasalesHttpClient(provider, PoolConfig(pool_maxsize=8))
+
+    assert first.session is second.session
+    assert first.session is get_shared_session(PoolConfig(pool_maxsize=7))
+    assert other.session is not first.session
+    adapter = first.session.get_adapter("https://tickets-api.aviasales.ru")
+    assert adapter._pool_maxsize == 7
+
+
+def test_close_keeps_shared_and_passed_sessions():
+    """close() отключает клиент, но не закрывает общую сессию других клиентов"""
+    provider = StaticCookieProvider()
+    config = PoolConfig(pool_maxsize=9)
+    first = AviasalesHttpClient(provider, config)
+    second = AviasalesHttpClient(provider, config)
+    shared = first.session
+
+    first.close()
+
+    assert get_shared_session(config) is shared
+    assert second.session is shared
+    with pytest.raises(RuntimeError):
+        first.session
+    with pytest.raises(RuntimeError):
+        first.request("GET", "http://127.0.0.1:9/")
+
+
+def test_post_not_retried_on_bad_gateway(bad_gateway):
+    """POST при 502 не повторяется (повтор создал бы второй поиск), GET повторяется"""
+    url, calls = bad_gateway
+    client = AviasalesHttpClient(StaticCookieProvider(), NO_BACKOFF)
+
+    assert client.request("POST", f"{url}/search/v2/start", json={}).status_code == 502
+    assert client.request("GET", f"{url}/health").status_code == 502
+
+    assert calls == {"POST": 1, "GET": 3}
@@ -0,0 +1,72 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api.cookie_manager import CookieManager, get_shared_cookie_provider
+from api.http_cookie_manager import HttpCookieManager
+
+
+class LandingHandler(BaseHTTPRequestHandler):
+    """Главная страница, выставляющая cookies через Set-Cookie"""
+
+    cookies = ["auid=abc; Path=/", "currency=rub; Path=/"]
+
+    def do_GET(self):
+        self.send_response(200)
+        for cookie in self.cookies:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def landing_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LandingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_cookies_from_set_cookie_without_browser(tmp_path, landing_url, monkeypatch):
+    """Cookies берутся из ответа главной страницы, Selenium не запускается"""
+    monkeypatch.setattr(
+        CookieManager, "_get_fresh_cookies", lambda self: pytest.fail("Selenium")
+    )
+    manager = HttpCookieManager(str(tmp_path / "cookies.json"))
+    manager.LANDING_URL = landing_url
+
+    assert manager.get_cookies() == {"auid": "abc", "currency": "rub"}
+    assert manager.fallbacks == 0
+
+
+def test_falls_back_to_selenium_without_required_cookies(
+    tmp_path, landing_url, monkeypatch
+):
+    """Без обязательных cookies выполняется откат на Selenium"""
+    monkeypatch.setattr(
+        CookieManager, "_get_fresh_cookies", lambda self: {"auid": "selenium"}
+    )
+    manager = HttpCookieManager(
+        str(tmp_path / "cookies.json"), required_cookies=("auid", "_awt")
+    )
+    manager.LANDING_URL = landing_url
+
+    assert manager.get_cookies() == {"auid": "selenium"}
+    assert manager.fallbacks == 1
+
+
+def test_shared_provider_keyed_by_manager_class(tmp_path):
+    """Общий поставщик для файла учитывает класс менеджера"""
+    cookie_file = str(tmp_path / "cookies.json")
+
+    http_provider = get_shared_cookie_provider(cookie_file, HttpCookieManager)
+    selenium_provider = get_shared_cookie_provider(cookie_file, CookieManager)
+
+    assert type(http_provider.cookie_manager) is HttpCookieManager
+    assert type(selenium_provider.cookie_manager) is CookieManager
+    assert get_shared_cookie_provider(cookie_file, HttpCookieManager) is http_provider
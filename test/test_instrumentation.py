@@ -0,0 +1,62 @@
+import json
+
+from api.aviasales_api import AviasalesAPI
+from api.fake_server import StaticCookieProvider
+from api.instrumentation import Instrumentation, LatencyHistogram
+from api.polling import FixedPolling
+
+
+def test_histogram_percentiles_within_precision():
+    """Перцентили гистограммы совпадают с точными в пределах точности корзин"""
+    histogram = LatencyHistogram()
+    for millis in range(1, 1001):
+        histogram.record(millis / 1000)
+
+    assert histogram.count == 1000
+    assert abs(histogram.percentile(50) - 0.5) <= 0.5 / 2**7
+    assert abs(histogram.percentile(99) - 0.99) <= 0.99 / 2**7
+    assert histogram.percentile(100) == histogram.max == 1.0
+    assert LatencyHistogram().percentile(50) is None
+
+
+def test_requests_reported_to_hooks_and_dumped(tmp_path, fake_tickets_api):
+    """Каждый запрос попадает в хуки с номером попытки и в JSON-отчёт"""
+    fake_tickets_api.pending_polls = 2
+    instrumentation = Instrumentation()
+    timings = []
+    instrumentation.add_hook(timings.append)
+    api = AviasalesAPI(
+        cookie_provider=StaticCookieProvider(),
+        base_url=fake_tickets_api.url,
+        polling=FixedPolling(initial_delay=0.01, interval=0.01),
+        instrumentation=instrumentation,
+    )
+
+    api.search_result(api.search_one_way("KUF", "AER", "2026-11-08"))
+    path = tmp_path / "latency.json"
+    instrumentation.dump(str(path))
+
+    assert [(t.endpoint, t.status_code, t.attempt) for t in timings] == [
+        ("/search/v2/start", 200, 1),
+        ("/search/v3.2/results", 204, 1),
+        ("/search/v3.2/results", 204, 2),
+        ("/search/v3.2/results", 200, 3),
+    ]
+    assert all(t.ttfb is not None and t.ttfb <= t.total for t in timings)
+    report = json.loads(path.read_text())
+    assert report["POST /search/v3.2/results"]["count"] == 3
+    assert report["search_result"]["count"] == 1
+
+
+def test_histograms_merged_across_processes():
+    """Гистограммы воркеров объединяются без потери корзин"""
+    worker, controller = Instrumentation(), Instrumentation()
+    for millis in range(1, 101):
+        (worker if millis % 2 else controller).observe("search_result", millis / 1000)
+
+    controller.merge(json.loads(json.dumps(worker.export())))
+
+    merged = controller.snapshot()["search_result"]
+    assert merged["count"] == 100
+    assert (merged["min"], merged["max"]) == (0.001, 0.1)
+    assert abs(merged["p50"] - 0.05) <= 0.05 / 2**7
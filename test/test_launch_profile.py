@@ -0,0 +1,69 @@
+import json
+
+from browser.launch_profile import PROFILES, TRACKER_URL_PATTERNS
+from browser.page_metrics import PageLoadReport
+
+
+class RecordingDriver:
+    """Драйвер-заглушка: запоминает команды настройки и отдаёт метрики страницы"""
+
+    def __init__(self, metrics=None):
+        self.calls = []
+        self.metrics = metrics
+
+    def maximize_window(self):
+        self.calls.append(("maximize",))
+
+    def set_window_size(self, width, height):
+        self.calls.append(("size", width, height))
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append((cmd, params))
+
+    def execute_script(self, script):
+        return dict(self.metrics) if self.metrics else self.metrics
+
+
+def test_full_profile_keeps_previous_launch():
+    """Профиль full — окно во весь экран без блокировок"""
+    driver = RecordingDriver()
+    profile = PROFILES["full"]
+
+    profile.apply(driver)
+
+    assert profile.options().arguments == []
+    assert driver.calls == [("maximize",)]
+
+
+def test_lean_profile_trims_resources():
+    """Профиль lean: headless, eager, без картинок, шрифтов и трекеров"""
+    driver = RecordingDriver()
+    profile = PROFILES["lean"]
+    options = profile.options()
+
+    profile.apply(driver)
+
+    assert "--headless=new" in options.arguments
+    assert options.page_load_strategy == "eager"
+    assert options.experimental_options["prefs"] == {
+        "profile.managed_default_content_settings.images": 2
+    }
+    assert driver.calls[0] == ("size", 1366, 900)
+    blocked = driver.calls[-1][1]["urls"]
+    assert "*.woff2" in blocked and set(TRACKER_URL_PATTERNS) <= set(blocked)
+
+
+def test_page_load_report(tmp_path):
+    """Отчёт собирает метрики страниц и пропускает about:blank"""
+    report = PageLoadReport("lean")
+    for load in (800.0, 1200.0):
+        metrics = {"dom_content_loaded": load / 2, "load": load, "js_heap_used": 10}
+        report.record(RecordingDriver(metrics), "test_search")
+    report.record(RecordingDriver({"dom_content_loaded": None}), "test_blank")
+
+    path = tmp_path / "browser.json"
+    report.dump(str(path))
+
+    summary = json.loads(path.read_text())["summary"]
+    assert summary["pages"] == 2
+    assert summary["load"] == {"median": 1000.0, "max": 1200.0}
@@ -0,0 +1,59 @@
+import logging
+
+from api.aviasales_api import AviasalesAPI
+from api.fake_server import StaticCookieProvider
+from api.polling import FixedPolling
+from pages.mainPage import MainPage
+
+
+class FakeField:
+    """Поле ввода-заглушка"""
+
+    def clear(self):
+        pass
+
+    def send_keys(self, keys):
+        pass
+
+
+class CountingDriver:
+    """Драйвер-заглушка: считает обращения к DOM при диагностике"""
+
+    def __init__(self):
+        self.script_calls = 0
+
+    def execute_script(self, script, *args):
+        self.script_calls += 1
+        return [{"id": "menu", "class": "list", "data-test-id": None, "text": "Сочи\nAER"}]
+
+
+def test_search_result_logs_instead_of_printing(caplog, capsys, fake_tickets_api):
+    """Ход опроса пишется в лог api.aviasales_api, а не в stdout"""
+    api = AviasalesAPI(
+        cookie_provider=StaticCookieProvider(),
+        base_url=fake_tickets_api.url,
+        polling=FixedPolling(initial_delay=0.01, interval=0.01),
+    )
+
+    with caplog.at_level(logging.DEBUG, logger="api.aviasales_api"):
+        api.search_result(api.search_one_way("KUF", "AER", "2026-11-08"))
+
+    assert capsys.readouterr().out == ""
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("Получены билеты") for message in messages)
+
+
+def test_dom_diagnostics_disabled_by_default(caplog, monkeypatch):
+    """Без переключателя дамп списков не обращается к DOM даже на DEBUG"""
+    driver = CountingDriver()
+    page = MainPage(driver)
+    page.wait.until = lambda condition, step=None, timeout=None: FakeField()
+    monkeypatch.setattr("pages.mainPage.time.sleep", lambda seconds: None)
+
+    with caplog.at_level(logging.DEBUG, logger="pages.mainPage"):
+        page.enter_destination("Сочи")
+        assert driver.script_calls == 0
+
+        monkeypatch.setattr(MainPage, "DOM_DIAGNOSTICS", True)
+        page.enter_destination("Сочи")
+        assert driver.script_calls == 1
@@ -0,0 +1,42 @@
+import pytest
+
+from api.models import Ticket, parse_results
+
+
+def test_parse_results_from_fake_payload(fake_api, fake_tickets_api):
+    """Ответ разбирается в билеты с ценой, направлениями и перевозчиками"""
+    fake_tickets_api.tickets_per_search = 5
+
+    search_id = fake_api.search_start("KUF", "AER", "2026-11-08", "2026-11-09")
+    tickets = fake_api.search_tickets(search_id)
+
+    assert len(tickets) == 1
+    ticket = tickets[0]
+    assert isinstance(ticket, Ticket)
+    assert ticket.price.currency == "rub"
+    assert [(s.origin, s.destination) for s in ticket.segments] == [
+        ("KUF", "AER"),
+        ("AER", "KUF"),
+    ]
+    assert ticket.carrier == ticket.segments[0].carriers[0]
+    assert ticket.transfers == sum(len(s.carriers) - 1 for s in ticket.segments)
+
+
+def test_parse_only_requested_fields():
+    """Незапрошенные поля не разбираются"""
+    payload = b"""[{"tickets": [{"id": "t1", "segments": [{"flights": [0]}],
+        "proposals": [{"price": {"currency_code": "rub", "value": 900}},
+                      {"price": {"currency_code": "rub", "value": 700}}]}],
+        "flight_legs": [{"origin": "KUF", "destination": "AER"}]}]"""
+
+    (ticket,) = parse_results(payload, fields=["price"])
+
+    assert ticket.price.value == 700
+    assert ticket.segments is None
+    assert not hasattr(ticket, "__dict__")
+
+
+def test_unknown_field_rejected():
+    """Неизвестное поле — ошибка, а не молча пустой результат"""
+    with pytest.raises(ValueError):
+        parse_results([], fields=["baggage"])
@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from api.polling import (
+    BackoffPolling,
+    FixedPolling,
+    PollingStrategy,
+    PollSchedule,
+    RouteLatencyHistory,
+    parse_retry_after,
+)
+
+
+def test_fixed_polling_keeps_old_schedule():
+    """Фиксированная стратегия: 2 с перед первым запросом и ещё 4 паузы по 2 с"""
+    schedule = FixedPolling().schedule()
+
+    delays = [schedule.first_delay()]
+    while True:
+        delay = schedule.next_delay()
+        if delay is None:
+            break
+        delays.append(delay)
+
+    assert delays == [2.0, 2.0, 2.0, 2.0, 2.0]
+
+
+def test_backoff_grows_and_respects_max_delay():
+    """Экспоненциальная пауза без джиттера растёт до max_delay"""
+    polling = BackoffPolling(
+        initial_delay=1.0, factor=2.0, max_delay=4.0, jitter=0.0,
+        timeout=None, max_attempts=5,
+    )
+    schedule = polling.schedule()
+
+    assert schedule.first_delay() == 1.0
+    assert [schedule.next_delay() for _ in range(5)] == [1.0, 2.0, 4.0, 4.0, None]
+
+
+def test_backoff_jitter_stays_in_bounds():
+    """Джиттер не выводит паузу за заданный разброс"""
+    polling = BackoffPolling(
+        initial_delay=1.0, factor=1.0, jitter=0.25, timeout=None,
+        rng=random.Random(42),
+    )
+    schedule = polling.schedule()
+    schedule.first_delay()
+
+    for _ in range(50):
+        assert 0.75 <= schedule.next_delay() <= 1.25
+
+
+def test_backoff_honors_retry_after():
+    """Подсказка сервера Retry-After заменяет расчётную паузу"""
+    polling = BackoffPolling(jitter=0.0, timeout=None)
+    schedule = polling.schedule()
+    schedule.first_delay()
+
+    assert schedule.next_delay(retry_after=3.0) == 3.0
+
+
+def test_backoff_deadline_clips_and_stops():
+    """Пауза не выходит за общий дедлайн, после дедлайна опрос прекращается"""
+    polling = BackoffPolling(initial_delay=10.0, jitter=0.0, timeout=0.5)
+    schedule = polling.schedule()
+
+    assert schedule.first_delay() <= 0.5
+
+    schedule.started -= 1.0
+    assert schedule.next_delay() is None
+
+
+def test_backoff_starts_from_route_history():
+    """Первая пауза для известного маршрута берётся из истории"""
+    history = RouteLatencyHistory()
+    polling = BackoffPolling(initial_delay=1.0, history=history, lead=0.5)
+
+    polling.record_first_result("KUF-AER", 6.0)
+
+    assert polling.schedule(["KUF-AER"]).first_delay() == 3.0
+    assert polling.schedule(["VVO-KUF"]).first_delay() == 1.0
+
+
+def test_parse_retry_after():
+    """Разбор Retry-After в секундах; некорректное значение игнорируется"""
+    assert parse_retry_after({"Retry-After": "4"}) == 4.0
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+    assert parse_retry_after({}) is None
+
+
+def test_incomplete_strategy_fails_on_creation():
+    """Стратегия или расписание без обязательных методов не создаётся"""
+
+    class NoSchedule(PollingStrategy):
+        pass
+
+    class NoNextDelay(PollSchedule):
+        def first_delay(self):
+            return 0.0
+
+    with pytest.raises(TypeError):
+        NoSchedule()
+    with pytest.raises(TypeError):
+        NoNextDelay()
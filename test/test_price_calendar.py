@@ -0,0 +1,96 @@
+import pytest
+
+from api.aviasales_api import AviasalesAPI
+from api.fake_server import FakeSearch, StaticCookieProvider
+from api.polling import FixedPolling
+from api.price_calendar import PriceCalendar, sweep
+
+FAST_POLLING = FixedPolling(initial_delay=0.01, interval=0.01, max_attempts=20)
+
+
+@pytest.fixture
+def api(fake_tickets_api):
+    return AviasalesAPI(
+        cookie_provider=StaticCookieProvider(),
+        base_url=fake_tickets_api.url,
+        polling=FAST_POLLING,
+    )
+
+
+def test_round_trip_window_specs():
+    """Окно туда-обратно разворачивается в пары дат по длительности поездки"""
+    calendar = PriceCalendar("KUF", "AER")
+
+    specs = calendar.specs("2026-11-08", "2026-11-09", min_stay=3, max_stay=4)
+
+    assert [(spec.date_from, spec.date_to) for spec in specs] == [
+        ("2026-11-08", "2026-11-11"),
+        ("2026-11-08", "2026-11-12"),
+        ("2026-11-09", "2026-11-12"),
+        ("2026-11-09", "2026-11-13"),
+    ]
+    with pytest.raises(ValueError):
+        calendar.specs("2026-11-09", "2026-11-08")
+
+
+def test_sweep_builds_matrix(api, fake_tickets_api):
+    """Прогон заполняет матрицу цен, повторы поисков не запускаются"""
+    calendar = PriceCalendar("KUF", "AER")
+    specs = calendar.specs("2026-11-08", "2026-11-10")
+
+    assert sweep(api, calendar, specs + specs[:1], max_in_flight=2) == 3
+    departures, returns, rows = calendar.matrix()
+    assert departures == ["2026-11-08", "2026-11-09", "2026-11-10"]
+    assert returns == [None]
+    assert all(row[0] is not None for row in rows)
+    assert fake_tickets_api.requests["/search/v2/start"] == 3
+
+
+def test_sweep_refreshes_only_stale_cells(tmp_path, api, fake_tickets_api):
+    """Повторный прогон перезапрашивает только устаревшие ячейки"""
+    path = str(tmp_path / "calendar.json")
+    calendar = PriceCalendar("KUF", "AER", path=path)
+    specs = calendar.specs("2026-11-08", "2026-11-10")
+    sweep(api, calendar, specs)
+
+    reloaded = PriceCalendar("KUF", "AER", path=path)
+    reloaded.cells[("2026-11-09", None)].updated_at -= 2 * reloaded.max_age
+
+    assert sweep(api, reloaded, specs) == 1
+    assert fake_tickets_api.requests["/search/v2/start"] == 4
+    assert PriceCalendar("KUF", "AER", adults=2, path=path).cells == {}
+
+
+def test_cell_holds_minimum_not_first_ticket(api, fake_tickets_api):
+    """В ячейку попадает минимальная цена из выдачи, а не цена первого билета"""
+    calendar = PriceCalendar("KUF", "AER")
+    specs = calendar.specs("2026-11-08", "2026-11-08")
+    directions = specs[0].payload()["search_params"]["directions"]
+    tickets = fake_tickets_api._build_chunk(
+        FakeSearch("expected", directions), 0, fake_tickets_api.tickets_per_search
+    )["tickets"]
+    prices = [ticket["proposals"][0]["price"]["value"] for ticket in tickets]
+    assert prices[0] != min(prices)
+
+    sweep(api, calendar, specs)
+
+    assert calendar.cells[("2026-11-08", None)].price == min(prices)
+
+
+def test_cell_minimum_covers_every_batch(api, fake_tickets_api):
+    """Поиск дочитывается до is_over: минимум ищется и в поздних пачках"""
+    fake_tickets_api.pending_polls = 0
+    fake_tickets_api.batch_size = 2
+    fake_tickets_api.tickets_per_search = 10
+    calendar = PriceCalendar("KUF", "AER")
+    specs = calendar.specs("2026-11-08", "2026-11-08")
+    directions = specs[0].payload()["search_params"]["directions"]
+    tickets = fake_tickets_api._build_chunk(FakeSearch("expected", directions), 0, 10)[
+        "tickets"
+    ]
+    prices = [ticket["proposals"][0]["price"]["value"] for ticket in tickets]
+    assert min(prices[:2]) != min(prices)
+
+    sweep(api, calendar, specs)
+
+    assert calendar.cells[("2026-11-08", None)].price == min(prices)
@@ -0,0 +1,112 @@
+import time
+
+from api.aviasales_api import AviasalesAPI, SearchSpec
+from api.fake_server import StaticCookieProvider
+from api.polling import FixedPolling
+from api.result_cache import SearchResultCache
+
+FAST_POLLING = FixedPolling(initial_delay=0.01, interval=0.01, max_attempts=20)
+
+
+def make_api(url, cache):
+    return AviasalesAPI(
+        cookie_provider=StaticCookieProvider(),
+        base_url=url,
+        polling=FAST_POLLING,
+        result_cache=cache,
+    )
+
+
+def test_repeated_search_served_from_cache(fake_tickets_api):
+    """Повторный одинаковый поиск не обращается к серверу"""
+    cache = SearchResultCache(ttl=60)
+    api = make_api(fake_tickets_api.url, cache)
+
+    first = api.search_result(api.search_start("KUF", "AER", "2026-11-08", "2026-11-09"))
+    requests_after_first = dict(fake_tickets_api.requests)
+    second = api.search_result(api.search_start("KUF", "AER", "2026-11-08", "2026-11-09"))
+
+    assert second == first
+    assert fake_tickets_api.requests == requests_after_first
+    assert cache.stats()["KUF-AER"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_different_passengers_are_not_shared(fake_tickets_api):
+    """Ключ кэша учитывает пассажиров"""
+    cache = SearchResultCache(ttl=60)
+    api = make_api(fake_tickets_api.url, cache)
+
+    api.search_result(api.search_one_way("KUF", "AER", "2026-11-08"))
+    api.search_result(api.search_one_way("KUF", "AER", "2026-11-08", infants=1))
+
+    assert cache.stats()["KUF-AER"]["hits"] == 0
+
+
+def test_disk_cache_survives_new_instance(tmp_path, fake_tickets_api):
+    """Дисковый кэш доступен новому экземпляру кэша"""
+    api = make_api(fake_tickets_api.url, SearchResultCache(directory=str(tmp_path)))
+    data = api.search_result(api.search_one_way("VVO", "KUF", "2026-11-08"))
+
+    other = make_api(fake_tickets_api.url, SearchResultCache(directory=str(tmp_path)))
+    search_id = other.search_one_way("VVO", "KUF", "2026-11-08")
+
+    assert search_id.startswith("cached:")
+    assert other.search_result(search_id) == data
+
+
+def test_ttl_and_lru_eviction():
+    """Записи вытесняются по TTL и по размеру"""
+    cache = SearchResultCache(ttl=0.05, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, [{"tickets": [key]}])
+
+    assert cache.get("a") is None
+    assert cache.get("c") == [{"tickets": ["c"]}]
+    time.sleep(0.1)
+    assert cache.get("c") is None
+
+
+def test_search_many_uses_cache(fake_tickets_api):
+    """search_many отдаёт закэшированные поиски без опроса"""
+    cache = SearchResultCache(ttl=60)
+    api = make_api(fake_tickets_api.url, cache)
+    specs = [SearchSpec("KUF", "AER", f"2026-11-{day:02d}") for day in (1, 2)]
+    list(api.search_many(specs))
+
+    results = list(api.search_many(specs))
+
+    assert len(results) == 2
+    assert cache.stats()["KUF-AER"]["hits"] == 2
+
+
+def test_cached_result_readable_repeatedly(fake_tickets_api):
+    """Результат из кэша читается по псевдо-search_id сколько угодно раз"""
+    api = make_api(fake_tickets_api.url, SearchResultCache(ttl=60))
+    data = api.search_result(api.search_one_way("KUF", "AER", "2026-11-08"))
+
+    search_id = api.search_one_way("KUF", "AER", "2026-11-08")
+    requests_before = dict(fake_tickets_api.requests)
+
+    assert api.search_result(search_id) == data
+    assert api.search_result(search_id) == data
+    assert list(api.search_result_stream(search_id)) == [data[0]["tickets"]]
+    assert fake_tickets_api.requests == requests_before
+
+
+def test_search_many_duplicates_from_warm_cache(fake_tickets_api):
+    """Одинаковые поиски в пакете получают данные из кэша каждый"""
+    api = make_api(fake_tickets_api.url, SearchResultCache(ttl=60))
+    spec = SearchSpec("KUF", "AER", "2026-11-08")
+    data = api.search_result(api.search_one_way("KUF", "AER", "2026-11-08"))
+
+    results = list(api.search_many([spec, spec], polling=FAST_POLLING))
+
+    assert results == [(spec, data), (spec, data)]
+
+
+def test_unknown_cached_id_not_sent_to_server(fake_tickets_api):
+    """Чужой псевдо-search_id не уходит на сервер"""
+    api = make_api(fake_tickets_api.url, SearchResultCache(ttl=60))
+
+    assert api.search_result("cached:unknown") is None
+    assert fake_tickets_api.requests == {}
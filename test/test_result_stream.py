@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import requests
+
+from api.async_aviasales_api import AsyncAviasalesAPI
+from api.async_http_client import AsyncResponse
+from api.aviasales_api import AviasalesAPI
+from api.fake_server import StaticCookieProvider
+from api.polling import FixedPolling
+
+NO_WAIT = FixedPolling(initial_delay=0, interval=0, max_attempts=10)
+
+# Ответы сервера по порядку: (код, тело).
+SCRIPT = [
+    (204, None),
+    (200, [{"tickets": [{"id": "a"}, {"id": "b"}], "last_update_timestamp": 10}]),
+    (200, [{"tickets": [], "last_update_timestamp": 10}]),
+    (200, [{"tickets": [{"id": "c"}], "last_update_timestamp": 20, "is_over": True}]),
+    (200, [{"tickets": [{"id": "never"}]}]),
+]
+
+
+class ScriptedResults:
+    """Отдаёт ответы SCRIPT по порядку и запоминает копии payload запросов"""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.payloads = []
+
+    def next(self, payload):
+        self.payloads.append(dict(payload))
+        status, body = self.script.pop(0)
+        return status, b"" if body is None else json.dumps(body).encode()
+
+
+class SyncClient(ScriptedResults):
+    def request(self, method, url, **kwargs):
+        status, content = self.next(kwargs["json"])
+        response = requests.Response()
+        response.status_code = status
+        response._content = content
+        return response
+
+
+class AsyncClient(ScriptedResults):
+    async def request(self, method, url, **kwargs):
+        status, content = self.next(kwargs["json"])
+        return AsyncResponse(status, {}, content)
+
+    async def close(self):
+        pass
+
+
+def ticket_ids(batches):
+    return [[ticket["id"] for ticket in batch] for batch in batches]
+
+
+def test_stream_advances_timestamp_until_is_over():
+    """Поток сдвигает last_update_timestamp, отдаёт только новые пачки и стоп по is_over"""
+    api = AviasalesAPI(cookie_provider=StaticCookieProvider(), base_url="")
+    api._http_client = client = SyncClient(SCRIPT)
+
+    batches = list(api.search_result_stream("sid", limit=50, polling=NO_WAIT))
+
+    assert ticket_ids(batches) == [["a", "b"], ["c"]]
+    timestamps = [payload["last_update_timestamp"] for payload in client.payloads]
+    assert timestamps[2:] == [10, 10]
+    assert timestamps[0] == timestamps[1] != 10
+    assert {payload["limit"] for payload in client.payloads} == {50}
+    assert len(client.script) == 1
+
+
+def test_stream_stops_on_error_status():
+    """Ответ с ошибкой завершает поток без дальнейших запросов"""
+    api = AviasalesAPI(cookie_provider=StaticCookieProvider(), base_url="")
+    api._http_client = client = SyncClient([(500, {"error": "boom"})] + SCRIPT)
+
+    assert list(api.search_result_stream("sid", polling=NO_WAIT)) == []
+    assert len(client.payloads) == 1
+
+
+def test_async_stream_matches_sync():
+    """Асинхронный поток отдаёт те же пачки, что и синхронный"""
+
+    async def run():
+        api = AsyncAviasalesAPI(StaticCookieProvider(), polling=NO_WAIT, base_url="")
+        api._http_client = AsyncClient(SCRIPT)
+        return [batch async for batch in api.search_result_stream("sid")]
+
+    assert ticket_ids(asyncio.run(run())) == [["a", "b"], ["c"]]
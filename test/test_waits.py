@@ -0,0 +1,83 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from api.instrumentation import Instrumentation
+from pages.waits import WaitEngine, forget_absent
+
+
+@pytest.fixture
+def engine():
+    forget_absent()
+    yield WaitEngine(
+        object(), timeout=0.05, poll_frequency=0.01, instrumentation=Instrumentation()
+    )
+    forget_absent()
+
+
+def test_until_records_step_time(engine):
+    """Время шага записывается в timings и гистограмму wait:<шаг>"""
+    calls = []
+
+    result = engine.until(
+        lambda driver: calls.append(1) or len(calls) >= 3, "search_button"
+    )
+
+    assert result is True
+    assert [(t.step, t.outcome) for t in engine.timings] == [("search_button", "found")]
+    assert engine.instrumentation.snapshot()["wait:search_button"]["count"] == 1
+    with pytest.raises(TimeoutException):
+        engine.until(lambda driver: False, "calendar")
+    assert engine.timings[-1].outcome == "timeout"
+
+
+def test_optional_short_circuits_known_absent(engine):
+    """Отсутствующий необязательный элемент не ждётся повторно"""
+    probes = []
+
+    def absent(driver):
+        probes.append(1)
+        return False
+
+    assert engine.optional(absent, "cookie_banner", timeout=0.05) is None
+    probes_after_first = len(probes)
+    assert engine.optional(absent, "cookie_banner", timeout=0.05) is None
+
+    assert len(probes) == probes_after_first
+    assert [t.outcome for t in engine.timings] == ["timeout", "skipped"]
+
+
+def test_optional_absent_cache_keyed_by_input(engine):
+    """Кэш отсутствия учитывает ключ: другой город проверяется заново"""
+    engine.optional(lambda driver: False, "origin_suggest_vvo", 0.05, key="Самара")
+
+    option = engine.optional(
+        lambda driver: "VVO", "origin_suggest_vvo", 0.05, key="Владивосток"
+    )
+
+    assert option == "VVO"
+
+
+class SessionDriver:
+    """Драйвер-заглушка с session_id"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+
+
+def test_absent_cache_per_browser_session():
+    """Кэш отсутствия свой у каждого браузера и сбрасывается для одного из них"""
+    forget_absent()
+    first, second = SessionDriver("s1"), SessionDriver("s2")
+    engines = [
+        WaitEngine(driver, poll_frequency=0.01, instrumentation=Instrumentation())
+        for driver in (first, first, second)
+    ]
+
+    engines[0].optional(lambda driver: False, "cookie_banner", timeout=0.05)
+
+    assert engines[1].optional(lambda driver: False, "cookie_banner", 0.05) is None
+    assert engines[1].timings[-1].outcome == "skipped"
+    assert engines[2].optional(lambda driver: "banner", "cookie_banner", 0.05)
+    forget_absent(first)
+    assert engines[1].optional(lambda driver: "banner", "cookie_banner", 0.05)
+    forget_absent()